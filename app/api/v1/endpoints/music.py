@@ -2,13 +2,17 @@ from fastapi import APIRouter, Query, Depends
 from typing import Optional
 
 from app.services.music import MusicService
+from app.services.container import ServiceContainer, get_services
 from app.api.v1.schemas.common import APIResponse
+from app.core.exceptions import ValidationError
 
 router = APIRouter()
 
 
-def get_music_service() -> MusicService:
-    return MusicService()
+def get_music_service(
+    services: ServiceContainer = Depends(get_services)
+) -> MusicService:
+    return services.music
 
 
 @router.get("/search", response_model=APIResponse)
@@ -31,6 +35,27 @@ async def search_music(
     return APIResponse(success=True, data=result)
 
 
+@router.get("/songs", response_model=APIResponse)
+async def get_songs(
+    ids: str = Query(..., description="Comma-separated video IDs"),
+    service: MusicService = Depends(get_music_service)
+):
+    """
+    Get details for many songs at once
+    
+    - **ids**: Up to 200 comma-separated video IDs
+    """
+    video_ids = [video_id.strip() for video_id in ids.split(",") if video_id.strip()]
+    if not video_ids or len(video_ids) > 200:
+        raise ValidationError(
+            "Provide between 1 and 200 video IDs",
+            details={"count": len(video_ids)}
+        )
+    
+    result = await service.get_songs(video_ids)
+    return APIResponse(success=True, data=result)
+
+
 @router.get("/song/{video_id}", response_model=APIResponse)
 async def get_song(
     video_id: str,
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Query, Depends
 from typing import Optional
 
-from app.services.youtube import YouTubeService
-from app.services.music import MusicService
+from app.core.exceptions import ExternalAPIError
+from app.services.base import gather_partial
+from app.services.container import ServiceContainer, get_services
 from app.api.v1.schemas.common import APIResponse
 
 router = APIRouter()
@@ -31,19 +32,23 @@ async def get_suggestions(
 @router.get("/combined", response_model=APIResponse)
 async def combined_search(
     q: str = Query(..., description="Search query"),
-    limit: int = Query(10, ge=1, le=20)
+    limit: int = Query(10, ge=1, le=20),
+    services: ServiceContainer = Depends(get_services)
 ):
     """Search both YouTube and YouTube Music"""
-    yt_service = YouTubeService()
-    music_service = MusicService()
-    
-    yt_results = await yt_service.search(q, None, limit)
-    music_results = await music_service.search(q, None, limit)
+    yt_results, music_results = await gather_partial(
+        services.youtube.search(q, None, limit),
+        services.music.search(q, None, limit)
+    )
+    if yt_results is None and music_results is None:
+        raise ExternalAPIError("YouTube", "search requests failed")
     
+    # A source that failed or timed out is returned as null
     return APIResponse(
         success=True,
         data={
             "youtube": yt_results,
-            "music": music_results
+            "music": music_results,
+            "partial": yt_results is None or music_results is None
         }
     )
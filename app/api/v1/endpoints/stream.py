@@ -3,13 +3,16 @@ from fastapi.responses import RedirectResponse
 from typing import Optional
 
 from app.services.stream import StreamService
+from app.services.container import ServiceContainer, get_services
 from app.api.v1.schemas.common import APIResponse
 
 router = APIRouter()
 
 
-def get_stream_service() -> StreamService:
-    return StreamService()
+def get_stream_service(
+    services: ServiceContainer = Depends(get_services)
+) -> StreamService:
+    return services.stream
 
 
 @router.get("/{video_id}", response_model=APIResponse)
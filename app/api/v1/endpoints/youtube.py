@@ -2,6 +2,7 @@ from fastapi import APIRouter, Query, Depends
 from typing import Optional
 
 from app.services.youtube import YouTubeService
+from app.services.container import ServiceContainer, get_services
 from app.api.v1.schemas.youtube import (
     VideoResponse,
     ChannelResponse,
@@ -13,8 +14,10 @@ from app.api.v1.schemas.common import APIResponse
 router = APIRouter()
 
 
-def get_youtube_service() -> YouTubeService:
-    return YouTubeService()
+def get_youtube_service(
+    services: ServiceContainer = Depends(get_services)
+) -> YouTubeService:
+    return services.youtube
 
 
 @router.get("/video/{video_id}", response_model=APIResponse)
@@ -113,3 +116,17 @@ async def search_youtube(
     """Search YouTube"""
     result = await service.search(q, filter, limit)
     return APIResponse(success=True, data=result)
+
+
+@router.get("/resolve", response_model=APIResponse)
+async def resolve_url(
+    url: str = Query(..., description="YouTube or YouTube Music URL"),
+    service: YouTubeService = Depends(get_youtube_service)
+):
+    """
+    Resolve a URL to a video, playlist or channel ID
+    
+    - **url**: e.g. https://www.youtube.com/@RickAstleyYT
+    """
+    result = await service.resolve_url(url)
+    return APIResponse(success=True, data=result)
@@ -1,5 +1,5 @@
 import innertube
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class InnerTubeClient:
@@ -23,6 +23,15 @@ class InnerTubeClient:
         self._client = innertube.InnerTube(client_type)
         self.client_type = client_type
     
+    @property
+    def locale(self) -> str:
+        """Locale responses are rendered in, e.g. "en,US" ("" for the default)"""
+        adaptor = self._client.adaptor
+        if not isinstance(adaptor, innertube.InnerTubeAdaptor):
+            return ""
+        locale = adaptor.context.locale
+        return locale.accept_language() if locale else ""
+    
     def search(self, query: str, params: Optional[str] = None) -> Dict[str, Any]:
         """Search"""
         return self._client.search(query=query, params=params)
@@ -39,6 +48,18 @@ class InnerTubeClient:
         """Browse endpoint"""
         return self._client.browse(browse_id=browse_id)
     
-    def resolve_url(self, url: str) -> Dict[str, Any]:
-        """Resolve YouTube URL"""
-        return self._client.resolve_url(url=url)
+    def music_get_queue(self, video_ids: List[str]) -> Dict[str, Any]:
+        """Music queue endpoint"""
+        return self._client.music_get_queue(video_ids=video_ids)
+    
+    def songs(self, video_ids: List[str]) -> Dict[str, innertube.Song]:
+        """Get song metadata in bulk (chunked music/get_queue requests)"""
+        return self._client.songs(video_ids)
+    
+    def close(self):
+        """Close the underlying HTTP connection pool"""
+        self._client.close()
+    
+    def resolve_url(self, url: str) -> Optional[innertube.ResolvedURL]:
+        """Resolve YouTube URL (only handles and vanity URLs hit the API)"""
+        return self._client.resolve(url)
@@ -1,7 +1,9 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 import os
+import warnings
 
 
 class Settings(BaseSettings):
@@ -27,8 +29,55 @@ class Settings(BaseSettings):
     
     # Cache
     CACHE_TTL: int = 300  # 5 minutes
-    CACHE_MAX_SIZE: int = 1000
-    REDIS_URL: Optional[str] = None
+    CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # in-process cache memory budget
+    CACHE_MAX_SIZE: Optional[int] = None  # deprecated and ignored; see CACHE_MAX_BYTES
+    # Eviction: "lru", or "tinylfu" (W-TinyLFU: a CACHE_WINDOW share of the budget
+    # admits new entries, which then only displace entries read less often)
+    CACHE_POLICY: str = "tinylfu"
+    CACHE_WINDOW: float = 0.01
+    CACHE_TRACE_FILE: Optional[str] = None  # key trace for benchmarks/cache.py
+    # Values whose JSON reaches CACHE_COMPRESS_MIN_BYTES are kept compressed
+    # (zstd, or zlib without zstandard) in both tiers
+    CACHE_COMPRESS: bool = True
+    CACHE_COMPRESS_MIN_BYTES: int = 16 * 1024
+    CACHE_COMPRESS_LEVEL: int = 3
+    # Entries this large are encoded and decoded in a worker thread, off the event loop
+    CACHE_THREAD_BYTES: int = 32 * 1024
+    # TTL by key namespace ("yt:search") or prefix ("raw"); other keys use CACHE_TTL
+    CACHE_TTL_POLICY: Dict[str, int] = {
+        "yt:trending": 600,
+        "yt:resolve": 86400,  # handles rarely change
+        "stream:all": 180,  # stream URLs expire
+        "music:home": 600,
+        "music:charts": 3600,
+        "music:moods": 3600,
+        "music:new_releases": 3600,
+        "raw": 300,  # raw player/next responses shared across endpoints
+    }
+    # Seconds past its TTL an entry is served while refreshed in the background
+    CACHE_STALE_WHILE_REVALIDATE: Dict[str, int] = {
+        "yt:trending": 600,
+        "music:home": 600,
+        "music:charts": 3600,
+        "music:moods": 3600,
+        "music:new_releases": 3600,
+    }
+    # Further seconds an entry is kept to serve when upstream fails
+    # (not for stream URLs, which expire upstream)
+    CACHE_STALE_IF_ERROR: Dict[str, int] = {
+        "yt": 3600,
+        "music": 3600,
+    }
+    # Probabilistic early refresh of fresh entries; higher is earlier, 0 disables
+    CACHE_EARLY_EXPIRY_BETA: float = 1.0
+    CACHE_EARLY_EXPIRY_DELTA: float = 1.0  # assumed fetch seconds until one is measured
+    REDIS_URL: Optional[str] = None  # shared L2 cache; unset for in-process only
+    CACHE_REDIS_PREFIX: str = "cache:"
+    CACHE_REDIS_TIMEOUT: float = 0.25  # seconds per Redis command
+    CACHE_REDIS_RETRY: float = 30.0  # seconds in-process only after a Redis failure
+    
+    # Upstream
+    UPSTREAM_TIMEOUT: float = 10.0  # seconds per InnerTube call
     
     # CORS
     CORS_ORIGINS: list = ["*"]
@@ -37,6 +86,18 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    @field_validator("CACHE_MAX_SIZE")
+    @classmethod
+    def _deprecated_max_size(cls, value: Optional[int]) -> Optional[int]:
+        """Accept the old entry-count limit from existing .env files, with a warning"""
+        if value is not None:
+            warnings.warn(
+                "CACHE_MAX_SIZE is deprecated and ignored; the cache is bounded by "
+                "CACHE_MAX_BYTES",
+                FutureWarning
+            )
+        return value
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -9,6 +9,8 @@ from app.api.v1.router import api_router
 from app.core.exceptions import APIException
 from app.core.middleware import LoggingMiddleware, RateLimitMiddleware
 from app.core.logging import setup_logging
+from app.services.cache import cache_service
+from app.services.container import ServiceContainer
 
 
 @asynccontextmanager
@@ -17,8 +19,11 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
     print(f"🚀 Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    app.state.services = ServiceContainer()
     yield
     # Shutdown
+    app.state.services.close()
+    await cache_service.close()
     print(f"👋 Shutting down {settings.APP_NAME}")
 
 
@@ -112,3 +117,8 @@ async def health_check():
         "timestamp": time.time(),
         "version": settings.APP_VERSION
     }
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Cache statistics, per key namespace"""
+    return cache_service.stats()
@@ -1,4 +1,6 @@
 from typing import Dict, Any, List, Optional
+
+from innertube import Song
 from app.parsers.base import BaseParser
 
 
@@ -108,7 +110,7 @@ class MusicParser(BaseParser):
             return "playlist"
         return "unknown"
     
-    def parse_song(self, player: Dict, next_data: Dict) -> Dict[str, Any]:
+    def parse_song(self, player: Dict) -> Dict[str, Any]:
         """Parse song details"""
         video_details = player.get("videoDetails", {})
         
@@ -121,6 +123,19 @@ class MusicParser(BaseParser):
             "isLive": video_details.get("isLiveContent", False),
         }
     
+    def parse_queue_song(self, song: Song) -> Dict[str, Any]:
+        """Parse song metadata from a music queue entry"""
+        return {
+            "videoId": song.video_id,
+            "title": song.title,
+            "artist": song.artist,
+            "artistId": song.artist_id,
+            "album": song.album,
+            "albumId": song.album_id,
+            "duration": song.duration_seconds,
+            "thumbnail": song.thumbnails[-1].get("url", "") if song.thumbnails else "",
+        }
+    
     def extract_lyrics_browse_id(self, next_data: Dict) -> Optional[str]:
         """Extract lyrics browse ID from next data"""
         try:
@@ -225,6 +240,56 @@ class MusicParser(BaseParser):
             )
         }
     
+    def parse_artist_albums(self, data: Dict) -> Dict[str, Any]:
+        """Parse the albums shelf of an artist page"""
+        sections = self.safe_get(
+            data,
+            "contents",
+            "singleColumnBrowseResultsRenderer",
+            "tabs", 0,
+            "tabRenderer",
+            "content",
+            "sectionListRenderer",
+            "contents",
+            default=[]
+        )
+        
+        # Shelf titles are localised, so find the first shelf of album links: the
+        # albums shelf, which comes before the singles shelf (also album pages)
+        albums = []
+        for section in sections:
+            shelf = section.get("musicCarouselShelfRenderer", {})
+            page_types = {
+                self.safe_get(
+                    item,
+                    "musicTwoRowItemRenderer",
+                    "navigationEndpoint",
+                    "browseEndpoint",
+                    "browseEndpointContextSupportedConfigs",
+                    "browseEndpointContextMusicConfig",
+                    "pageType"
+                )
+                for item in shelf.get("contents", [])
+            }
+            if page_types != {"MUSIC_PAGE_TYPE_ALBUM"}:
+                continue
+            
+            for item in shelf.get("contents", []):
+                renderer = item.get("musicTwoRowItemRenderer", {})
+                albums.append({
+                    "browseId": self.safe_get(
+                        renderer, "navigationEndpoint", "browseEndpoint", "browseId"
+                    ),
+                    "title": self.get_text(renderer.get("title")),
+                    "year": self.get_text(renderer.get("subtitle")),
+                    "thumbnail": self._get_music_thumbnail(
+                        renderer.get("thumbnailRenderer")
+                    ),
+                })
+            break
+        
+        return {"albums": albums}
+    
     def parse_playlist(self, data: Dict) -> Dict[str, Any]:
         """Parse music playlist"""
         header = self.safe_get(
@@ -248,3 +313,7 @@ class MusicParser(BaseParser):
     def parse_moods(self, data: Dict) -> Dict[str, Any]:
         """Parse moods and genres"""
         return {"raw": data}
+    
+    def parse_new_releases(self, data: Dict) -> Dict[str, Any]:
+        """Parse new releases (the browse response, as returned before)"""
+        return data
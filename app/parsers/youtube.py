@@ -1,4 +1,6 @@
 from typing import Dict, Any, List, Optional
+
+from innertube import ResolvedURL
 from app.parsers.base import BaseParser
 
 
@@ -98,7 +100,7 @@ class YouTubeParser(BaseParser):
             "channel": self.get_text(playlist.get("shortBylineText"))
         }
     
-    def parse_video(self, player: Dict, next_data: Dict) -> Dict[str, Any]:
+    def parse_video(self, player: Dict) -> Dict[str, Any]:
         """Parse video details"""
         video_details = player.get("videoDetails", {})
         streaming_data = player.get("streamingData", {})
@@ -173,6 +175,15 @@ class YouTubeParser(BaseParser):
             "isFamilySafe": metadata.get("isFamilySafe")
         }
     
+    def parse_resolved_url(self, resolved: ResolvedURL) -> Dict[str, Any]:
+        """Parse a resolved URL"""
+        return {
+            "type": resolved.type,
+            "id": resolved.id,
+            "playlistId": resolved.playlist_id,
+            "music": resolved.music,
+        }
+    
     def parse_channel_videos(self, data: Dict, limit: int = 30) -> Dict[str, Any]:
         """Parse channel videos"""
         # Implementation depends on channel structure
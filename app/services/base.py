@@ -1,21 +1,311 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Tuple, TypeVar
+import asyncio
+import time
 from app.clients.innertube import InnerTubeClient
+from app.config import settings
 from app.services.cache import cache_service
+from app.services.plan import Fetch, FetchPlan
+from app.core.exceptions import APIException, ExternalAPIError
 from app.core.logging import get_logger
 
+T = TypeVar("T")
+
+logger = get_logger(__name__)
+
+# Endpoints keyed by video ID whose raw responses every parser of that video reuses
+RAW_CACHED_ENDPOINTS = ("player", "next")
+
+# Fetches in flight by cache key, shared by all services (raw keys cross services)
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def gather_partial(*calls: Awaitable[Any]) -> List[Optional[Any]]:
+    """Run calls concurrently; calls that fail or time out yield None"""
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Upstream call failed: {result!r}")
+    
+    return [None if isinstance(result, Exception) else result for result in results]
+
 
 class BaseService(ABC):
     """Base service class"""
     
+    # Upstream calls each service method makes; see app.services.plan
+    PLANS: Dict[str, FetchPlan] = {}
+    # Parser the plans' parse steps name methods of
+    parser: Any
+    
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
         self.cache = cache_service
     
-    def _get_cached(self, key: str) -> Optional[Dict]:
+    async def _get_cached(self, key: str) -> Optional[Dict]:
         """Get from cache"""
-        return self.cache.get(key)
+        return await self.cache.get(key)
+    
+    async def _set_cached(self, key: str, value: Dict, ttl: Optional[int] = None):
+        """Set in cache (ttl defaults to the key's namespace policy)"""
+        await self.cache.set(key, value, ttl)
+    
+    async def _cached(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict]],
+        ttl: Optional[int] = None
+    ) -> Dict:
+        """Get from cache or fetch and cache, serving stale entries per policy"""
+        return (await self._cached_entry(key, fetch, ttl))[0]
+    
+    async def _cached_entry(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict]],
+        ttl: Optional[int] = None
+    ) -> Tuple[Dict, bool]:
+        """_cached's value, and whether it was served from cache rather than fetched"""
+        entry = await self.cache.get_stale(key)
+        if entry is not None:
+            value, staleness = entry
+            if staleness <= 0:
+                # Refresh hot keys early at random so they don't all expire at once
+                if self.cache.expires_early(key, -staleness):
+                    self.cache.record(key, "early_refreshes")
+                    self._refresh(key, fetch, ttl)
+                return value, True
+            if staleness <= self.cache.stale_while_revalidate(key):
+                self.cache.record(key, "stale_serves")
+                self._refresh(key, fetch, ttl)
+                return value, True
+        
+        try:
+            # Shielded: a cancelled request mustn't cancel the fetch others are awaiting
+            value = await asyncio.shield(self._fetch_once(key, fetch, ttl))
+        except Exception as error:
+            # Client errors (not found, invalid input) aren't worth masking
+            client_error = isinstance(error, APIException) and not isinstance(
+                error, ExternalAPIError
+            )
+            if entry is None or client_error:
+                raise
+            self.logger.warning(f"Serving stale {key} after upstream error: {error!r}")
+            self.cache.record(key, "stale_on_error")
+            return entry[0], True
+        
+        return value, False
+    
+    async def _cached_many(
+        self,
+        keys: List[str],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Dict]]],
+        ttl: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """_cached for several keys, fetching the ones needed in one call
+        
+        fetch gets the keys to fetch and returns the values it found, by key.
+        """
+        entries = await self.cache.get_stale_many(keys)
+        values: Dict[str, Dict] = {}
+        refresh: List[str] = []
+        
+        for key, entry in entries.items():
+            if entry is None:
+                continue
+            value, staleness = entry
+            if staleness <= 0:
+                if self.cache.expires_early(key, -staleness):
+                    self.cache.record(key, "early_refreshes")
+                    refresh.append(key)
+            elif staleness <= self.cache.stale_while_revalidate(key):
+                self.cache.record(key, "stale_serves")
+                refresh.append(key)
+            else:
+                continue
+            values[key] = value
+        
+        if refresh:
+            self._refresh_many(refresh, fetch, ttl)
+        missing = [key for key in keys if key not in values]
+        if not missing:
+            return values
+        
+        tasks = self._fetch_many_once(missing, fetch, ttl)
+        try:
+            # Shielded: a cancelled request mustn't cancel fetches others are awaiting
+            fetched = await asyncio.shield(asyncio.gather(*tasks.values()))
+        except Exception as error:
+            client_error = isinstance(error, APIException) and not isinstance(
+                error, ExternalAPIError
+            )
+            stale = {
+                key: entry[0]
+                for key, entry in entries.items()
+                if key in missing and entry is not None
+            }
+            if not stale or client_error:
+                raise
+            self.logger.warning(
+                f"Serving {len(stale)} stale entries after upstream error: {error!r}"
+            )
+            for key in stale:
+                self.cache.record(key, "stale_on_error")
+            values.update(stale)
+            return values
+        
+        values.update(
+            (key, value) for key, value in zip(tasks, fetched) if value is not None
+        )
+        return values
+    
+    def _fetch_many_once(
+        self,
+        keys: List[str],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Dict]]],
+        ttl: Optional[int]
+    ) -> Dict[str, asyncio.Task]:
+        """Per key, a task fetching and caching its value (None if not found)
+        
+        Keys already in flight join those fetches; the rest are fetched in one call.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        for key in keys:
+            task = _inflight.get(key)
+            if task is not None:
+                self.cache.record(key, "coalesced")
+                tasks[key] = task
+        
+        new = [key for key in keys if key not in tasks]
+        if not new:
+            return tasks
+        
+        async def fetch_and_set() -> Dict[str, Dict]:
+            start = time.monotonic()
+            values = await fetch(new)
+            self.cache.record_fetch_time(new[0], time.monotonic() - start)
+            for key, value in values.items():
+                await self._set_cached(key, value, ttl)
+            return values
+        
+        async def pick(key: str) -> Optional[Dict]:
+            return (await batch).get(key)
+        
+        batch = asyncio.create_task(fetch_and_set())
+        for key in new:
+            tasks[key] = self._track(key, asyncio.create_task(pick(key)))
+        return tasks
+    
+    def _refresh_many(
+        self,
+        keys: List[str],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Dict]]],
+        ttl: Optional[int]
+    ):
+        """Refetch entries in the background, except those already being fetched"""
+        keys = [key for key in keys if key not in _inflight]
+        for key, task in self._fetch_many_once(keys, fetch, ttl).items():
+            task.add_done_callback(self._refreshed(key))
+    
+    def _track(self, key: str, task: asyncio.Task) -> asyncio.Task:
+        """Mark a key's fetch in flight until it's done"""
+        def done(task: asyncio.Task):
+            if _inflight.get(key) is task:
+                del _inflight[key]
+            if not task.cancelled():
+                task.exception()  # Retrieved here; awaiters still see it
+        
+        _inflight[key] = task
+        task.add_done_callback(done)
+        return task
+    
+    def _fetch_once(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict]],
+        ttl: Optional[int]
+    ) -> asyncio.Task:
+        """Fetch and cache a key, joining the fetch already in flight for it"""
+        task = _inflight.get(key)
+        if task is not None:
+            self.cache.record(key, "coalesced")
+            return task
+        
+        async def fetch_and_set():
+            start = time.monotonic()
+            value = await fetch()
+            self.cache.record_fetch_time(key, time.monotonic() - start)
+            await self._set_cached(key, value, ttl)
+            return value
+        
+        return self._track(key, asyncio.create_task(fetch_and_set()))
+    
+    def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict]],
+        ttl: Optional[int]
+    ):
+        """Refetch an entry in the background, unless it's already being fetched"""
+        if key in _inflight:
+            return
+        self._fetch_once(key, fetch, ttl).add_done_callback(self._refreshed(key))
+    
+    def _refreshed(self, key: str) -> Callable[[asyncio.Task], None]:
+        """Done callback counting a background refresh of a key"""
+        def done(task: asyncio.Task):
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is None:
+                self.cache.record(key, "refreshes")
+            else:
+                self.logger.warning(f"Background refresh of {key} failed: {error!r}")
+                self.cache.record(key, "refresh_errors")
+        
+        return done
+    
+    async def _call(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None
+    ) -> T:
+        """Run a blocking upstream call in a thread, bounded by a timeout"""
+        # On timeout the worker thread finishes in the background; its result is dropped
+        return await asyncio.wait_for(
+            asyncio.to_thread(func, *args),
+            timeout or settings.UPSTREAM_TIMEOUT
+        )
+    
+    async def _fetch(self, fetch: Fetch, *args: Any) -> Dict[str, Any]:
+        """Make a planned upstream call, reusing cached raw player/next responses"""
+        client = getattr(self, fetch.client)
+        func = getattr(client, fetch.endpoint)
+        
+        if fetch.endpoint not in RAW_CACHED_ENDPOINTS:
+            return await self._call(func, *args)
+        
+        cache_key = f"raw:{fetch.endpoint}:{client.client_type}:{args[0]}:{client.locale}"
+        if not fetch.shared:
+            # Still fresher than what's cached, so pass it on to other methods
+            response = await self._call(func, *args)
+            await self._set_cached(cache_key, response)
+            return response
+        return await self._cached(cache_key, lambda: self._call(func, *args))
     
-    def _set_cached(self, key: str, value: Dict, ttl: int = 300):
-        """Set in cache"""
-        self.cache.set(key, value, ttl)
+    async def _run_plan(self, name: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Make the upstream calls planned for a method and parse the responses"""
+        plan = self.PLANS[name]
+        fetches = list(plan.fetches.items())
+        
+        responses = await asyncio.gather(*(
+            self._fetch(fetch, *args) for _, fetch in fetches
+        ))
+        
+        data = {
+            argument: fetch.project(response)
+            for (argument, fetch), response in zip(fetches, responses)
+        }
+        return getattr(self.parser, plan.parser)(**data, **kwargs)
@@ -1,49 +1,483 @@
-from cachetools import TTLCache
-from typing import Optional, Any
+from cachetools import Cache, TLRUCache
+from collections import Counter, defaultdict
+from typing import (
+    Optional, Any, Callable, DefaultDict, Dict, Iterable, List, TextIO, Tuple, Type
+)
+import asyncio
+import json
+import math
+import random
 import threading
+import time
+import zlib
 
 from app.config import settings
+from app.core.logging import get_logger
+from app.services.tinylfu import WTinyLFUCache
+
+try:
+    from redis import asyncio as aioredis  # type: ignore[import-untyped]
+    from redis.exceptions import RedisError  # type: ignore[import-untyped]
+except ImportError:  # Redis is optional; without it the cache is in-process only
+    aioredis = None
+    RedisError = OSError
+
+try:
+    import zstandard
+except ImportError:  # Optional; compression falls back to zlib
+    zstandard = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+# Failures that drop the cache to L1-only until CACHE_REDIS_RETRY has passed
+L2_ERRORS = (RedisError, OSError, asyncio.TimeoutError)
+
+
+def namespace(key: str) -> str:
+    """Key namespace, e.g. "yt:search" for "yt:search:query:None:20" """
+    return ":".join(key.split(":", 2)[:2])
+
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZLIB_MAGIC = b"\x78"  # JSON text never starts with either
+DECOMPRESS_ERRORS: Tuple[Type[Exception], ...] = (
+    (zlib.error,) if zstandard is None else (zlib.error, zstandard.ZstdError)
+)
+
+
+class Blob(bytes):
+    """A value stored compressed and serialised"""
+
+
+class TLRU(TLRUCache):
+    """TLRUCache with WTinyLFUCache's peek()"""
+    
+    def peek(self, key: str) -> Any:
+        """Value without refreshing its LRU position"""
+        return Cache.__getitem__(self, key)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON, as stored in Redis"""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def compress(data: bytes) -> Blob:
+    """Compress serialised data with zstd, or zlib if zstandard isn't installed"""
+    level = settings.CACHE_COMPRESS_LEVEL
+    if zstandard is not None:
+        return Blob(zstandard.ZstdCompressor(level=level).compress(data))
+    return Blob(zlib.compress(data, level))
+
+
+def decompress(data: bytes) -> bytes:
+    """Serialised data with any compression removed (ValueError if unreadable)"""
+    try:
+        if data[:4] == ZSTD_MAGIC:
+            if zstandard is None:
+                raise ValueError("zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if data[:1] == ZLIB_MAGIC:
+            return zlib.decompress(data)
+    except DECOMPRESS_ERRORS as error:
+        raise ValueError(f"Corrupt compressed data: {error}") from error
+    return data
+
+
+def encode(value: Any) -> Tuple[Any, bytes, int, int]:
+    """A value's L1 form, Redis payload, and stored and raw sizes in bytes
+    
+    Raises TypeError or ValueError for values that aren't JSON-serialisable,
+    whose size in memory couldn't be budgeted for.
+    """
+    data = dumps(value)
+    if settings.CACHE_COMPRESS and len(data) >= settings.CACHE_COMPRESS_MIN_BYTES:
+        blob = compress(data)
+        return blob, blob, len(blob), len(data)
+    # Serialised size stands in for the live object's
+    return value, data, len(data), len(data)
+
+
+def decode(data: bytes) -> Tuple[Any, bytes]:
+    """Value and uncompressed form of serialised data (ValueError if unreadable)"""
+    raw = decompress(data)
+    return json.loads(raw), raw
 
 
 class CacheService:
-    """In-memory cache service"""
+    """Two-tier cache: in-process L1 in front of a shared Redis L2"""
     
     _instance = None
     _lock = threading.Lock()
     
+    _cache: Any  # TLRU or WTinyLFUCache
+    _clock: Callable[[], float]
+    _stats: DefaultDict[str, Counter]
+    _fetch_times: Dict[str, float]
+    _sizes: Dict[str, int]
+    _redis: Any  # redis.asyncio.Redis, or None
+    _trace: Optional[TextIO]
+    _prefix: str
+    _l2_errors: int
+    _l2_retry_at: float
+    
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
-                    cls._instance._cache = TTLCache(
-                        maxsize=settings.CACHE_MAX_SIZE,
-                        ttl=settings.CACHE_TTL
+                    cls._instance._clock = time.monotonic
+                    cls._instance._cache = cls._instance._l1(settings.CACHE_MAX_BYTES)
+                    cls._instance._stats = defaultdict(Counter)
+                    cls._instance._fetch_times = {}
+                    cls._instance._sizes = {}
+                    cls._instance._redis = cls._connect()
+                    cls._instance._trace = (
+                        open(settings.CACHE_TRACE_FILE, "a", buffering=1 << 16)
+                        if settings.CACHE_TRACE_FILE else None
                     )
+                    cls._instance._prefix = settings.CACHE_REDIS_PREFIX
+                    cls._instance._l2_errors = 0
+                    cls._instance._l2_retry_at = 0.0
         return cls._instance
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
-        return self._cache.get(key)
+    def _l1(self, max_bytes: int, policy: Optional[str] = None):
+        """In-process cache holding up to max_bytes of entries"""
+        policy = policy or settings.CACHE_POLICY
+        # Entries are (lifetime, value or Blob, fresh_until, bytes, raw bytes): each
+        # expires after its own TTL plus its namespace's stale windows, and counts
+        # its size against the byte budget
+        options: Dict[str, Any] = dict(
+            maxsize=max_bytes,
+            ttu=lambda key, entry, now: now + entry[0],
+            timer=lambda: self._clock(),
+            getsizeof=lambda entry: entry[3]
+        )
+        
+        if policy == "lru":
+            return TLRU(**options)
+        if policy == "tinylfu":
+            # About one sketch counter per 4 KiB of budget
+            return WTinyLFUCache(
+                **options,
+                window=settings.CACHE_WINDOW,
+                sketch_width=max(1024, max_bytes // 4096)
+            )
+        raise ValueError(f"Unknown CACHE_POLICY {policy!r}; use 'lru' or 'tinylfu'")
+    
+    @staticmethod
+    def _connect():
+        """Redis client for REDIS_URL (connects lazily), or None"""
+        if not settings.REDIS_URL:
+            return None
+        if aioredis is None:
+            logger.warning("REDIS_URL is set but redis is not installed; using L1 only")
+            return None
+        return aioredis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT
+        )
+    
+    def _l2(self):
+        """Redis client, or None while Redis is disabled or backing off"""
+        if self._redis is None or self._clock() < self._l2_retry_at:
+            return None
+        return self._redis
+    
+    def _l2_failed(self, error: Exception):
+        """Fall back to L1-only until the retry interval passes"""
+        logger.warning(f"Redis unavailable, using in-process cache only: {error!r}")
+        self._l2_errors += 1
+        self._l2_retry_at = self._clock() + settings.CACHE_REDIS_RETRY
+    
+    @staticmethod
+    def _policy(table: Dict[str, int], key: str, default: int) -> int:
+        """Look up a key's namespace, then its prefix, in a policy table"""
+        name = namespace(key)
+        
+        if name in table:
+            return table[name]
+        return table.get(name.split(":", 1)[0], default)
+    
+    def ttl_for(self, key: str) -> int:
+        """Seconds an entry is fresh"""
+        return self._policy(settings.CACHE_TTL_POLICY, key, settings.CACHE_TTL)
+    
+    def stale_while_revalidate(self, key: str) -> int:
+        """Seconds past its TTL an entry is served while refreshed in the background"""
+        return self._policy(settings.CACHE_STALE_WHILE_REVALIDATE, key, 0)
+    
+    def stale_if_error(self, key: str) -> int:
+        """Further seconds an entry is kept to serve when upstream fails"""
+        return self._policy(settings.CACHE_STALE_IF_ERROR, key, 0)
+    
+    def _stale_for(self, key: str) -> int:
+        return self.stale_while_revalidate(key) + self.stale_if_error(key)
+    
+    def record(self, key: str, event: str):
+        """Count a cache event (e.g. a stale serve) against the key's namespace"""
+        self._stats[namespace(key)][event] += 1
+    
+    def record_fetch_time(self, key: str, seconds: float):
+        """Track how long fetching the key's namespace takes (moving average)"""
+        name = namespace(key)
+        previous = self._fetch_times.get(name)
+        
+        self._fetch_times[name] = (
+            seconds if previous is None else previous + 0.2 * (seconds - previous)
+        )
+    
+    def expires_early(self, key: str, remaining: float) -> bool:
+        """Whether to refresh a fresh entry now (XFetch probabilistic early expiry)
+        
+        Likelier the closer the entry is to expiring and the slower its namespace
+        is to fetch, so refreshes of a hot key spread out instead of stampeding.
+        """
+        beta = settings.CACHE_EARLY_EXPIRY_BETA
+        if beta <= 0:
+            return False
+        
+        delta = self._fetch_times.get(namespace(key), settings.CACHE_EARLY_EXPIRY_DELTA)
+        return -delta * beta * math.log(1.0 - random.random()) >= remaining
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set value in cache"""
-        self._cache[key] = value
+    async def _encode(self, key: str, value: Any) -> Tuple[Any, bytes, int, int]:
+        """encode(), in a worker thread unless the key's namespace last encoded small
+        
+        A value's size is only known once it is serialised, so the namespace's
+        previous size predicts it; namespaces not yet seen are encoded off the loop.
+        """
+        name = namespace(key)
+        threshold = settings.CACHE_THREAD_BYTES
+        if self._sizes.get(name, threshold) >= threshold:
+            encoded = await asyncio.to_thread(encode, value)
+        else:
+            encoded = encode(value)
+        self._sizes[name] = encoded[3]
+        return encoded
     
-    def delete(self, key: str):
+    async def _decode(self, data: bytes) -> Tuple[Any, bytes]:
+        """decode(), in a worker thread for data large enough to stall the event loop"""
+        if len(data) >= settings.CACHE_THREAD_BYTES:
+            return await asyncio.to_thread(decode, data)
+        return decode(data)
+    
+    def _store(
+        self,
+        key: str,
+        lifetime: float,
+        stored: Any,
+        fresh_until: float,
+        size: int,
+        raw_size: int
+    ):
+        """Put an entry in L1, unless it alone exceeds the byte budget"""
+        self._cache.pop(key, None)
+        try:
+            self._cache[key] = (lifetime, stored, fresh_until, size, raw_size)
+        except ValueError:
+            self.record(key, "too_large")
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a fresh value from cache"""
+        return (await self.get_many([key]))[key]
+    
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """Get several fresh values, fetching L1 misses from Redis in one pipeline"""
+        entries = await self._lookup_many(keys)
+        values: Dict[str, Optional[Any]] = {}
+        
+        for key, entry in entries.items():
+            values[key] = entry[0] if entry and entry[1] <= 0 else None
+            self.record(key, "hits" if values[key] is not None else "misses")
+        return values
+    
+    async def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Get a value and the seconds it has been stale for (<= 0 while fresh)"""
+        return (await self.get_stale_many([key]))[key]
+    
+    async def get_stale_many(
+        self, keys: Iterable[str]
+    ) -> Dict[str, Optional[Tuple[Any, float]]]:
+        """get_stale for several keys, fetching L1 misses from Redis in one pipeline"""
+        entries = await self._lookup_many(keys)
+        
+        for key, entry in entries.items():
+            self.record(key, "hits" if entry and entry[1] <= 0 else "misses")
+        return entries
+    
+    async def _lookup_many(
+        self, keys: Iterable[str]
+    ) -> Dict[str, Optional[Tuple[Any, float]]]:
+        """Values and staleness from L1, then L2 for L1 misses"""
+        now = self._clock()
+        entries: Dict[str, Optional[Tuple[Any, float]]] = {}
+        missing: List[str] = []
+        
+        for key in keys:
+            if self._trace is not None:
+                self._trace.write(f"{now:.3f}\tget\t{key}\n")
+            entry: Optional[Tuple[float, Any, float, int, int]] = self._cache.get(key)
+            if entry is None:
+                entries[key] = None
+                missing.append(key)
+                continue
+            value = entry[1]
+            if isinstance(value, Blob):
+                value, _ = await self._decode(value)
+            entries[key] = (value, now - entry[2])
+        
+        redis = self._l2()
+        if missing and redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.get(self._prefix + key)
+                        pipe.pttl(self._prefix + key)
+                    results = await pipe.execute()
+            except L2_ERRORS as error:
+                self._l2_failed(error)
+            else:
+                for key, data, pttl in zip(missing, results[::2], results[1::2]):
+                    if data is None or pttl <= 0:
+                        continue
+                    try:
+                        value, raw = await self._decode(data)
+                    except ValueError as error:
+                        logger.warning(f"Unreadable cache entry {key}: {error!r}")
+                        continue
+                    # Redis keeps entries through their stale windows too
+                    fresh_until = now + pttl / 1000 - self._stale_for(key)
+                    entries[key] = (value, now - fresh_until)
+                    self.record(key, "l2_hits")
+                    # The L1 copy expires with the shared one
+                    stored = Blob(data) if raw is not data else value
+                    self._store(
+                        key, pttl / 1000, stored, fresh_until, len(data), len(raw)
+                    )
+        
+        return entries
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set value in cache (ttl defaults to the key's namespace policy)"""
+        ttl = ttl if ttl is not None else self.ttl_for(key)
+        if ttl <= 0:
+            return
+        
+        lifetime = ttl + self._stale_for(key)
+        try:
+            stored, data, size, raw_size = await self._encode(key, value)
+        except (TypeError, ValueError) as error:
+            logger.warning(f"Not caching {key}, which isn't JSON-serialisable: {error}")
+            self.record(key, "unserialisable")
+            return
+        self._store(key, lifetime, stored, self._clock() + ttl, size, raw_size)
+        self.record(key, "sets")
+        if self._trace is not None:
+            self._trace.write(f"{self._clock():.3f}\tset\t{key}\t{size}\t{lifetime}\n")
+        
+        redis = self._l2()
+        if redis is None:
+            return
+        try:
+            await redis.set(self._prefix + key, data, ex=int(lifetime))
+        except L2_ERRORS as error:
+            self._l2_failed(error)
+    
+    async def delete(self, key: str):
         """Delete from cache"""
         self._cache.pop(key, None)
+        
+        redis = self._l2()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._prefix + key)
+        except L2_ERRORS as error:
+            self._l2_failed(error)
     
-    def clear(self):
+    async def clear(self):
         """Clear all cache"""
         self._cache.clear()
+        self._stats.clear()
+        self._fetch_times.clear()
+        self._sizes.clear()
+        
+        redis = self._l2()
+        if redis is None:
+            return
+        try:
+            keys = [key async for key in redis.scan_iter(match=f"{self._prefix}*")]
+            if keys:
+                await redis.unlink(*keys)
+        except L2_ERRORS as error:
+            self._l2_failed(error)
+    
+    async def close(self):
+        """Close the Redis connection pool and any trace file"""
+        if self._redis is not None:
+            await self._redis.aclose()
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
     
     def stats(self) -> dict:
-        """Get cache statistics"""
+        """Get cache statistics, overall and per namespace"""
+        self._cache.expire()
+        sizes: Counter = Counter()
+        stored_bytes: Counter = Counter()
+        raw_bytes: Counter = Counter()
+        for key in list(self._cache.keys()):
+            entry = self._cache.peek(key)
+            sizes[namespace(key)] += 1
+            stored_bytes[namespace(key)] += entry[3]
+            raw_bytes[namespace(key)] += entry[4]
+        
+        namespaces: Dict[str, Dict[str, Any]] = {}
+        for name in sorted(set(sizes) | set(self._stats)):
+            counts = self._stats[name]
+            lookups = counts["hits"] + counts["misses"]
+            namespaces[name] = {
+                "size": sizes[name],
+                "bytes": stored_bytes[name],
+                "compression_ratio": (
+                    raw_bytes[name] / stored_bytes[name] if stored_bytes[name] else 1.0
+                ),
+                "too_large": counts["too_large"],
+                "unserialisable": counts["unserialisable"],
+                "ttl": self.ttl_for(name),
+                "stale_while_revalidate": self.stale_while_revalidate(name),
+                "stale_if_error": self.stale_if_error(name),
+                "hits": counts["hits"],
+                "l2_hits": counts["l2_hits"],
+                "misses": counts["misses"],
+                "sets": counts["sets"],
+                "stale_serves": counts["stale_serves"],
+                "stale_on_error": counts["stale_on_error"],
+                "refreshes": counts["refreshes"],
+                "refresh_errors": counts["refresh_errors"],
+                "early_refreshes": counts["early_refreshes"],
+                "coalesced": counts["coalesced"],
+                "fetch_time": self._fetch_times.get(name),
+                "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+            }
+        
         return {
             "size": len(self._cache),
-            "maxsize": self._cache.maxsize,
-            "ttl": self._cache.ttl
+            "bytes": self._cache.currsize,
+            "max_bytes": self._cache.maxsize,
+            "policy": settings.CACHE_POLICY,
+            "compression": (
+                ("zstd" if zstandard is not None else "zlib")
+                if settings.CACHE_COMPRESS else None
+            ),
+            "ttl": settings.CACHE_TTL,
+            "l2": {
+                "enabled": self._redis is not None,
+                "available": self._l2() is not None,
+                "errors": self._l2_errors,
+            },
+            "namespaces": namespaces
         }
 
 
@@ -0,0 +1,37 @@
+from typing import Dict
+
+from fastapi import Request
+
+from app.clients.innertube import InnerTubeClient
+from app.services.music import MusicService
+from app.services.stream import StreamService
+from app.services.youtube import YouTubeService
+
+
+class ServiceContainer:
+    """Application-scoped services sharing one InnerTube client per client type"""
+
+    def __init__(self):
+        self.clients: Dict[str, InnerTubeClient] = {}
+        self.youtube = YouTubeService(self.client("WEB"), self.client("ANDROID"))
+        self.music = MusicService(
+            self.client("WEB_REMIX"), self.client("ANDROID_MUSIC")
+        )
+        self.stream = StreamService(self.client("ANDROID"), self.client("IOS"))
+
+    def client(self, client_type: str) -> InnerTubeClient:
+        """Get or create the shared client for a client type"""
+        if client_type not in self.clients:
+            self.clients[client_type] = InnerTubeClient(client_type)
+        return self.clients[client_type]
+
+    def close(self):
+        """Close all client connection pools"""
+        for client in self.clients.values():
+            client.close()
+        self.clients.clear()
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """Dependency returning the container created in the app lifespan"""
+    return request.app.state.services
@@ -1,7 +1,7 @@
-from typing import Optional, Dict, Any
-import asyncio
+from typing import Optional, Dict, Any, List
 
 from app.services.base import BaseService
+from app.services.plan import Fetch, FetchPlan
 from app.clients.innertube import InnerTubeClient
 from app.parsers.music import MusicParser
 
@@ -9,10 +9,38 @@ from app.parsers.music import MusicParser
 class MusicService(BaseService):
     """YouTube Music service"""
     
-    def __init__(self):
+    PLANS = {
+        "search": FetchPlan("parse_search", {"data": Fetch("search", ("contents",))}),
+        "get_song": FetchPlan("parse_song", {"player": Fetch("player", ("videoDetails",))}),
+        "get_lyrics_browse_id": FetchPlan(
+            "extract_lyrics_browse_id", {"next_data": Fetch("next", ("contents",))}
+        ),
+        "get_lyrics": FetchPlan("parse_lyrics", {"data": Fetch("browse", ("contents",))}),
+        "get_related": FetchPlan("parse_related", {"data": Fetch("next")}),
+        "get_album": FetchPlan(
+            "parse_album", {"data": Fetch("browse", ("header", "contents"))}
+        ),
+        "get_artist": FetchPlan("parse_artist", {"data": Fetch("browse", ("header",))}),
+        "get_artist_albums": FetchPlan(
+            "parse_artist_albums", {"data": Fetch("browse", ("contents",))}
+        ),
+        "get_playlist": FetchPlan(
+            "parse_playlist", {"data": Fetch("browse", ("header",))}
+        ),
+        "get_home": FetchPlan("parse_home", {"data": Fetch("browse")}),
+        "get_charts": FetchPlan("parse_charts", {"data": Fetch("browse")}),
+        "get_moods": FetchPlan("parse_moods", {"data": Fetch("browse")}),
+        "get_new_releases": FetchPlan("parse_new_releases", {"data": Fetch("browse")}),
+    }
+    
+    def __init__(
+        self,
+        client: Optional[InnerTubeClient] = None,
+        android_client: Optional[InnerTubeClient] = None
+    ):
         super().__init__()
-        self.client = InnerTubeClient("WEB_REMIX")
-        self.android_client = InnerTubeClient("ANDROID_MUSIC")
+        self.client = client or InnerTubeClient("WEB_REMIX")
+        self.android_client = android_client or InnerTubeClient("ANDROID_MUSIC")
         self.parser = MusicParser()
     
     async def search(
@@ -22,19 +50,12 @@ class MusicService(BaseService):
         limit: int = 20
     ) -> Dict[str, Any]:
         """Search YouTube Music"""
-        cache_key = f"music:search:{query}:{filter_type}:{limit}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return {**cached, "cached": True}
-        
         params = self._get_search_params(filter_type)
-        result = await asyncio.to_thread(
-            self.client.search, query, params
+        parsed, cached = await self._cached_entry(
+            f"music:search:{query}:{filter_type}:{limit}",
+            lambda: self._run_plan("search", query, params, limit=limit)
         )
-        parsed = self.parser.parse_search(result, limit)
-        
-        self._set_cached(cache_key, parsed)
-        return {**parsed, "cached": False}
+        return {**parsed, "cached": cached}
     
     def _get_search_params(self, filter_type: Optional[str]) -> Optional[str]:
         """Get search filter params"""
@@ -49,147 +70,105 @@ class MusicService(BaseService):
     
     async def get_song(self, video_id: str) -> Dict[str, Any]:
         """Get song details"""
-        cache_key = f"music:song:{video_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        player = await asyncio.to_thread(self.client.player, video_id)
-        next_data = await asyncio.to_thread(self.client.next, video_id)
-        
-        parsed = self.parser.parse_song(player, next_data)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"music:song:{video_id}",
+            lambda: self._run_plan("get_song", video_id)
+        )
+    
+    async def get_songs(self, video_ids: List[str]) -> Dict[str, Any]:
+        """Get song details in bulk"""
+        video_ids = list(dict.fromkeys(video_ids))
+        keys = {f"music:queue_song:{video_id}": video_id for video_id in video_ids}
+        
+        async def fetch(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+            fetched = await self._call(self.client.songs, [keys[key] for key in missing])
+            return {
+                f"music:queue_song:{video_id}": self.parser.parse_queue_song(song)
+                for video_id, song in fetched.items()
+            }
+        
+        cached = await self._cached_many(list(keys), fetch)
+        songs = {keys[key]: song for key, song in cached.items()}
+        
+        return {
+            "songs": [songs[video_id] for video_id in video_ids if video_id in songs],
+            "missing": [video_id for video_id in video_ids if video_id not in songs],
+            "total": len(songs),
+        }
     
     async def get_lyrics(self, video_id: str) -> Dict[str, Any]:
         """Get song lyrics"""
-        cache_key = f"music:lyrics:{video_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
+        return await self._cached(
+            f"music:lyrics:{video_id}", lambda: self._fetch_lyrics(video_id)
+        )
+    
+    async def _fetch_lyrics(self, video_id: str) -> Dict[str, Any]:
+        """Fetch song lyrics (songs without lyrics are cached as such too)"""
         # Get next data to find lyrics browse ID
-        next_data = await asyncio.to_thread(self.client.next, video_id)
-        lyrics_browse_id = self.parser.extract_lyrics_browse_id(next_data)
+        lyrics_browse_id = await self._run_plan("get_lyrics_browse_id", video_id)
         
         if not lyrics_browse_id:
             return {"lyrics": None, "source": None, "error": "Lyrics not available"}
         
-        lyrics_data = await asyncio.to_thread(
-            self.client.browse, lyrics_browse_id
-        )
-        parsed = self.parser.parse_lyrics(lyrics_data)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._run_plan("get_lyrics", lyrics_browse_id)
     
     async def get_related(self, video_id: str, limit: int = 20) -> Dict[str, Any]:
         """Get related songs"""
-        next_data = await asyncio.to_thread(self.client.next, video_id)
-        return self.parser.parse_related(next_data, limit)
+        return await self._run_plan("get_related", video_id, limit=limit)
     
     async def get_album(self, browse_id: str) -> Dict[str, Any]:
         """Get album details"""
-        cache_key = f"music:album:{browse_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(self.client.browse, browse_id)
-        parsed = self.parser.parse_album(result)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"music:album:{browse_id}",
+            lambda: self._run_plan("get_album", browse_id)
+        )
     
     async def get_artist(self, channel_id: str) -> Dict[str, Any]:
         """Get artist details"""
-        cache_key = f"music:artist:{channel_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(self.client.browse, channel_id)
-        parsed = self.parser.parse_artist(result)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"music:artist:{channel_id}",
+            lambda: self._run_plan("get_artist", channel_id)
+        )
     
     async def get_artist_albums(self, channel_id: str) -> Dict[str, Any]:
         """Get artist albums"""
-        artist = await self.get_artist(channel_id)
-        # Extract albums from artist data or make additional request
-        return {"albums": artist.get("albums", [])}
+        return await self._cached(
+            f"music:artist_albums:{channel_id}",
+            lambda: self._run_plan("get_artist_albums", channel_id)
+        )
     
     async def get_playlist(self, playlist_id: str) -> Dict[str, Any]:
         """Get music playlist"""
-        cache_key = f"music:playlist:{playlist_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
         browse_id = f"VL{playlist_id}" if not playlist_id.startswith("VL") else playlist_id
-        result = await asyncio.to_thread(self.client.browse, browse_id)
-        parsed = self.parser.parse_playlist(result)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"music:playlist:{playlist_id}",
+            lambda: self._run_plan("get_playlist", browse_id)
+        )
     
     async def get_home(self) -> Dict[str, Any]:
         """Get home page content"""
-        cache_key = "music:home"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(
-            self.client.browse, "FEmusic_home"
+        return await self._cached(
+            "music:home",
+            lambda: self._run_plan("get_home", "FEmusic_home")
         )
-        parsed = self.parser.parse_home(result)
-        
-        self._set_cached(cache_key, parsed, ttl=600)
-        return parsed
     
     async def get_charts(self, region: str = "US") -> Dict[str, Any]:
         """Get music charts"""
-        cache_key = f"music:charts:{region}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(
-            self.client.browse, "FEmusic_charts"
+        return await self._cached(
+            f"music:charts:{region}",
+            lambda: self._run_plan("get_charts", "FEmusic_charts")
         )
-        parsed = self.parser.parse_charts(result)
-        
-        self._set_cached(cache_key, parsed, ttl=3600)  # 1 hour
-        return parsed
     
     async def get_moods(self) -> Dict[str, Any]:
         """Get moods and genres"""
-        cache_key = "music:moods"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(
-            self.client.browse, "FEmusic_moods_and_genres"
+        return await self._cached(
+            "music:moods",
+            lambda: self._run_plan("get_moods", "FEmusic_moods_and_genres")
         )
-        parsed = self.parser.parse_moods(result)
-        
-        self._set_cached(cache_key, parsed, ttl=3600)
-        return parsed
     
     async def get_new_releases(self) -> Dict[str, Any]:
         """Get new releases"""
-        cache_key = "music:new_releases"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(
-            self.client.browse, "FEmusic_new_releases"
+        return await self._cached(
+            "music:new_releases",
+            lambda: self._run_plan("get_new_releases", "FEmusic_new_releases")
         )
-        
-        self._set_cached(cache_key, result, ttl=3600)
-        return result
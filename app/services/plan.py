@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Fetch:
+    """An upstream call and the top-level response keys its parser reads"""
+
+    endpoint: str  # InnerTubeClient method
+    keys: Optional[Tuple[str, ...]] = None  # None: the parser reads the whole response
+    client: str = "client"  # Service attribute holding the InnerTubeClient
+    # False: always call upstream rather than reuse a cached raw player/next
+    # response, which may be older than this method's results may be
+    shared: bool = True
+
+    def project(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the subtrees the parser reads"""
+        if self.keys is None:
+            return data
+        return {key: data[key] for key in self.keys if key in data}
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """Upstream calls a service method makes, keyed by parser argument name"""
+
+    parser: str  # Parser method the fetched responses are passed to
+    fetches: Dict[str, Fetch] = field(default_factory=dict)
@@ -1,7 +1,7 @@
 from typing import Optional, Dict, Any, List
-import asyncio
 
 from app.services.base import BaseService
+from app.services.plan import Fetch, FetchPlan
 from app.clients.innertube import InnerTubeClient
 from app.parsers.stream import StreamParser
 
@@ -9,26 +9,31 @@ from app.parsers.stream import StreamParser
 class StreamService(BaseService):
     """Streaming service"""
     
-    def __init__(self):
+    PLANS = {
+        # Stream URLs expire, so they're only as old as the stream:all entry
+        "get_streams": FetchPlan(
+            "parse_all_streams",
+            {"data": Fetch("player", ("streamingData",), shared=False)}
+        ),
+    }
+    
+    def __init__(
+        self,
+        client: Optional[InnerTubeClient] = None,
+        ios_client: Optional[InnerTubeClient] = None
+    ):
         super().__init__()
         # Use Android client for better stream availability
-        self.client = InnerTubeClient("ANDROID")
-        self.ios_client = InnerTubeClient("IOS")
+        self.client = client or InnerTubeClient("ANDROID")
+        self.ios_client = ios_client or InnerTubeClient("IOS")
         self.parser = StreamParser()
     
     async def get_streams(self, video_id: str) -> Dict[str, Any]:
         """Get all available streams"""
-        cache_key = f"stream:all:{video_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(self.client.player, video_id)
-        parsed = self.parser.parse_all_streams(result)
-        
-        # Shorter cache for streams (URLs expire)
-        self._set_cached(cache_key, parsed, ttl=180)
-        return parsed
+        return await self._cached(
+            f"stream:all:{video_id}",
+            lambda: self._run_plan("get_streams", video_id)
+        )
     
     async def get_audio_stream(
         self, 
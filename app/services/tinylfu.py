@@ -0,0 +1,221 @@
+"""W-TinyLFU admission for the in-process response cache
+
+Every new entry enters a small LRU window. Entries the window evicts then
+compete for the main LRU segment against its eviction victims, judged by a
+count-min sketch of recent access frequency. Keys read once (a crawler paging
+through one-off searches) can't push out keys read often (trending, charts,
+popular songs). See Einziger, Friedman & Manes, "TinyLFU: A Highly Efficient
+Cache Admission Policy" (2017).
+"""
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+import heapq
+import itertools
+import time
+
+_MISSING = object()
+
+
+class FrequencySketch:
+    """Count-min sketch of 4-bit counters, halved periodically so popularity fades"""
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    # Odd multipliers giving each row an independent index (as in Caffeine)
+    SEEDS = (
+        0xC3A5C85C97CB3127,
+        0xB492B66FBE98F273,
+        0x9AE16A3B2F90404F,
+        0xCBF29CE484222325,
+    )
+
+    def __init__(self, width: int):
+        self.width = 1 << max(width - 1, 1).bit_length()  # Power of two
+        self.shift = 64 - self.width.bit_length() + 1
+        self.rows = [bytearray(self.width) for _ in range(self.DEPTH)]
+        self.additions = 0
+        self.sample_size = 10 * self.width
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 32
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> self.shift for seed in self.SEEDS]
+
+    def increment(self, key: Hashable):
+        """Record an access"""
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.rows = [bytearray(count >> 1 for count in row) for row in self.rows]
+            self.additions //= 2
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimated recent accesses (never an undercount)"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+
+class WTinyLFUCache(MutableMapping):
+    """Size- and time-aware cache with W-TinyLFU admission
+
+    Takes the same arguments as cachetools.TLRUCache: ttu(key, value, now)
+    gives each entry's expiry time, and getsizeof(value) its share of maxsize.
+    Values larger than the main segment raise ValueError, like TLRUCache's
+    values larger than maxsize.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttu: Callable[[Hashable, Any, float], float],
+        timer: Callable[[], float] = time.monotonic,
+        getsizeof: Callable[[Any], int] = lambda value: 1,
+        window: float = 0.01,
+        sketch_width: int = 1024,
+    ):
+        self.maxsize = maxsize
+        self.ttu = ttu
+        self.timer = timer
+        self.getsizeof = getsizeof
+        self.window_maxsize = max(1, int(maxsize * window))
+        self.main_maxsize = maxsize - self.window_maxsize
+        self.sketch = FrequencySketch(sketch_width)
+
+        # key: (value, size, expires); segments hold keys in LRU order
+        self._data: Dict[Hashable, Tuple[Any, int, float]] = {}
+        self._window: OrderedDict = OrderedDict()
+        self._main: OrderedDict = OrderedDict()
+        self._window_size = 0
+        self._main_size = 0
+        # (expires, tiebreak, key), pruned lazily
+        self._expiries: List[Tuple[float, int, Hashable]] = []
+        self._order = itertools.count()
+
+    @property
+    def currsize(self) -> int:
+        return self._window_size + self._main_size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        now = self.timer()
+        return iter([key for key, entry in self._data.items() if now < entry[2]])
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and self.timer() < entry[2]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        self.sketch.increment(key)
+
+        entry = self._data.get(key)
+        if entry is None or not self.timer() < entry[2]:
+            raise KeyError(key)
+
+        (self._window if key in self._window else self._main).move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable) -> Any:
+        """Value without recording an access or refreshing its LRU position"""
+        return self._data[key][0]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        now = self.timer()
+        expires = self.ttu(key, value, now)
+        if not now < expires:
+            return
+        size = self.getsizeof(value)
+        # Entries only stay cached once admitted to the main segment
+        if size > self.main_maxsize:
+            raise ValueError("value too large")
+
+        self.expire(now)
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (value, size, expires)
+        heapq.heappush(self._expiries, (expires, next(self._order), key))
+        self._window[key] = None
+        self._window_size += size
+
+        while self._window_size > self.window_maxsize:
+            candidate, _ = self._window.popitem(last=False)
+            self._window_size -= self._data[candidate][1]
+            self._admit(candidate)
+
+    def _admit(self, candidate: Hashable):
+        """Move a window eviction to main if it's used more than what it displaces"""
+        size = self._data[candidate][1]
+        victims = []
+        freed = self.main_maxsize - self._main_size
+
+        for victim in self._main:
+            if freed >= size:
+                break
+            victims.append(victim)
+            freed += self._data[victim][1]
+
+        frequency = self.sketch.frequency(candidate)
+        if freed < size or any(
+            self.sketch.frequency(victim) >= frequency for victim in victims
+        ):
+            del self._data[candidate]
+            return
+
+        for victim in victims:
+            self._remove(victim)
+        self._main[candidate] = None
+        self._main_size += size
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._data.pop(key)
+
+        if key in self._window:
+            del self._window[key]
+            self._window_size -= size
+        else:
+            del self._main[key]
+            self._main_size -= size
+
+    def __delitem__(self, key: Hashable):
+        if key not in self._data:
+            raise KeyError(key)
+        self._remove(key)
+
+    def pop(self, key: Hashable, default: Any = _MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        self._remove(key)
+        return entry[0]
+
+    def clear(self):
+        self._data.clear()
+        self._window.clear()
+        self._main.clear()
+        self._window_size = self._main_size = 0
+        self._expiries.clear()
+
+    def expire(self, time: Optional[float] = None):
+        """Remove expired entries"""
+        now = self.timer() if time is None else time
+
+        while self._expiries and self._expiries[0][0] <= now:
+            expires, _, key = heapq.heappop(self._expiries)
+            entry = self._data.get(key)
+            if entry is not None and entry[2] == expires:
+                self._remove(key)
+
+        # Drop heap records of entries since replaced, evicted or rejected
+        if len(self._expiries) > 2 * len(self._data) + 64:
+            self._expiries = [
+                (entry[2], next(self._order), key) for key, entry in self._data.items()
+            ]
+            heapq.heapify(self._expiries)
@@ -1,7 +1,10 @@
 from typing import Optional, Dict, Any, List
-import asyncio
 
+from innertube.urls import REMOTE_TYPES, parse_url
+
+from app.core.exceptions import NotFoundError, ValidationError
 from app.services.base import BaseService
+from app.services.plan import Fetch, FetchPlan
 from app.clients.innertube import InnerTubeClient
 from app.parsers.youtube import YouTubeParser
 
@@ -9,10 +12,36 @@ from app.parsers.youtube import YouTubeParser
 class YouTubeService(BaseService):
     """YouTube service"""
     
-    def __init__(self):
+    PLANS = {
+        "search": FetchPlan("parse_search", {"data": Fetch("search", ("contents",))}),
+        "get_video": FetchPlan(
+            "parse_video",
+            {"player": Fetch("player", ("videoDetails", "streamingData"))}
+        ),
+        "get_related": FetchPlan(
+            "parse_related", {"data": Fetch("next", ("contents",))}
+        ),
+        "get_comments": FetchPlan("parse_comments", {"data": Fetch("next")}),
+        "get_channel": FetchPlan(
+            "parse_channel", {"data": Fetch("browse", ("header", "metadata"))}
+        ),
+        "get_channel_videos": FetchPlan(
+            "parse_channel_videos", {"data": Fetch("browse")}
+        ),
+        "get_playlist": FetchPlan(
+            "parse_playlist", {"data": Fetch("browse", ("header", "contents"))}
+        ),
+        "get_trending": FetchPlan("parse_trending", {"data": Fetch("browse")}),
+    }
+    
+    def __init__(
+        self,
+        client: Optional[InnerTubeClient] = None,
+        android_client: Optional[InnerTubeClient] = None
+    ):
         super().__init__()
-        self.client = InnerTubeClient("WEB")
-        self.android_client = InnerTubeClient("ANDROID")
+        self.client = client or InnerTubeClient("WEB")
+        self.android_client = android_client or InnerTubeClient("ANDROID")
         self.parser = YouTubeParser()
     
     async def search(
@@ -22,64 +51,37 @@ class YouTubeService(BaseService):
         limit: int = 20
     ) -> Dict[str, Any]:
         """Search YouTube"""
-        cache_key = f"yt:search:{query}:{filter_type}:{limit}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return {**cached, "cached": True}
-        
-        result = await asyncio.to_thread(
-            self.client.search, query, filter_type
+        parsed, cached = await self._cached_entry(
+            f"yt:search:{query}:{filter_type}:{limit}",
+            lambda: self._run_plan("search", query, filter_type, limit=limit)
         )
-        parsed = self.parser.parse_search(result, limit)
-        
-        self._set_cached(cache_key, parsed)
-        return {**parsed, "cached": False}
+        return {**parsed, "cached": cached}
     
     async def get_video(self, video_id: str) -> Dict[str, Any]:
         """Get video details"""
-        cache_key = f"yt:video:{video_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return {**cached, "cached": True}
-        
-        player = await asyncio.to_thread(self.client.player, video_id)
-        next_data = await asyncio.to_thread(self.client.next, video_id)
-        
-        parsed = self.parser.parse_video(player, next_data)
-        
-        self._set_cached(cache_key, parsed)
-        return {**parsed, "cached": False}
+        parsed, cached = await self._cached_entry(
+            f"yt:video:{video_id}",
+            lambda: self._run_plan("get_video", video_id)
+        )
+        return {**parsed, "cached": cached}
     
     async def get_related(self, video_id: str, limit: int = 20) -> Dict[str, Any]:
         """Get related videos"""
-        cache_key = f"yt:related:{video_id}:{limit}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(self.client.next, video_id)
-        parsed = self.parser.parse_related(result, limit)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"yt:related:{video_id}:{limit}",
+            lambda: self._run_plan("get_related", video_id, limit=limit)
+        )
     
     async def get_comments(self, video_id: str, limit: int = 20) -> Dict[str, Any]:
         """Get video comments"""
-        result = await asyncio.to_thread(self.client.next, video_id)
-        return self.parser.parse_comments(result, limit)
+        return await self._run_plan("get_comments", video_id, limit=limit)
     
     async def get_channel(self, channel_id: str) -> Dict[str, Any]:
         """Get channel details"""
-        cache_key = f"yt:channel:{channel_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        result = await asyncio.to_thread(self.client.browse, channel_id)
-        parsed = self.parser.parse_channel(result)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"yt:channel:{channel_id}",
+            lambda: self._run_plan("get_channel", channel_id)
+        )
     
     async def get_channel_videos(
         self, 
@@ -87,24 +89,15 @@ class YouTubeService(BaseService):
         limit: int = 30
     ) -> Dict[str, Any]:
         """Get channel videos"""
-        # Videos tab
-        browse_id = f"{channel_id}/videos"
-        result = await asyncio.to_thread(self.client.browse, channel_id)
-        return self.parser.parse_channel_videos(result, limit)
+        return await self._run_plan("get_channel_videos", channel_id, limit=limit)
     
     async def get_playlist(self, playlist_id: str) -> Dict[str, Any]:
         """Get playlist details and videos"""
-        cache_key = f"yt:playlist:{playlist_id}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
-        
         browse_id = f"VL{playlist_id}" if not playlist_id.startswith("VL") else playlist_id
-        result = await asyncio.to_thread(self.client.browse, browse_id)
-        parsed = self.parser.parse_playlist(result)
-        
-        self._set_cached(cache_key, parsed)
-        return parsed
+        return await self._cached(
+            f"yt:playlist:{playlist_id}",
+            lambda: self._run_plan("get_playlist", browse_id)
+        )
     
     async def get_trending(
         self, 
@@ -112,13 +105,27 @@ class YouTubeService(BaseService):
         category: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get trending videos"""
-        cache_key = f"yt:trending:{region}:{category}"
-        cached = self._get_cached(cache_key)
-        if cached:
-            return cached
+        return await self._cached(
+            f"yt:trending:{region}:{category}",
+            lambda: self._run_plan("get_trending", "FEtrending")
+        )
+    
+    async def resolve_url(self, url: str) -> Dict[str, Any]:
+        """Resolve a YouTube URL, calling upstream only for handles and vanity URLs"""
+        resolved = parse_url(url)
+        if resolved is None:
+            raise ValidationError("Unsupported YouTube URL", {"url": url})
         
-        result = await asyncio.to_thread(self.client.browse, "FEtrending")
-        parsed = self.parser.parse_trending(result)
+        if resolved.type not in REMOTE_TYPES:
+            return self.parser.parse_resolved_url(resolved)
         
-        self._set_cached(cache_key, parsed, ttl=600)  # 10 min cache
-        return parsed
+        return await self._cached(
+            f"yt:resolve:{resolved.id.lower()}", lambda: self._resolve_remote(url)
+        )
+    
+    async def _resolve_remote(self, url: str) -> Dict[str, Any]:
+        """Resolve a handle or vanity URL upstream"""
+        resolved = await self._call(self.client.resolve_url, url)
+        if resolved is None:
+            raise NotFoundError("URL", url)
+        return self.parser.parse_resolved_url(resolved)
@@ -1,5 +1,10 @@
+import re
 from typing import Optional
 
+from innertube.urls import TYPE_SHORT, TYPE_VIDEO, parse_url
+
+VIDEO_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+
 
 def format_duration(seconds: Optional[int]) -> str:
     """Format duration from seconds to HH:MM:SS"""
@@ -31,17 +36,12 @@ def format_views(views: Optional[int]) -> str:
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extract video ID from YouTube URL"""
-    import re
-    
-    patterns = [
-        r'(?:v=|/v/|youtu\.be/)([a-zA-Z0-9_-]{11})',
-        r'(?:embed/)([a-zA-Z0-9_-]{11})',
-        r'^([a-zA-Z0-9_-]{11})$'
-    ]
+    url = url.strip()
+    if VIDEO_ID_PATTERN.match(url):
+        return url
     
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    resolved = parse_url(url)
+    if resolved and resolved.type in (TYPE_VIDEO, TYPE_SHORT):
+        return resolved.id
     
     return None
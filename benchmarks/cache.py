@@ -0,0 +1,126 @@
+"""
+Hit-rate benchmark for the in-process cache's eviction policies.
+
+Replays a key trace against the plain LRU cache and the W-TinyLFU cache at
+several byte budgets, with a simulated clock so entries expire as they
+did when the trace was recorded. Every miss on a key the trace later
+stored is filled with that key's size and lifetime, as the API would.
+
+Record a trace by running the API with CACHE_TRACE_FILE set, or omit
+--trace to replay a synthetic one: Zipf-distributed reads of popular keys
+mixed with crawler scans of one-off searches.
+
+    PYTHONPATH=. python benchmarks/cache.py --trace cache-trace.tsv
+    PYTHONPATH=. python benchmarks/cache.py --requests 200000 --scan 0.3
+"""
+
+import argparse
+import itertools
+import random
+from typing import Callable, Dict, List, Tuple
+
+from app.services.cache import TLRU
+from app.services.tinylfu import WTinyLFUCache
+
+# Trace: (seconds, key) reads, and each key's (bytes, lifetime seconds)
+Trace = Tuple[List[Tuple[float, str]], Dict[str, Tuple[int, float]]]
+
+
+def load(path: str) -> Trace:
+    reads: List[Tuple[float, str]] = []
+    entries: Dict[str, Tuple[int, float]] = {}
+
+    with open(path) as trace:
+        for line in trace:
+            fields: List[str] = line.rstrip("\n").split("\t")
+            if fields[1] == "get":
+                reads.append((float(fields[0]), fields[2]))
+            elif fields[1] == "set":
+                entries[fields[2]] = (int(fields[3]), float(fields[4]))
+
+    return reads, entries
+
+
+def synthesize(requests: int, keys: int, scan: float, seed: int) -> Trace:
+    rng: random.Random = random.Random(seed)
+    weights: List[float] = list(
+        itertools.accumulate(1 / rank**0.9 for rank in range(1, keys + 1))
+    )
+    reads: List[Tuple[float, str]] = []
+    entries: Dict[str, Tuple[int, float]] = {}
+    now: float = 0.0
+    crawled: int = 0
+
+    while len(reads) < requests:
+        now += rng.expovariate(50)
+        if rng.random() < scan:
+            # A crawler pages through searches nobody else asks for
+            for _ in range(rng.randint(20, 200)):
+                key: str = f"yt:search:crawl{crawled}"
+                crawled += 1
+                reads.append((now, key))
+                entries[key] = (int(rng.lognormvariate(10, 1)), 600.0)
+        else:
+            rank: int = rng.choices(range(keys), cum_weights=weights)[0]
+            key = f"yt:video:{rank}"
+            reads.append((now, key))
+            entries.setdefault(key, (int(rng.lognormvariate(10, 1)), 3600.0))
+
+    return reads[:requests], entries
+
+
+def replay(policy: str, budget: int, trace: Trace) -> Tuple[float, float]:
+    reads, entries = trace
+    now: float = 0.0
+    clock: Callable[[], float] = lambda: now
+    options: dict = {
+        "maxsize": budget,
+        "ttu": lambda key, value, now: now + value[1],
+        "timer": clock,
+        "getsizeof": lambda value: value[0],
+    }
+    cache = TLRU(**options) if policy == "lru" else WTinyLFUCache(**options)
+    hits: int = 0
+    hit_bytes: int = 0
+    total_bytes: int = 0
+
+    for now, key in reads:
+        entry = entries.get(key)
+        total_bytes += entry[0] if entry else 0
+        if cache.get(key) is not None:
+            hits += 1
+            hit_bytes += entry[0] if entry else 0
+        elif entry is not None and entry[0] <= budget:
+            cache[key] = entry
+
+    return hits / len(reads), hit_bytes / max(total_bytes, 1)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--trace", help="file recorded with CACHE_TRACE_FILE")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--scan", type=float, default=0.02, help="crawl bursts/read")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", default=[16, 64, 256], help="MiB"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    trace: Trace = (
+        load(args.trace)
+        if args.trace
+        else synthesize(args.requests, args.keys, args.scan, args.seed)
+    )
+
+    print(f"{'budget':>8} {'policy':>8} {'hits':>8} {'byte hits':>10}")
+
+    for budget in args.budgets:
+        for policy in ("lru", "tinylfu"):
+            hit_rate, byte_hit_rate = replay(policy, budget * 1024 * 1024, trace)
+            print(f"{budget:>5}MiB {policy:>8} {hit_rate:>8.1%} {byte_hit_rate:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Throughput benchmark for innertube.download.Downloader.
+
+Serves a random payload from a local HTTP server that honours Range
+requests and throttles each connection (as googlevideo does), then
+downloads it with an increasing number of workers.
+
+    PYTHONPATH=. python benchmarks/download.py --size 64 --rate 8
+"""
+
+import argparse
+import http.server
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import httpx
+from innertube.download import Downloader
+
+BLOCK_SIZE: int = 64 * 1024
+
+
+def serve(payload: bytes, rate: float) -> http.server.ThreadingHTTPServer:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            start, end = 0, len(payload) - 1
+
+            match: Optional[re.Match] = re.fullmatch(
+                r"bytes=(\d+)-(\d+)", self.headers.get("Range", "")
+            )
+
+            if match is not None:
+                start, end = int(match.group(1)), int(match.group(2))
+
+            self.send_response(206 if match is not None else 200)
+            self.send_header("Content-Length", str(end + 1 - start))
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            self.end_headers()
+
+            offset: int
+            for offset in range(start, end + 1, BLOCK_SIZE):
+                self.wfile.write(payload[offset : min(offset + BLOCK_SIZE, end + 1)])
+                time.sleep(BLOCK_SIZE / rate)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server: http.server.ThreadingHTTPServer = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), Handler
+    )
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=64, help="payload size (MiB)")
+    parser.add_argument("--rate", type=float, default=8, help="per-connection MiB/s")
+    parser.add_argument("--chunk", type=int, default=4, help="chunk size (MiB)")
+    args: argparse.Namespace = parser.parse_args()
+
+    payload: bytes = os.urandom(args.size * 1024 * 1024)
+    server: http.server.ThreadingHTTPServer = serve(payload, args.rate * 1024 * 1024)
+    url: str = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"{'workers':>8} {'seconds':>8} {'MiB/s':>8}")
+
+    workers: int
+    for workers in (1, 2, 4, 8, 16):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "payload")
+            downloader: Downloader = Downloader(
+                session=httpx.Client(limits=httpx.Limits(max_connections=workers)),
+                chunk_size=(len(payload) if workers == 1 else args.chunk * 1024 * 1024),
+                workers=workers,
+            )
+
+            start: float = time.perf_counter()
+            downloader.download_url(url, path, len(payload))
+            elapsed: float = time.perf_counter() - start
+
+            with open(path, "rb") as file:
+                assert file.read() == payload
+
+        print(f"{workers:>8} {elapsed:>8.2f} {args.size / elapsed:>8.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Requests/sec benchmark for the API's service wiring.
+
+Serves canned InnerTube responses from a local HTTP server, points the
+InnerTube clients at it, then drives /api/v1/stream/{video_id} through the
+ASGI app with a unique video id per request (so the cache never hits). The
+"per-request" mode restores the old behaviour of building a new service,
+and with it new InnerTube clients and connection pools, on every request.
+The "shared" mode uses the lifespan-scoped ServiceContainer.
+
+Over plain local HTTP this only measures client construction and TCP
+connects. Against YouTube each new pool also pays for a TLS handshake, so
+the real difference is larger.
+
+    PYTHONPATH=. python benchmarks/services.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import http.server
+import json
+import threading
+import time
+
+import httpx
+from innertube.config import config
+
+RESPONSE: bytes = json.dumps(
+    {
+        "responseContext": {},
+        "playabilityStatus": {"status": "OK"},
+        "streamingData": {"formats": [], "adaptiveFormats": []},
+    }
+).encode()
+
+
+def serve() -> http.server.ThreadingHTTPServer:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(RESPONSE)))
+            self.end_headers()
+            self.wfile.write(RESPONSE)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server: http.server.ThreadingHTTPServer = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), Handler
+    )
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+async def run(app, requests: int, concurrency: int, label: str) -> float:
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+
+        async def request(index: int) -> None:
+            async with semaphore:
+                response: httpx.Response = await client.get(
+                    f"/api/v1/stream/{label}{index:010d}"
+                )
+                response.raise_for_status()
+
+        start: float = time.perf_counter()
+        await asyncio.gather(*(request(index) for index in range(requests)))
+
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args: argparse.Namespace = parser.parse_args()
+
+    server: http.server.ThreadingHTTPServer = serve()
+    config.base_url = f"http://127.0.0.1:{server.server_address[1]}/youtubei/v1/"
+
+    from app.api.v1.endpoints.stream import get_stream_service
+    from app.config import settings
+    from app.main import app
+    from app.services.container import ServiceContainer
+    from app.services.stream import StreamService
+
+    settings.RATE_LIMIT_PER_MINUTE = 10**9
+
+    app.state.services = ServiceContainer()
+
+    print(f"{'mode':>12} {'req/s':>10}")
+
+    app.dependency_overrides[get_stream_service] = lambda: StreamService()
+    per_request: float = asyncio.run(
+        run(app, args.requests, args.concurrency, "before")
+    )
+    print(f"{'per-request':>12} {per_request:>10.1f}")
+
+    app.dependency_overrides.clear()
+    shared: float = asyncio.run(run(app, args.requests, args.concurrency, "after"))
+    print(f"{'shared':>12} {shared:>10.1f}")
+
+    app.state.services.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
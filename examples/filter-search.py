@@ -1,4 +1,4 @@
-from innertube import InnerTube
+from innertube import InnerTube, SearchView
 
 PARAMS_TYPE_VIDEO = "EgIQAQ%3D%3D"
 PARAMS_TYPE_CHANNEL = "EgIQAg%3D%3D"
@@ -9,13 +9,7 @@ client = InnerTube("WEB", "2.20230920.00.00")
 
 data = client.search("arctic monkeys", params=PARAMS_TYPE_PLAYLIST)
 
-items = data["contents"]["twoColumnSearchResultsRenderer"]["primaryContents"][
-    "sectionListRenderer"
-]["contents"][0]["itemSectionRenderer"]["contents"]
-
-for item in items:
-    playlist = item["playlistRenderer"]
-
+for playlist in SearchView(data).renderers("playlistRenderer"):
     playlist_id = playlist["playlistId"]
     playlist_title = playlist["title"]["simpleText"]
     playlist_video_count = playlist["videoCount"]
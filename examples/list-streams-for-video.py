@@ -1,4 +1,4 @@
-from innertube import InnerTube
+from innertube import InnerTube, PlayerView
 from pprint import pprint
 
 # Rick Astley - Never Gonna Give You Up (Official Music Video)
@@ -11,7 +11,7 @@ client = InnerTube("IOS")
 data = client.player(video_id)
 
 # List of streams of the video
-streams = data["streamingData"]["adaptiveFormats"]
+streams = PlayerView(data).adaptive_formats
 
 # Print the list of streams
 pprint(streams)
@@ -1,8 +1,32 @@
-from .adaptor import InnerTubeAdaptor
+from .adaptor import AsyncInnerTubeAdaptor, InnerTubeAdaptor
 from .api import contextualise, error, fingerprint, get_context, get_response_context
-from .clients import Client, InnerTube
+from .checkpoints import CheckpointStore
+from .clients import AsyncClient, AsyncInnerTube, Client, InnerTube
 from .config import config
+from .download import Downloader
 from .enums import Endpoint, Request
+from .health import ContextHealth, HealthProber
+from .live import LivePoller
 from .locale import Language, Locale, Location
-from .models import ClientContext, Config, Error, ResponseContext, ResponseFingerprint
-from .protocols import Adaptor
+from .models import (
+    Call,
+    ChannelItem,
+    ClientContext,
+    Comment,
+    CommentThread,
+    Config,
+    CrawlState,
+    DecodeStats,
+    Error,
+    LiveChatMessage,
+    LiveMetadata,
+    ResponseContext,
+    PlaylistItem,
+    ResolvedURL,
+    ResponseFingerprint,
+    Song,
+    TranscriptSegment,
+)
+from .protocols import Adaptor, AsyncAdaptor
+from .store import ResponseStore
+from .views import BrowseView, NextView, PlayerView, SearchView, TranscriptView
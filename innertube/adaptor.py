@@ -1,22 +1,43 @@
-from typing import Optional
+import asyncio
+import functools
+import json
+import time
+from concurrent.futures import Executor
+from typing import Callable, Optional, Tuple, Union
 
-from httpx import Client, Request, Response
+from httpx import AsyncClient, Client, Request, Response
 
-from . import api
+from . import api, utils
 from .config import config
-from .errors import RequestError, ResponseError
-from .models import ClientContext
+from .errors import OfflineError, RequestError, ResponseError
+from .models import ClientContext, DecodeStats
+from .store import ResponseStore
 
+DECODE_THRESHOLD: int = 256 * 1024
 
-class InnerTubeAdaptor:
-    context: ClientContext
-    session: Client
+Projection = Callable[[dict], dict]
 
-    def __init__(
-        self, context: ClientContext, session: Optional[Client] = None
-    ) -> None:
-        self.context = context
-        self.session = session or Client(base_url=config.base_url)
+
+def decode(content: bytes, project: Optional[Projection] = None) -> Tuple[dict, float]:
+    start: float = time.perf_counter()
+
+    data: dict = json.loads(content)
+
+    if project is not None:
+        data = {
+            **project(data),
+            **{key: data[key] for key in ("responseContext", "error") if key in data},
+        }
+
+    return data, time.perf_counter() - start
+
+
+class BaseInnerTubeAdaptor:
+    context: ClientContext
+    session: Union[Client, AsyncClient]
+    store: Optional[ResponseStore] = None
+    offline: bool = False
+    visitor_data: Optional[str] = None
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(context={self.context!r})"
@@ -29,9 +50,59 @@ class InnerTubeAdaptor:
             endpoint,
             params=self.context.params().update(params or {}),
             json=api.contextualise(self.context, body or {}),
-            headers=self.context.headers(),
+            headers=utils.filter(
+                {**self.context.headers(), "X-Goog-Visitor-Id": self.visitor_data}
+            ),
         )
 
+    def _store_key(
+        self, store: ResponseStore, endpoint: str, body: Optional[dict] = None
+    ) -> str:
+        return store.key(endpoint, api.contextualise(self.context, body or {}))
+
+    def _check_response(self, response: Response) -> None:
+        content_type: Optional[str] = response.headers.get("Content-Type")
+
+        if content_type is not None:
+            if not content_type.lower().startswith("application/json"):
+                raise ResponseError(f"Expected JSON response, got {content_type!r}")
+
+    def _process_data(self, response_data: dict) -> dict:
+        visitor_data: Optional[str] = response_data.get("responseContext", {}).get(
+            "visitorData"
+        )
+
+        # Kept per adaptor and sent per request: sessions may be shared
+        if visitor_data is not None:
+            self.visitor_data = visitor_data
+
+        error: Optional[dict] = response_data.get("error")
+
+        if error is not None:
+            raise RequestError(api.error(error))
+
+        return response_data
+
+
+class InnerTubeAdaptor(BaseInnerTubeAdaptor):
+    session: Client
+
+    def __init__(
+        self,
+        context: ClientContext,
+        session: Optional[Client] = None,
+        *,
+        store: Optional[ResponseStore] = None,
+        offline: bool = False,
+    ) -> None:
+        if offline and store is None:
+            raise ValueError("Precondition failed: Missing response store")
+
+        self.context = context
+        self.session = session or Client(base_url=config.base_url)
+        self.store = store
+        self.offline = offline
+
     def _request(
         self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
     ) -> Response:
@@ -42,26 +113,112 @@ class InnerTubeAdaptor:
     def dispatch(
         self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
     ) -> dict:
+        key: Optional[str] = None
+
+        if self.store is not None:
+            key = self._store_key(self.store, endpoint, body)
+            content: Optional[bytes] = self.store.get(key, stale=self.offline)
+
+            if content is not None:
+                return self._process_data(json.loads(content))
+            if self.offline:
+                raise OfflineError(f"No stored response for {str(endpoint)!r}")
+
         response: Response = self._request(endpoint, params=params, body=body)
 
-        content_type: Optional[str] = response.headers.get("Content-Type")
+        self._check_response(response)
 
-        if content_type is not None:
-            if not content_type.lower().startswith("application/json"):
-                raise ResponseError(f"Expected JSON response, got {content_type!r}")
+        response_data: dict = self._process_data(response.json())
 
-        response_data: dict = response.json()
+        if self.store is not None and key is not None:
+            self.store.set(key, endpoint, response.content)
 
-        visitor_data: Optional[str] = response_data.get("responseContext", {}).get(
-            "visitorData"
+        return response_data
+
+
+class AsyncInnerTubeAdaptor(BaseInnerTubeAdaptor):
+    session: AsyncClient
+    decode_threshold: Optional[int]
+    executor: Optional[Executor]
+    project: Optional[Projection]
+    stats: DecodeStats
+
+    def __init__(
+        self,
+        context: ClientContext,
+        session: Optional[AsyncClient] = None,
+        *,
+        decode_threshold: Optional[int] = DECODE_THRESHOLD,
+        executor: Optional[Executor] = None,
+        project: Optional[Projection] = None,
+        store: Optional[ResponseStore] = None,
+        offline: bool = False,
+    ) -> None:
+        if offline and store is None:
+            raise ValueError("Precondition failed: Missing response store")
+
+        self.context = context
+        self.session = session or AsyncClient(base_url=config.base_url)
+        self.store = store
+        self.offline = offline
+        self.decode_threshold = decode_threshold
+        self.executor = executor
+        self.project = project
+        self.stats = DecodeStats()
+
+    async def _request(
+        self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
+    ) -> Response:
+        return await self.session.send(
+            self._build_request(endpoint, params=params, body=body)
         )
 
-        if visitor_data is not None:
-            self.session.headers["X-Goog-Visitor-Id"] = visitor_data
+    async def _decode(self, content: bytes) -> dict:
+        data: dict
+        seconds: float
 
-        error: Optional[dict] = response_data.get("error")
+        if self.decode_threshold is None or len(content) < self.decode_threshold:
+            data, seconds = decode(content, self.project)
 
-        if error is not None:
-            raise RequestError(api.error(error))
+            self.stats.inline += 1
+            self.stats.inline_seconds += seconds
+        else:
+            data, seconds = await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(decode, content, self.project)
+            )
+
+            self.stats.offloaded += 1
+            self.stats.offloaded_seconds += seconds
+            self.stats.offloaded_bytes += len(content)
+
+        return data
+
+    async def dispatch(
+        self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
+    ) -> dict:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        key: Optional[str] = None
+
+        if self.store is not None:
+            key = self._store_key(self.store, endpoint, body)
+            content: Optional[bytes] = await loop.run_in_executor(
+                None, functools.partial(self.store.get, key, stale=self.offline)
+            )
+
+            if content is not None:
+                return self._process_data(await self._decode(content))
+            if self.offline:
+                raise OfflineError(f"No stored response for {str(endpoint)!r}")
+
+        response: Response = await self._request(endpoint, params=params, body=body)
+
+        self._check_response(response)
+
+        response_data: dict = self._process_data(await self._decode(response.content))
+
+        if self.store is not None and key is not None:
+            await loop.run_in_executor(
+                None, self.store.set, key, endpoint, response.content
+            )
 
         return response_data
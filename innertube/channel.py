@@ -0,0 +1,263 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .comments import parse_count
+from .checkpoints import CheckpointStore
+from .models import ChannelItem, CrawlState
+from .utils import get
+from .views import BrowseView, text
+
+if TYPE_CHECKING:
+    from .clients import InnerTube
+
+__all__ = ("iter_channel", "parse_item")
+
+TAB_VIDEOS: str = "Videos"
+TAB_SHORTS: str = "Shorts"
+TAB_LIVE: str = "Live"
+TAB_PLAYLISTS: str = "Playlists"
+
+TABS: Sequence[str] = (TAB_VIDEOS, TAB_SHORTS, TAB_LIVE)
+
+TYPE_VIDEO: str = "video"
+TYPE_SHORT: str = "short"
+TYPE_PLAYLIST: str = "playlist"
+
+WORKERS: int = 4
+PREFETCH: int = 2
+
+POLL_INTERVAL: float = 0.1
+
+
+class TabPage(NamedTuple):
+    tab: str
+    items: List[ChannelItem]
+    token: Optional[str]
+    next_token: Optional[str]
+
+
+def parse_item(item: dict, tab: str) -> Optional[ChannelItem]:
+    renderer: Optional[dict]
+
+    if renderer := item.get("videoRenderer") or item.get("gridVideoRenderer"):
+        return ChannelItem(
+            id=renderer["videoId"],
+            type=TYPE_VIDEO,
+            tab=tab,
+            title=text(renderer.get("title")),
+            published=text(renderer.get("publishedTimeText")),
+            duration=text(renderer.get("lengthText")),
+            view_count=parse_count(text(renderer.get("viewCountText"))),
+            thumbnails=get(renderer, "thumbnail", "thumbnails") or [],
+        )
+
+    if renderer := item.get("reelItemRenderer"):
+        return ChannelItem(
+            id=renderer["videoId"],
+            type=TYPE_SHORT,
+            tab=tab,
+            title=text(renderer.get("headline")),
+            view_count=parse_count(text(renderer.get("viewCountText"))),
+            thumbnails=get(renderer, "thumbnail", "thumbnails") or [],
+        )
+
+    if renderer := item.get("shortsLockupViewModel"):
+        video_id: Optional[str] = get(
+            renderer, "onTap", "innertubeCommand", "reelWatchEndpoint", "videoId"
+        )
+
+        if video_id is None:
+            return None
+
+        return ChannelItem(
+            id=video_id,
+            type=TYPE_SHORT,
+            tab=tab,
+            title=get(renderer, "overlayMetadata", "primaryText", "content"),
+            view_count=parse_count(
+                get(renderer, "overlayMetadata", "secondaryText", "content")
+            ),
+            thumbnails=get(renderer, "thumbnail", "sources") or [],
+        )
+
+    if renderer := item.get("gridPlaylistRenderer") or item.get("playlistRenderer"):
+        return ChannelItem(
+            id=renderer["playlistId"],
+            type=TYPE_PLAYLIST,
+            tab=tab,
+            title=text(renderer.get("title")),
+            video_count=parse_count(
+                text(renderer.get("videoCountText") or renderer.get("videoCount"))
+            ),
+            thumbnails=get(renderer, "thumbnail", "thumbnails") or [],
+        )
+
+    renderer = item.get("lockupViewModel")
+
+    if renderer and renderer.get("contentType") == "LOCKUP_CONTENT_TYPE_PLAYLIST":
+        return ChannelItem(
+            id=renderer["contentId"],
+            type=TYPE_PLAYLIST,
+            tab=tab,
+            title=get(
+                renderer, "metadata", "lockupMetadataViewModel", "title", "content"
+            ),
+        )
+
+    return None
+
+
+def parse_items(view: BrowseView, tab: str) -> List[ChannelItem]:
+    items: List[ChannelItem] = []
+
+    item: dict
+    for item in view.items:
+        channel_item: Optional[ChannelItem] = parse_item(item, tab)
+
+        if channel_item is not None:
+            items.append(channel_item)
+
+    return items
+
+
+def iter_channel(
+    client: "InnerTube",
+    channel_id: str,
+    *,
+    tabs: Sequence[str] = TABS,
+    workers: int = WORKERS,
+    prefetch: int = PREFETCH,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Iterator[ChannelItem]:
+    keys: Dict[str, str] = {title: f"channel:{channel_id}:{title}" for title in tabs}
+    states: Dict[str, CrawlState] = {
+        title: (checkpoints.load(key) if checkpoints is not None else None)
+        or CrawlState()
+        for title, key in keys.items()
+    }
+    starts: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+        title: (None, state.token)
+        for title, state in states.items()
+        if not state.done and state.token is not None
+    }
+
+    if any(not state.done and state.token is None for state in states.values()):
+        root: BrowseView = BrowseView(client.browse(channel_id))
+
+        title: str
+        for title in tabs:
+            tab: Optional[dict] = root.tab(title)
+            tab_params: Optional[str] = get(tab, "endpoint", "browseEndpoint", "params")
+
+            if title in starts or states[title].done or tab_params is None:
+                continue
+
+            starts[title] = (tab_params, None)
+
+    if not starts:
+        return
+
+    pages: "queue.Queue[Union[TabPage, Exception]]" = queue.Queue(
+        maxsize=len(starts) * prefetch
+    )
+    stop: threading.Event = threading.Event()
+
+    def put(page: Union[TabPage, Exception]) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+
+            return True
+
+        return False
+
+    def crawl(tab: str, tab_params: Optional[str], token: Optional[str]) -> None:
+        try:
+            view: BrowseView = BrowseView(
+                client.browse(continuation=token)
+                if token is not None
+                else client.browse(channel_id, params=tab_params)
+            )
+
+            while put(TabPage(tab, parse_items(view, tab), token, view.continuation)):
+                if view.continuation is None:
+                    break
+
+                token = view.continuation
+                view = BrowseView(client.browse(continuation=token))
+        except Exception as exception:
+            put(exception)
+
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers)
+    seen: Set[str] = set().union(*(state.seen for state in states.values()))
+    remaining: int = len(starts)
+    page: Optional[TabPage] = None
+    pending: List[str] = []
+
+    futures: List[Future] = [
+        executor.submit(crawl, title, tab_params, token)
+        for title, (tab_params, token) in starts.items()
+    ]
+
+    try:
+        while remaining:
+            result: Union[TabPage, Exception] = pages.get()
+
+            if isinstance(result, Exception):
+                raise result
+
+            page = result
+
+            item: ChannelItem
+            for item in page.items:
+                if item.id not in seen:
+                    seen.add(item.id)
+                    pending.append(item.id)
+                    states[page.tab].count += 1
+
+                    yield item
+
+            if checkpoints is not None:
+                checkpoints.save(
+                    keys[page.tab],
+                    token=page.next_token,
+                    count=states[page.tab].count,
+                    seen=pending,
+                    done=page.next_token is None,
+                )
+
+            pending = []
+
+            if page.next_token is None:
+                remaining -= 1
+    finally:
+        stop.set()
+
+        if checkpoints is not None and page is not None and pending:
+            checkpoints.save(
+                keys[page.tab],
+                token=page.token,
+                count=states[page.tab].count,
+                seen=pending,
+            )
+
+        future: Future
+        for future in futures:
+            future.cancel()
+
+        executor.shutdown(wait=False)
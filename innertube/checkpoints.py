@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Tuple, Union
+
+from .models import CrawlState
+
+__all__ = ("CheckpointStore",)
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    key TEXT PRIMARY KEY,
+    token TEXT,
+    count INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (key, id)
+) WITHOUT ROWID;
+"""
+
+
+class CheckpointStore:
+    path: str
+
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM checkpoints"
+            ).fetchone()[0]
+
+    def load(self, key: str, /) -> Optional[CrawlState]:
+        with self._lock:
+            row: Optional[Tuple[Optional[str], int, int]] = self._connection.execute(
+                "SELECT token, count, done FROM checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            token, count, done = row
+
+            return CrawlState(
+                token=token,
+                count=count,
+                done=bool(done),
+                seen={
+                    id
+                    for (id,) in self._connection.execute(
+                        "SELECT id FROM seen WHERE key = ?", (key,)
+                    )
+                },
+            )
+
+    def save(
+        self,
+        key: str,
+        /,
+        *,
+        token: Optional[str],
+        count: int,
+        seen: Iterable[str] = (),
+        done: bool = False,
+    ) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN")
+
+            try:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO seen (key, id) VALUES (?, ?)",
+                    ((key, id) for id in seen),
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO checkpoints "
+                    "(key, token, count, done, updated) VALUES (?, ?, ?, ?, ?)",
+                    (key, token, count, int(done), time.time()),
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+
+                raise
+
+            self._connection.execute("COMMIT")
+
+    def delete(self, key: str, /) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            self._connection.execute("DELETE FROM seen WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM checkpoints")
+            self._connection.execute("DELETE FROM seen")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
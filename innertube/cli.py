@@ -0,0 +1,357 @@
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .clients import InnerTube
+from .export import (
+    COMPRESSION,
+    NORMALISERS,
+    ROW_GROUP_SIZE,
+    ParquetExporter,
+    read_ndjson,
+)
+from .utils import RateLimiter
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+__all__ = ("main", "run", "Checkpoint", "NDJSONWriter")
+
+CONCURRENCY: int = 8
+WINDOW: int = 4
+CHECKPOINT_INTERVAL: int = 1000
+
+SUFFIX_ZSTD: str = ".zst"
+
+Command = Callable[[InnerTube, str], dict]
+
+COMMANDS: Dict[str, Command] = {
+    "player": lambda client, value: client.player(value),
+    "browse": lambda client, value: client.browse(value),
+    "search": lambda client, value: client.search(value),
+    "next": lambda client, value: client.next(value),
+}
+
+
+def read_values(file: IO[str], /) -> Iterator[str]:
+    line: str
+    for line in file:
+        value: str = line.strip()
+
+        if value:
+            yield value
+
+
+def run(
+    client: InnerTube,
+    command: Command,
+    values: Iterable[str],
+    *,
+    concurrency: int = CONCURRENCY,
+    limiter: Optional[RateLimiter] = None,
+) -> Iterator[dict]:
+    def call(value: str) -> dict:
+        if limiter is not None:
+            limiter.acquire()
+
+        try:
+            return {"input": value, "data": command(client, value)}
+        except Exception as exception:
+            return {"input": value, "error": f"{type(exception).__name__}: {exception}"}
+
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=concurrency)
+    window: Deque[Future] = collections.deque()
+
+    try:
+        value: str
+        for value in values:
+            window.append(executor.submit(call, value))
+
+            if len(window) >= concurrency * WINDOW:
+                yield window.popleft().result()
+
+        while window:
+            yield window.popleft().result()
+    finally:
+        future: Future
+        for future in window:
+            future.cancel()
+
+        executor.shutdown(wait=False)
+
+
+class NDJSONWriter:
+    file: IO[bytes]
+
+    _writer: Optional["zstandard.ZstdCompressionWriter"]
+
+    def __init__(
+        self, file: IO[bytes], *, compress: bool = False, level: int = 3
+    ) -> None:
+        self.file = file
+
+        self._writer = (
+            zstandard.ZstdCompressor(level=level).stream_writer(file, closefd=False)
+            if compress
+            else None
+        )
+
+    def write(self, record: dict) -> None:
+        line: bytes = (
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+            + b"\n"
+        )
+
+        if self._writer is not None:
+            self._writer.write(line)
+        else:
+            self.file.write(line)
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush(zstandard.FLUSH_FRAME)
+
+        self.file.flush()
+
+
+class Checkpoint:
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r})"
+
+    def load(self, command: str) -> Tuple[int, int]:
+        if not os.path.exists(self.path):
+            return 0, 0
+
+        file: IO[str]
+        with open(self.path) as file:
+            state: dict = json.load(file)
+
+        if state["command"] != command:
+            raise ValueError(f"Checkpoint is for {state['command']!r}, not {command!r}")
+
+        return state["count"], state["offset"]
+
+    def save(self, command: str, count: int, offset: int) -> None:
+        temporary_path: str = f"{self.path}.tmp"
+
+        file: IO[str]
+        with open(temporary_path, "w") as file:
+            json.dump(dict(command=command, count=count, offset=offset), file)
+
+        os.replace(temporary_path, self.path)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="innertube",
+        description="Bulk InnerTube requests, streamed as NDJSON",
+    )
+    subparsers: argparse._SubParsersAction = parser.add_subparsers(
+        dest="command", required=True
+    )
+    subparser: argparse.ArgumentParser
+
+    name: str
+    for name in COMMANDS:
+        subparser = subparsers.add_parser(
+            name, help=f"Call the {name} endpoint for each input line"
+        )
+
+        subparser.add_argument(
+            "-i", "--input", default="-", help="Ids or queries, one per line"
+        )
+        subparser.add_argument(
+            "-o",
+            "--output",
+            default="-",
+            help=f"NDJSON output ({SUFFIX_ZSTD} to compress)",
+        )
+        subparser.add_argument("-c", "--client", default="WEB", help="Client name")
+        subparser.add_argument(
+            "--concurrency", type=int, default=CONCURRENCY, help="Requests in flight"
+        )
+        subparser.add_argument("--rate", type=float, help="Maximum requests per second")
+        subparser.add_argument(
+            "--burst", type=int, default=1, help="Requests allowed above --rate"
+        )
+        subparser.add_argument(
+            "--zstd", action="store_true", help="Compress the output with zstd"
+        )
+        subparser.add_argument(
+            "--checkpoint", help="Checkpoint file, used to resume an interrupted run"
+        )
+        subparser.add_argument(
+            "--checkpoint-interval",
+            type=int,
+            default=CHECKPOINT_INTERVAL,
+            help="Records between checkpoints",
+        )
+
+    subparser = subparsers.add_parser(
+        "export", help="Convert NDJSON output to Parquet (requires pyarrow)"
+    )
+
+    subparser.add_argument("kind", choices=NORMALISERS, help="Type of the records")
+    subparser.add_argument(
+        "-i", "--input", default="-", help=f"NDJSON input ({SUFFIX_ZSTD} if compressed)"
+    )
+    subparser.add_argument("-o", "--output", required=True, help="Parquet output")
+    subparser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=ROW_GROUP_SIZE,
+        help="Rows per Parquet row group",
+    )
+    subparser.add_argument(
+        "--compression", default=COMPRESSION, help="Parquet compression codec"
+    )
+
+    return parser
+
+
+def export(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    compressed: bool = args.input.endswith(SUFFIX_ZSTD)
+
+    if compressed and zstandard is None:
+        parser.error("zstd input requires the 'zstandard' package")
+
+    try:
+        exporter: ParquetExporter = ParquetExporter(
+            args.output,
+            args.kind,
+            row_group_size=args.row_group_size,
+            compression=args.compression,
+        )
+    except (ImportError, ValueError) as error:
+        parser.error(str(error))
+
+    input_file: IO[bytes] = (
+        sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    )
+    records: int = 0
+
+    try:
+        with exporter:
+            record: dict
+            for record in read_ndjson(input_file, compressed=compressed):
+                exporter.write_record(record)
+
+                records += 1
+    finally:
+        if input_file is not sys.stdin.buffer:
+            input_file.close()
+
+    print(f"{exporter.rows} rows from {records} records", file=sys.stderr)
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser: argparse.ArgumentParser = build_parser()
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    if args.command == "export":
+        return export(parser, args)
+
+    compress: bool = args.zstd or args.output.endswith(SUFFIX_ZSTD)
+
+    if compress and zstandard is None:
+        parser.error("zstd output requires the 'zstandard' package")
+    if args.checkpoint is not None and args.output == "-":
+        parser.error("--checkpoint requires --output")
+
+    checkpoint: Optional[Checkpoint] = (
+        Checkpoint(args.checkpoint) if args.checkpoint is not None else None
+    )
+    count: int = 0
+    offset: int = 0
+
+    if checkpoint is not None:
+        try:
+            count, offset = checkpoint.load(args.command)
+        except ValueError as error:
+            parser.error(str(error))
+
+        if count and not os.path.exists(args.output):
+            parser.error(f"Checkpoint exists but {args.output!r} does not")
+
+    client: InnerTube = InnerTube(
+        args.client,
+        limits=httpx.Limits(
+            max_connections=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+        ),
+    )
+    limiter: Optional[RateLimiter] = (
+        RateLimiter(args.rate, args.burst) if args.rate is not None else None
+    )
+
+    input_file: IO[str] = (
+        sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    )
+    output_file: IO[bytes] = (
+        sys.stdout.buffer
+        if args.output == "-"
+        else open(args.output, "r+b" if count else "wb")
+    )
+
+    if count:
+        output_file.truncate(offset)
+        output_file.seek(offset)
+
+    writer: NDJSONWriter = NDJSONWriter(output_file, compress=compress)
+    errors: int = 0
+
+    def save() -> None:
+        writer.flush()
+
+        if checkpoint is not None:
+            checkpoint.save(args.command, count, output_file.tell())
+
+    try:
+        record: dict
+        for record in run(
+            client,
+            COMMANDS[args.command],
+            itertools.islice(read_values(input_file), count, None),
+            concurrency=args.concurrency,
+            limiter=limiter,
+        ):
+            writer.write(record)
+
+            count += 1
+            errors += "error" in record
+
+            if count % args.checkpoint_interval == 0:
+                save()
+    except KeyboardInterrupt:
+        save()
+
+        print(f"Interrupted after {count} records", file=sys.stderr)
+
+        return 130
+    else:
+        save()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout.buffer:
+            output_file.close()
+
+    print(f"{count} records ({errors} errors)", file=sys.stderr)
+
+    return 0
@@ -1,17 +1,83 @@
+import asyncio
 import dataclasses
-from typing import List, Optional
+import datetime
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import httpx
 import mediate
+from httpx._config import DEFAULT_LIMITS
 from httpx._types import ProxiesTypes
 
-from . import api, utils
-from .adaptor import InnerTubeAdaptor
+from . import api, channel, comments, music, playlist, urls, utils
+from .adaptor import (
+    DECODE_THRESHOLD,
+    AsyncInnerTubeAdaptor,
+    InnerTubeAdaptor,
+    Projection,
+)
+from .checkpoints import CheckpointStore
 from .config import config
 from .enums import Endpoint
+from .errors import RequestError, ResponseError
+from .health import HealthProber
 from .locale import Locale
-from .models import ClientContext
-from .protocols import Adaptor
+from .models import (
+    Call,
+    ChannelItem,
+    ClientContext,
+    CommentThread,
+    PlaylistItem,
+    ResolvedURL,
+    Song,
+    TranscriptSegment,
+)
+from .protocols import Adaptor, AsyncAdaptor
+from .store import ResponseStore
+from .utils import LRUCache
+from .views import NextView, TranscriptView
+
+TRANSCRIPT_PARAMS_CACHE_SIZE: int = 4096
+CHANNEL_IDS_CACHE_SIZE: int = 4096
+
+
+def build_context(
+    client_name: str,
+    client_version: Optional[str] = None,
+    *,
+    api_key: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    referer: Optional[str] = None,
+    locale: Optional[Locale] = None,
+    auto: bool = True,
+) -> ClientContext:
+    if client_name is None:
+        raise ValueError("Precondition failed: Missing client name")
+
+    kwargs: dict = utils.filter(
+        dict(
+            client_name=client_name,
+            client_version=client_version,
+            api_key=api_key,
+            user_agent=user_agent,
+            referer=referer,
+            locale=locale,
+        )
+    )
+
+    context: ClientContext
+
+    auto_context: Optional[ClientContext]
+    if auto and (auto_context := api.get_context(client_name)):
+        context = dataclasses.replace(auto_context, **kwargs)
+    else:
+        if client_version is None:
+            raise ValueError("Precondition failed: Missing client version")
+
+        context = ClientContext(**kwargs)
+
+    return context
 
 
 @dataclasses.dataclass
@@ -21,25 +87,55 @@ class Client:
     middleware: mediate.Middleware = dataclasses.field(
         default_factory=mediate.Middleware, repr=False, init=False
     )
+    request_middleware: mediate.Middleware = dataclasses.field(
+        default_factory=mediate.Middleware, repr=False, init=False
+    )
 
     def __call__(
-        self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+        *,
+        adaptor: Optional[Adaptor] = None,
     ) -> dict:
+        @self.request_middleware.bind
+        def dispatch(call: Call, /) -> dict:
+            return (adaptor or self.adaptor).dispatch(
+                call.endpoint, params=call.params, body=call.body
+            )
+
         @self.middleware.bind
         def process(data: dict, /) -> dict:
             return data
 
         response: dict = process(
-            self.adaptor.dispatch(endpoint, params=params, body=body)
+            dispatch(Call(endpoint=endpoint, params=params, body=body))
         )
 
-        response.pop("responseContext")
+        response.pop("responseContext", None)
 
         return response
 
 
 @dataclasses.dataclass(init=False)
 class InnerTube(Client):
+    transcript_params: LRUCache[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    channel_ids: LRUCache[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    prober: Optional[HealthProber] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    ranked_adaptors: Dict[str, InnerTubeAdaptor] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    fallbacks: Tuple[str, ...] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
     def __init__(
         self,
         client_name: str,
@@ -51,47 +147,115 @@ class InnerTube(Client):
         locale: Optional[Locale] = None,
         auto: bool = True,
         proxies: Optional[ProxiesTypes] = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        store: Optional[ResponseStore] = None,
+        offline: bool = False,
+        prober: Optional[HealthProber] = None,
+        fallbacks: Sequence[str] = (),
     ) -> None:
-        if client_name is None:
-            raise ValueError("Precondition failed: Missing client name")
-
-        kwargs: dict = utils.filter(
-            dict(
-                client_name=client_name,
-                client_version=client_version,
-                api_key=api_key,
-                user_agent=user_agent,
-                referer=referer,
-                locale=locale,
-            )
+        context: ClientContext = build_context(
+            client_name,
+            client_version,
+            api_key=api_key,
+            user_agent=user_agent,
+            referer=referer,
+            locale=locale,
+            auto=auto,
         )
 
-        context: ClientContext
-
-        auto_context: Optional[ClientContext]
-        if auto and (auto_context := api.get_context(client_name)):
-            context = dataclasses.replace(auto_context, **kwargs)
-        else:
-            if client_version is None:
-                raise ValueError("Precondition failed: Missing client version")
-
-            context = ClientContext(**kwargs)
+        self.transcript_params = LRUCache(TRANSCRIPT_PARAMS_CACHE_SIZE)
+        self.channel_ids = LRUCache(CHANNEL_IDS_CACHE_SIZE)
+        self.prober = prober
+        self.ranked_adaptors = {}
+        self.fallbacks = tuple(fallbacks)
 
         super().__init__(
             adaptor=InnerTubeAdaptor(
                 context=context,
-                session=httpx.Client(base_url=config.base_url, proxies=proxies),
+                session=httpx.Client(
+                    base_url=config.base_url, proxies=proxies, limits=limits
+                ),
+                store=store,
+                offline=offline,
             )
         )
 
+    def close(self) -> None:
+        if isinstance(self.adaptor, InnerTubeAdaptor):
+            self.adaptor.session.close()
+
     def config(self) -> dict:
         return self(Endpoint.CONFIG)
 
     def guide(self) -> dict:
         return self(Endpoint.GUIDE)
 
+    def _ranked_adaptor(
+        self, own: InnerTubeAdaptor, context: ClientContext
+    ) -> InnerTubeAdaptor:
+        if context.client_name == own.context.client_name:
+            return own
+
+        adaptor: Optional[InnerTubeAdaptor] = self.ranked_adaptors.get(
+            context.client_name
+        )
+
+        # Another context, but this client's locale, session, proxies and store
+        if adaptor is None or adaptor.session is not own.session:
+            adaptor = self.ranked_adaptors[context.client_name] = InnerTubeAdaptor(
+                dataclasses.replace(context, locale=own.context.locale),
+                own.session,
+                store=own.store,
+            )
+
+        return adaptor
+
+    def _ranked(self, endpoint: str, body: dict) -> dict:
+        # Only re-route a live client, and only to the contexts its caller listed
+        # as returning responses of the shape it parses
+        if (
+            self.prober is None
+            or not self.fallbacks
+            or not isinstance(self.adaptor, InnerTubeAdaptor)
+            or self.adaptor.offline
+        ):
+            return self(endpoint, body=body)
+
+        context: Optional[ClientContext] = self.prober.best(
+            endpoint, candidates=(self.adaptor.context.client_name, *self.fallbacks)
+        )
+
+        if context is None:
+            return self(endpoint, body=body)
+
+        start: float = time.perf_counter()
+
+        try:
+            response: dict = self(
+                endpoint, body=body, adaptor=self._ranked_adaptor(self.adaptor, context)
+            )
+        except (RequestError, ResponseError, httpx.HTTPError) as exception:
+            self.prober.record(
+                context.client_name,
+                endpoint,
+                ok=False,
+                latency=time.perf_counter() - start,
+                error=f"{type(exception).__name__}: {exception}",
+            )
+
+            raise
+
+        self.prober.record(
+            context.client_name,
+            endpoint,
+            ok=True,
+            latency=time.perf_counter() - start,
+        )
+
+        return response
+
     def player(self, video_id: str) -> dict:
-        return self(
+        return self._ranked(
             Endpoint.PLAYER,
             body=dict(
                 videoId=video_id,
@@ -105,7 +269,7 @@ class InnerTube(Client):
         params: Optional[str] = None,
         continuation: Optional[str] = None,
     ) -> dict:
-        return self(
+        return self._ranked(
             Endpoint.BROWSE,
             body=utils.filter(
                 dict(
@@ -195,3 +359,461 @@ class InnerTube(Client):
                 )
             ),
         )
+
+    def updated_metadata(
+        self,
+        video_id: Optional[str] = None,
+        *,
+        continuation: Optional[str] = None,
+    ) -> dict:
+        return self(
+            Endpoint.UPDATED_METADATA,
+            body=utils.filter(
+                dict(
+                    videoId=video_id,
+                    continuation=continuation,
+                )
+            ),
+        )
+
+    def get_live_chat(self, continuation: str) -> dict:
+        return self(
+            Endpoint.LIVE_CHAT_GET_LIVE_CHAT,
+            body=dict(
+                continuation=continuation,
+            ),
+        )
+
+    def resolve_url(self, url: str) -> dict:
+        return self(
+            Endpoint.NAVIGATION_RESOLVE_URL,
+            body=dict(
+                url=url,
+            ),
+        )
+
+    def resolve(self, url: str) -> Optional[ResolvedURL]:
+        resolved: Optional[ResolvedURL] = urls.parse_url(url)
+
+        if resolved is None or resolved.type not in urls.REMOTE_TYPES:
+            return resolved
+
+        key: str = resolved.id.lower()
+        channel_id: Optional[str] = self.channel_ids.get(key)
+
+        if channel_id is not None:
+            return ResolvedURL(type=urls.TYPE_CHANNEL, id=channel_id)
+
+        resolved = urls.parse_endpoint(self.resolve_url(urls.remote(resolved)))
+
+        if resolved is not None and resolved.type == urls.TYPE_CHANNEL:
+            self.channel_ids.set(key, resolved.id)
+
+        return resolved
+
+    def transcript(self, video_id: str) -> List[TranscriptSegment]:
+        params: Optional[str] = self.transcript_params.get(video_id)
+
+        if params is not None:
+            try:
+                return TranscriptView(self.get_transcript(params)).segments
+            except RequestError:
+                self.transcript_params.delete(video_id)
+
+        params = NextView(self.next(video_id)).transcript_params
+
+        if params is None:
+            return []
+
+        self.transcript_params.set(video_id, params)
+
+        return TranscriptView(self.get_transcript(params)).segments
+
+    def transcripts(
+        self, video_ids: Iterable[str], *, workers: int = 4
+    ) -> Dict[str, List[TranscriptSegment]]:
+        video_ids = list(video_ids)
+
+        executor: ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(video_ids, executor.map(self.transcript, video_ids)))
+
+    def songs(
+        self,
+        video_ids: Iterable[str],
+        *,
+        chunk_size: int = music.QUEUE_CHUNK_SIZE,
+        workers: int = music.WORKERS,
+    ) -> Dict[str, Song]:
+        video_ids = list(dict.fromkeys(video_ids))
+
+        def fetch(chunk: List[str]) -> List[Song]:
+            return music.parse_queue(self.music_get_queue(video_ids=chunk))
+
+        executor: ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            songs: Dict[str, Song] = {
+                song.video_id: song
+                for page in executor.map(fetch, music.chunks(video_ids, chunk_size))
+                for song in page
+            }
+
+        return {
+            video_id: songs[video_id] for video_id in video_ids if video_id in songs
+        }
+
+    def iter_comments(
+        self,
+        video_id: str,
+        *,
+        sort: int = comments.SORT_TOP,
+        replies: bool = True,
+        workers: int = comments.WORKERS,
+        max_comments: Optional[int] = None,
+        max_age: Optional[datetime.timedelta] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+    ) -> Iterator[CommentThread]:
+        return comments.iter_comments(
+            self,
+            video_id,
+            sort=sort,
+            replies=replies,
+            workers=workers,
+            max_comments=max_comments,
+            max_age=max_age,
+            checkpoints=checkpoints,
+        )
+
+    def iter_channel(
+        self,
+        channel_id: str,
+        *,
+        tabs: Sequence[str] = channel.TABS,
+        workers: int = channel.WORKERS,
+        prefetch: int = channel.PREFETCH,
+        checkpoints: Optional[CheckpointStore] = None,
+    ) -> Iterator[ChannelItem]:
+        return channel.iter_channel(
+            self,
+            channel_id,
+            tabs=tabs,
+            workers=workers,
+            prefetch=prefetch,
+            checkpoints=checkpoints,
+        )
+
+    def iter_playlist(
+        self, playlist_id: str, *, checkpoints: Optional[CheckpointStore] = None
+    ) -> Iterator[PlaylistItem]:
+        return playlist.iter_playlist(self, playlist_id, checkpoints=checkpoints)
+
+
+@dataclasses.dataclass
+class AsyncClient:
+    adaptor: AsyncAdaptor
+
+    middleware: mediate.Middleware = dataclasses.field(
+        default_factory=mediate.Middleware, repr=False, init=False
+    )
+    request_middleware: mediate.Middleware = dataclasses.field(
+        default_factory=mediate.Middleware, repr=False, init=False
+    )
+
+    async def __call__(
+        self, endpoint: str, params: Optional[dict] = None, body: Optional[dict] = None
+    ) -> dict:
+        @self.request_middleware.bind
+        async def dispatch(call: Call, /) -> dict:
+            return await self.adaptor.dispatch(
+                call.endpoint, params=call.params, body=call.body
+            )
+
+        @self.middleware.bind
+        def process(data: dict, /) -> dict:
+            return data
+
+        response: dict = process(
+            await dispatch(Call(endpoint=endpoint, params=params, body=body))
+        )
+
+        response.pop("responseContext", None)
+
+        return response
+
+
+@dataclasses.dataclass(init=False)
+class AsyncInnerTube(AsyncClient):
+    transcript_params: LRUCache[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    channel_ids: LRUCache[str, str] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        client_name: str,
+        client_version: Optional[str] = None,
+        *,
+        api_key: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        referer: Optional[str] = None,
+        locale: Optional[Locale] = None,
+        auto: bool = True,
+        proxies: Optional[ProxiesTypes] = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        decode_threshold: Optional[int] = DECODE_THRESHOLD,
+        executor: Optional[Executor] = None,
+        project: Optional[Projection] = None,
+        store: Optional[ResponseStore] = None,
+        offline: bool = False,
+    ) -> None:
+        context: ClientContext = build_context(
+            client_name,
+            client_version,
+            api_key=api_key,
+            user_agent=user_agent,
+            referer=referer,
+            locale=locale,
+            auto=auto,
+        )
+
+        self.transcript_params = LRUCache(TRANSCRIPT_PARAMS_CACHE_SIZE)
+        self.channel_ids = LRUCache(CHANNEL_IDS_CACHE_SIZE)
+
+        super().__init__(
+            adaptor=AsyncInnerTubeAdaptor(
+                context=context,
+                session=httpx.AsyncClient(
+                    base_url=config.base_url, proxies=proxies, limits=limits
+                ),
+                decode_threshold=decode_threshold,
+                executor=executor,
+                project=project,
+                store=store,
+                offline=offline,
+            )
+        )
+
+    async def aclose(self) -> None:
+        if isinstance(self.adaptor, AsyncInnerTubeAdaptor):
+            await self.adaptor.session.aclose()
+
+    async def config(self) -> dict:
+        return await self(Endpoint.CONFIG)
+
+    async def guide(self) -> dict:
+        return await self(Endpoint.GUIDE)
+
+    async def player(self, video_id: str) -> dict:
+        return await self(
+            Endpoint.PLAYER,
+            body=dict(
+                videoId=video_id,
+            ),
+        )
+
+    async def browse(
+        self,
+        browse_id: Optional[str] = None,
+        *,
+        params: Optional[str] = None,
+        continuation: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.BROWSE,
+            body=utils.filter(
+                dict(
+                    browseId=browse_id,
+                    params=params,
+                    continuation=continuation,
+                )
+            ),
+        )
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        *,
+        params: Optional[str] = None,
+        continuation: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.SEARCH,
+            body=utils.filter(
+                dict(
+                    query=query or "",
+                    params=params,
+                    continuation=continuation,
+                )
+            ),
+        )
+
+    async def next(
+        self,
+        video_id: Optional[str] = None,
+        playlist_id: Optional[str] = None,
+        *,
+        params: Optional[str] = None,
+        index: Optional[int] = None,
+        continuation: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.NEXT,
+            body=utils.filter(
+                dict(
+                    params=params,
+                    playlistId=playlist_id,
+                    videoId=video_id,
+                    playlistIndex=index,
+                    continuation=continuation,
+                )
+            ),
+        )
+
+    async def get_transcript(
+        self,
+        params: str,
+    ) -> dict:
+        return await self(
+            Endpoint.GET_TRANSCRIPT,
+            body=utils.filter(
+                dict(
+                    params=params,
+                )
+            ),
+        )
+
+    async def music_get_search_suggestions(
+        self,
+        input: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.MUSIC_GET_SEARCH_SUGGESTIONS,
+            body=dict(
+                input=input or "",
+            ),
+        )
+
+    async def music_get_queue(
+        self,
+        *,
+        video_ids: Optional[List[str]] = None,
+        playlist_id: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.MUSIC_GET_QUEUE,
+            body=utils.filter(
+                dict(
+                    playlistId=playlist_id,
+                    videoIds=video_ids or (None,),
+                )
+            ),
+        )
+
+    async def updated_metadata(
+        self,
+        video_id: Optional[str] = None,
+        *,
+        continuation: Optional[str] = None,
+    ) -> dict:
+        return await self(
+            Endpoint.UPDATED_METADATA,
+            body=utils.filter(
+                dict(
+                    videoId=video_id,
+                    continuation=continuation,
+                )
+            ),
+        )
+
+    async def get_live_chat(self, continuation: str) -> dict:
+        return await self(
+            Endpoint.LIVE_CHAT_GET_LIVE_CHAT,
+            body=dict(
+                continuation=continuation,
+            ),
+        )
+
+    async def resolve_url(self, url: str) -> dict:
+        return await self(
+            Endpoint.NAVIGATION_RESOLVE_URL,
+            body=dict(
+                url=url,
+            ),
+        )
+
+    async def resolve(self, url: str) -> Optional[ResolvedURL]:
+        resolved: Optional[ResolvedURL] = urls.parse_url(url)
+
+        if resolved is None or resolved.type not in urls.REMOTE_TYPES:
+            return resolved
+
+        key: str = resolved.id.lower()
+        channel_id: Optional[str] = self.channel_ids.get(key)
+
+        if channel_id is not None:
+            return ResolvedURL(type=urls.TYPE_CHANNEL, id=channel_id)
+
+        resolved = urls.parse_endpoint(await self.resolve_url(urls.remote(resolved)))
+
+        if resolved is not None and resolved.type == urls.TYPE_CHANNEL:
+            self.channel_ids.set(key, resolved.id)
+
+        return resolved
+
+    async def transcript(self, video_id: str) -> List[TranscriptSegment]:
+        params: Optional[str] = self.transcript_params.get(video_id)
+
+        if params is not None:
+            try:
+                return TranscriptView(await self.get_transcript(params)).segments
+            except RequestError:
+                self.transcript_params.delete(video_id)
+
+        params = NextView(await self.next(video_id)).transcript_params
+
+        if params is None:
+            return []
+
+        self.transcript_params.set(video_id, params)
+
+        return TranscriptView(await self.get_transcript(params)).segments
+
+    async def transcripts(
+        self, video_ids: Iterable[str], *, concurrency: int = 8
+    ) -> Dict[str, List[TranscriptSegment]]:
+        video_ids = list(video_ids)
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def transcript(video_id: str) -> List[TranscriptSegment]:
+            async with semaphore:
+                return await self.transcript(video_id)
+
+        return dict(zip(video_ids, await asyncio.gather(*map(transcript, video_ids))))
+
+    async def songs(
+        self,
+        video_ids: Iterable[str],
+        *,
+        chunk_size: int = music.QUEUE_CHUNK_SIZE,
+        concurrency: int = music.WORKERS,
+    ) -> Dict[str, Song]:
+        video_ids = list(dict.fromkeys(video_ids))
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk: List[str]) -> List[Song]:
+            async with semaphore:
+                return music.parse_queue(await self.music_get_queue(video_ids=chunk))
+
+        songs: Dict[str, Song] = {
+            song.video_id: song
+            for page in await asyncio.gather(
+                *map(fetch, music.chunks(video_ids, chunk_size))
+            )
+            for song in page
+        }
+
+        return {
+            video_id: songs[video_id] for video_id in video_ids if video_id in songs
+        }
@@ -0,0 +1,320 @@
+import datetime
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+
+from .checkpoints import CheckpointStore
+from .models import Comment, CommentThread, CrawlState
+from .utils import get
+from .views import NextView, continuation, text
+
+if TYPE_CHECKING:
+    from .clients import InnerTube
+
+__all__ = ("iter_comments", "parse_age", "parse_count")
+
+WORKERS: int = 8
+
+SORT_TOP: int = 0
+SORT_NEWEST: int = 1
+
+UNITS: Dict[str, datetime.timedelta] = {
+    "second": datetime.timedelta(seconds=1),
+    "minute": datetime.timedelta(minutes=1),
+    "hour": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1),
+    "week": datetime.timedelta(weeks=1),
+    "month": datetime.timedelta(days=30),
+    "year": datetime.timedelta(days=365),
+}
+MULTIPLIERS: Dict[str, int] = {"K": 10**3, "M": 10**6, "B": 10**9}
+
+PATTERN_AGE: re.Pattern = re.compile(
+    r"(\d+)\s+(second|minute|hour|day|week|month|year)"
+)
+PATTERN_COUNT: re.Pattern = re.compile(r"([\d.,]+)\s*([KMB]?)", re.IGNORECASE)
+
+
+def parse_age(value: Optional[str], /) -> Optional[datetime.timedelta]:
+    if value is None:
+        return None
+
+    match: Optional[re.Match] = PATTERN_AGE.search(value)
+
+    if match is None:
+        return None
+
+    return int(match.group(1)) * UNITS[match.group(2)]
+
+
+def parse_count(value: Optional[str], /) -> Optional[int]:
+    if not value:
+        return None
+
+    match: Optional[re.Match] = PATTERN_COUNT.search(value)
+
+    if match is None:
+        return None
+
+    number: str = match.group(1).replace(",", "")
+    multiplier: str = match.group(2).upper()
+
+    if not multiplier:
+        return int(number.replace(".", ""))
+
+    return int(float(number) * MULTIPLIERS[multiplier])
+
+
+def entity_payloads(data: dict, /) -> Dict[str, dict]:
+    mutations: List[dict] = (
+        get(data, "frameworkUpdates", "entityBatchUpdate", "mutations") or []
+    )
+
+    return {
+        payload["key"]: payload
+        for mutation in mutations
+        if (payload := get(mutation, "payload", "commentEntityPayload"))
+        and "key" in payload
+    }
+
+
+def parse_comment(
+    item: dict, payloads: Dict[str, dict], parent_id: Optional[str] = None
+) -> Optional[Comment]:
+    renderer: Optional[dict] = item.get("commentRenderer")
+
+    if renderer is not None:
+        return Comment(
+            id=renderer["commentId"],
+            text=text(renderer.get("contentText")) or "",
+            author=text(renderer.get("authorText")),
+            author_channel_id=get(
+                renderer, "authorEndpoint", "browseEndpoint", "browseId"
+            ),
+            published=text(renderer.get("publishedTimeText")),
+            like_count=parse_count(text(renderer.get("voteCount"))) or 0,
+            reply_count=renderer.get("replyCount", 0),
+            parent_id=parent_id,
+        )
+
+    view_model: Optional[dict] = item.get("commentViewModel")
+
+    if view_model is None:
+        return None
+
+    model: dict = view_model.get("commentViewModel", view_model)
+    payload: Optional[dict] = payloads.get(model.get("commentKey", ""))
+
+    if payload is None:
+        return None
+
+    properties: dict = payload.get("properties", {})
+
+    return Comment(
+        id=properties.get("commentId") or model["commentId"],
+        text=get(properties, "content", "content") or "",
+        author=get(payload, "author", "displayName"),
+        author_channel_id=get(payload, "author", "channelId"),
+        published=properties.get("publishedTime"),
+        like_count=parse_count(get(payload, "toolbar", "likeCountNotliked")) or 0,
+        reply_count=parse_count(get(payload, "toolbar", "replyCount")) or 0,
+        parent_id=parent_id,
+    )
+
+
+def parse_threads(
+    view: NextView, /
+) -> Tuple[List[Tuple[Comment, Optional[str]]], Optional[str]]:
+    payloads: Dict[str, dict] = entity_payloads(view.data)
+    threads: List[Tuple[Comment, Optional[str]]] = []
+
+    item: dict
+    for item in view.continuation_items:
+        thread: Optional[dict] = item.get("commentThreadRenderer")
+
+        if thread is None:
+            continue
+
+        comment: Optional[Comment] = parse_comment(
+            thread.get("comment", thread), payloads
+        )
+
+        if comment is None:
+            continue
+
+        threads.append(
+            (
+                comment,
+                continuation(
+                    get(thread, "replies", "commentRepliesRenderer", "contents") or []
+                ),
+            )
+        )
+
+    return threads, view.continuation
+
+
+def fetch_replies(
+    client: "InnerTube",
+    parent_id: str,
+    token: str,
+    *,
+    stop: Optional[threading.Event] = None,
+) -> List[Comment]:
+    replies: List[Comment] = []
+    next_token: Optional[str] = token
+
+    while next_token is not None:
+        if stop is not None and stop.is_set():
+            break
+
+        view: NextView = NextView(client.next(continuation=next_token))
+        payloads: Dict[str, dict] = entity_payloads(view.data)
+
+        item: dict
+        for item in view.continuation_items:
+            reply: Optional[Comment] = parse_comment(item, payloads, parent_id)
+
+            if reply is not None:
+                replies.append(reply)
+
+        next_token = view.continuation
+
+    return replies
+
+
+def iter_comments(
+    client: "InnerTube",
+    video_id: str,
+    *,
+    sort: int = SORT_TOP,
+    replies: bool = True,
+    workers: int = WORKERS,
+    max_comments: Optional[int] = None,
+    max_age: Optional[datetime.timedelta] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Iterator[CommentThread]:
+    key: str = f"comments:{video_id}:{sort}"
+    state: CrawlState = (
+        checkpoints.load(key) if checkpoints is not None else None
+    ) or CrawlState()
+
+    if state.done:
+        return
+
+    token: Optional[str] = state.token
+
+    if token is None:
+        watch: NextView = NextView(client.next(video_id))
+        sorts: List[str] = list(watch.comment_sorts.values())
+
+        token = sorts[sort] if sort < len(sorts) else watch.comments_continuation
+
+    if token is None:
+        return
+
+    seen: Set[str] = state.seen
+    count: int = state.count
+    pending: List[str] = []
+
+    pages: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers)
+    stop: threading.Event = threading.Event()
+    page_token: str = token
+    page: Optional[Future] = pages.submit(client.next, continuation=token)
+    expansions: List[Optional[Future]] = []
+
+    try:
+        while page is not None:
+            threads, token = parse_threads(NextView(page.result()))
+
+            page = (
+                pages.submit(client.next, continuation=token)
+                if token is not None
+                else None
+            )
+
+            # Only threads that will be yielded have their replies fetched
+            selected: List[Tuple[Comment, Optional[str]]] = []
+            ids: Set[str] = set()
+            expired: bool = False
+
+            comment: Comment
+            reply_token: Optional[str]
+            for comment, reply_token in threads:
+                if comment.id in seen or comment.id in ids:
+                    continue
+                if max_comments is not None and count + len(selected) >= max_comments:
+                    break
+
+                age: Optional[datetime.timedelta] = parse_age(comment.published)
+
+                if max_age is not None and age is not None and age > max_age:
+                    if sort == SORT_NEWEST:
+                        expired = True
+
+                        break
+
+                    continue
+
+                ids.add(comment.id)
+                selected.append((comment, reply_token))
+
+            expansions = [
+                executor.submit(
+                    fetch_replies, client, comment.id, reply_token, stop=stop
+                )
+                if replies and reply_token is not None
+                else None
+                for comment, reply_token in selected
+            ]
+
+            expansion: Optional[Future]
+            for (comment, _), expansion in zip(selected, expansions):
+                seen.add(comment.id)
+                pending.append(comment.id)
+
+                thread: CommentThread = CommentThread(comment=comment)
+
+                if expansion is not None:
+                    reply: Comment
+                    for reply in expansion.result():
+                        if reply.id not in seen:
+                            seen.add(reply.id)
+                            pending.append(reply.id)
+                            thread.replies.append(reply)
+
+                count += 1
+
+                yield thread
+
+                if max_comments is not None and count >= max_comments:
+                    return
+
+            if expired:
+                return
+
+            if checkpoints is not None:
+                checkpoints.save(
+                    key, token=token, count=count, seen=pending, done=token is None
+                )
+
+            pending = []
+
+            if token is not None:
+                page_token = token
+    finally:
+        if checkpoints is not None and pending:
+            checkpoints.save(key, token=page_token, count=count, seen=pending)
+
+        # Expansions already running stop before their next page of replies
+        stop.set()
+
+        future: Optional[Future]
+        for future in (page, *expansions):
+            if future is not None:
+                future.cancel()
+
+        pages.shutdown(wait=False)
+        executor.shutdown(wait=False)
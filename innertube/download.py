@@ -0,0 +1,158 @@
+import dataclasses
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, List, Set, Tuple, Union
+
+import httpx
+
+from .errors import DownloadError
+
+__all__ = ("Downloader", "ranges")
+
+CHUNK_SIZE: int = 10 * 1024 * 1024
+WORKERS: int = 4
+
+STATE_SUFFIX: str = ".ranges"
+
+Range = Tuple[int, int]
+
+
+def ranges(content_length: int, chunk_size: int = CHUNK_SIZE) -> List[Range]:
+    if chunk_size <= 0:
+        raise ValueError("Precondition failed: Chunk size must be positive")
+
+    return [
+        (start, min(start + chunk_size, content_length) - 1)
+        for start in range(0, content_length, chunk_size)
+    ]
+
+
+@dataclasses.dataclass
+class Downloader:
+    session: httpx.Client = dataclasses.field(
+        default_factory=lambda: httpx.Client(
+            limits=httpx.Limits(max_connections=WORKERS * 2),
+            timeout=httpx.Timeout(30.0),
+            follow_redirects=True,
+        ),
+        repr=False,
+    )
+    chunk_size: int = CHUNK_SIZE
+    workers: int = WORKERS
+
+    def download(self, format: dict, path: Union[str, os.PathLike]) -> int:
+        if "url" not in format:
+            raise DownloadError("Format has no direct URL (it may require deciphering)")
+        if "contentLength" not in format:
+            raise DownloadError("Format has no contentLength")
+
+        return self.download_url(format["url"], path, int(format["contentLength"]))
+
+    def download_url(
+        self, url: str, path: Union[str, os.PathLike], content_length: int
+    ) -> int:
+        path = os.fspath(path)
+        state_path: str = path + STATE_SUFFIX
+
+        chunks: List[Range] = ranges(content_length, self.chunk_size)
+        completed: Set[int] = self._load_state(state_path, content_length)
+
+        if not os.path.exists(path):
+            completed = set()
+
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as file:
+            file.truncate(content_length)
+
+            if content_length == 0:
+                return 0
+
+            with mmap.mmap(file.fileno(), content_length) as buffer, open(
+                state_path, "w" if not completed else "a"
+            ) as state:
+                if not completed:
+                    state.write(f"{self.chunk_size} {content_length}\n")
+                    state.flush()
+
+                lock: threading.Lock = threading.Lock()
+
+                def fetch(index: int) -> int:
+                    size: int = self._fetch(url, chunks[index], buffer)
+
+                    with lock:
+                        state.write(f"{index}\n")
+                        state.flush()
+
+                    return size
+
+                pending: List[int] = [
+                    index for index in range(len(chunks)) if index not in completed
+                ]
+
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    written: int = sum(executor.map(fetch, pending))
+
+                buffer.flush()
+
+        self._verify(path, state_path, content_length, len(chunks))
+
+        os.remove(state_path)
+
+        return written
+
+    def _fetch(self, url: str, chunk: Range, buffer: mmap.mmap) -> int:
+        start, end = chunk
+        offset: int = start
+
+        response: httpx.Response
+        with self.session.stream(
+            "GET", url, headers={"Range": f"bytes={start}-{end}"}
+        ) as response:
+            response.raise_for_status()
+
+            if response.status_code != httpx.codes.PARTIAL_CONTENT and (
+                start != 0 or end + 1 != len(buffer)
+            ):
+                raise DownloadError(
+                    f"Expected a partial response, got {response.status_code}"
+                )
+
+            data: bytes
+            for data in response.iter_bytes():
+                if offset + len(data) > end + 1:
+                    raise DownloadError(f"Received too many bytes for range {chunk}")
+
+                buffer[offset : offset + len(data)] = data
+                offset += len(data)
+
+        if offset != end + 1:
+            raise DownloadError(
+                f"Received {offset - start} of {end + 1 - start} bytes for range {chunk}"
+            )
+
+        return offset - start
+
+    def _load_state(self, state_path: str, content_length: int) -> Set[int]:
+        if not os.path.exists(state_path):
+            return set()
+
+        state: IO[str]
+        with open(state_path) as state:
+            lines: List[str] = state.read().split("\n")[:-1]
+
+        if not lines or lines[0] != f"{self.chunk_size} {content_length}":
+            return set()
+
+        return {int(line) for line in lines[1:] if line.isdigit()}
+
+    def _verify(
+        self, path: str, state_path: str, content_length: int, chunks: int
+    ) -> None:
+        size: int = os.path.getsize(path)
+
+        if size != content_length:
+            raise DownloadError(f"Expected {content_length} bytes, found {size}")
+
+        if self._load_state(state_path, content_length) != set(range(chunks)):
+            raise DownloadError("Not all ranges were downloaded")
@@ -16,6 +16,9 @@ class Endpoint(StrEnum):
     GET_TRANSCRIPT: str = "get_transcript"
     MUSIC_GET_SEARCH_SUGGESTIONS: str = "music/get_search_suggestions"
     MUSIC_GET_QUEUE: str = "music/get_queue"
+    UPDATED_METADATA: str = "updated_metadata"
+    LIVE_CHAT_GET_LIVE_CHAT: str = "live_chat/get_live_chat"
+    NAVIGATION_RESOLVE_URL: str = "navigation/resolve_url"
 
 
 class Request(StrEnum):
@@ -13,3 +13,11 @@ class RequestError(Exception):
 
 class ResponseError(Exception):
     pass
+
+
+class OfflineError(Exception):
+    pass
+
+
+class DownloadError(Exception):
+    pass
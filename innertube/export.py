@@ -0,0 +1,256 @@
+import io
+import json
+import os
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .comments import parse_count
+from .music import parse_duration
+from .utils import get
+from .views import PlayerView, SearchView, text
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+__all__ = ("ParquetExporter", "read_ndjson", "search_rows", "video_rows")
+
+ROW_GROUP_SIZE: int = 64 * 1024
+COMPRESSION: str = "zstd"
+
+KIND_PLAYER: str = "player"
+KIND_SEARCH: str = "search"
+
+Normaliser = Callable[[str, dict], List[dict]]
+
+
+def import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Parquet export requires the 'pyarrow' package") from error
+
+    return pyarrow
+
+
+def thumbnail_url(thumbnails: List[dict], /) -> Optional[str]:
+    return thumbnails[-1].get("url") if thumbnails else None
+
+
+def video_rows(value: str, data: dict) -> List[dict]:
+    view: PlayerView = PlayerView(data)
+
+    if view.video_id is None:
+        return []
+
+    microformat: dict = get(data, "microformat", "playerMicroformatRenderer") or {}
+
+    return [
+        dict(
+            video_id=view.video_id,
+            title=view.title,
+            author=view.author,
+            channel_id=view.channel_id,
+            description=view.description,
+            length_seconds=view.length_seconds,
+            view_count=view.view_count,
+            is_live=view.is_live,
+            keywords=view.keywords,
+            category=microformat.get("category"),
+            publish_date=microformat.get("publishDate"),
+            thumbnail_url=thumbnail_url(view.thumbnails),
+        )
+    ]
+
+
+def search_rows(value: str, data: dict) -> List[dict]:
+    rows: List[dict] = []
+
+    item: dict
+    for item in SearchView(data).items:
+        renderer: dict
+        item_type: str
+        key: str
+
+        if "videoRenderer" in item:
+            renderer, item_type, key = item["videoRenderer"], "video", "videoId"
+        elif "playlistRenderer" in item:
+            renderer, item_type, key = (
+                item["playlistRenderer"],
+                "playlist",
+                "playlistId",
+            )
+        elif "channelRenderer" in item:
+            renderer, item_type, key = item["channelRenderer"], "channel", "channelId"
+        else:
+            continue
+
+        owner: Optional[dict] = get(renderer, "ownerText", "runs", 0) or get(
+            renderer, "shortBylineText", "runs", 0
+        )
+
+        rows.append(
+            dict(
+                query=value,
+                position=len(rows),
+                type=item_type,
+                id=renderer.get(key),
+                title=text(renderer.get("title")),
+                channel=get(owner, "text"),
+                channel_id=get(
+                    owner, "navigationEndpoint", "browseEndpoint", "browseId"
+                ),
+                published=text(renderer.get("publishedTimeText")),
+                duration_seconds=parse_duration(text(renderer.get("lengthText"))),
+                view_count=parse_count(text(renderer.get("viewCountText"))),
+                thumbnail_url=thumbnail_url(
+                    get(renderer, "thumbnail", "thumbnails")
+                    or get(renderer, "thumbnails", 0, "thumbnails")
+                    or []
+                ),
+            )
+        )
+
+    return rows
+
+
+NORMALISERS: Dict[str, Normaliser] = {
+    KIND_PLAYER: video_rows,
+    KIND_SEARCH: search_rows,
+}
+
+
+def schema(kind: str, /) -> Any:
+    pyarrow: Any = import_pyarrow()
+
+    if kind == KIND_PLAYER:
+        return pyarrow.schema(
+            [
+                ("video_id", pyarrow.string()),
+                ("title", pyarrow.string()),
+                ("author", pyarrow.string()),
+                ("channel_id", pyarrow.string()),
+                ("description", pyarrow.string()),
+                ("length_seconds", pyarrow.int64()),
+                ("view_count", pyarrow.int64()),
+                ("is_live", pyarrow.bool_()),
+                ("keywords", pyarrow.list_(pyarrow.string())),
+                ("category", pyarrow.string()),
+                ("publish_date", pyarrow.string()),
+                ("thumbnail_url", pyarrow.string()),
+            ]
+        )
+    if kind == KIND_SEARCH:
+        return pyarrow.schema(
+            [
+                ("query", pyarrow.string()),
+                ("position", pyarrow.int32()),
+                ("type", pyarrow.string()),
+                ("id", pyarrow.string()),
+                ("title", pyarrow.string()),
+                ("channel", pyarrow.string()),
+                ("channel_id", pyarrow.string()),
+                ("published", pyarrow.string()),
+                ("duration_seconds", pyarrow.int64()),
+                ("view_count", pyarrow.int64()),
+                ("thumbnail_url", pyarrow.string()),
+            ]
+        )
+
+    raise ValueError(f"Unknown export kind: {kind!r}")
+
+
+def read_ndjson(file: IO[bytes], /, *, compressed: bool = False) -> Iterator[dict]:
+    if compressed:
+        if zstandard is None:
+            raise ImportError("Reading zstd input requires the 'zstandard' package")
+
+        file = zstandard.ZstdDecompressor().stream_reader(
+            file, read_across_frames=True, closefd=False
+        )
+
+    line: str
+    for line in io.TextIOWrapper(file, encoding="utf-8"):
+        if line.strip():
+            yield json.loads(line)
+
+
+class ParquetExporter:
+    kind: str
+    row_group_size: int
+    rows: int
+
+    _schema: Any
+    _writer: Any
+    _normalise: Normaliser
+    _buffer: List[dict]
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        kind: str,
+        *,
+        row_group_size: int = ROW_GROUP_SIZE,
+        compression: str = COMPRESSION,
+    ) -> None:
+        if kind not in NORMALISERS:
+            raise ValueError(f"Unknown export kind: {kind!r}")
+        if row_group_size <= 0:
+            raise ValueError("Precondition failed: Row group size must be positive")
+
+        pyarrow: Any = import_pyarrow()
+
+        self.kind = kind
+        self.row_group_size = row_group_size
+        self.rows = 0
+
+        self._schema = schema(kind)
+        self._writer = pyarrow.parquet.ParquetWriter(
+            os.fspath(path), self._schema, compression=compression
+        )
+        self._normalise = NORMALISERS[kind]
+        self._buffer = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(kind={self.kind!r}, rows={self.rows!r})"
+
+    def __enter__(self) -> "ParquetExporter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def write(self, value: str, data: dict) -> int:
+        rows: List[dict] = self._normalise(value, data)
+
+        self._buffer.extend(rows)
+
+        while len(self._buffer) >= self.row_group_size:
+            self._write_row_group()
+
+        return len(rows)
+
+    def write_record(self, record: dict) -> int:
+        if "data" not in record:
+            return 0
+
+        return self.write(record.get("input", ""), record["data"])
+
+    def _write_row_group(self) -> None:
+        rows: List[dict] = self._buffer[: self.row_group_size]
+
+        self._writer.write_batch(
+            import_pyarrow().RecordBatch.from_pylist(rows, schema=self._schema)
+        )
+
+        self.rows += len(rows)
+        del self._buffer[: self.row_group_size]
+
+    def flush(self) -> None:
+        while self._buffer:
+            self._write_row_group()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
@@ -0,0 +1,239 @@
+import collections
+import dataclasses
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import httpx
+
+from .adaptor import InnerTubeAdaptor
+from .config import config
+from .enums import Endpoint
+from .errors import RequestError, ResponseError
+from .models import ClientContext
+from .protocols import Adaptor
+from .utils import get
+
+__all__ = ("ContextHealth", "HealthProber")
+
+PROBE_VIDEO_ID: str = "dQw4w9WgXcQ"
+PROBE_BROWSE_ID: str = "UCuAXFkgsw1L7xaCfnd5JJOw"
+
+WINDOW: int = 20
+MIN_SUCCESS_RATE: float = 0.9
+INTERVAL: float = 15 * 60
+WORKERS: int = 8
+
+PLAYABILITY_OK: str = "OK"
+
+
+@dataclasses.dataclass
+class ContextHealth:
+    client_name: str
+    endpoint: str
+    samples: Deque[Tuple[bool, float]] = dataclasses.field(
+        default_factory=lambda: collections.deque(maxlen=WINDOW), repr=False
+    )
+    last_error: Optional[str] = None
+    last_checked: Optional[float] = None
+
+    @property
+    def success_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+
+        return sum(ok for ok, _ in self.samples) / len(self.samples)
+
+    @property
+    def latency(self) -> float:
+        latencies: List[float] = sorted(latency for ok, latency in self.samples if ok)
+
+        if not latencies:
+            return math.inf
+
+        return latencies[len(latencies) // 2]
+
+
+class HealthProber:
+    session: httpx.Client
+    contexts: Dict[str, ClientContext]
+    adaptors: Dict[str, Adaptor]
+    endpoints: Tuple[str, ...]
+    video_id: str
+    browse_id: str
+    window: int
+    min_success_rate: float
+    workers: int
+
+    _health: Dict[Tuple[str, str], ContextHealth]
+    _lock: threading.Lock
+    _stop: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        contexts: Optional[Iterable[ClientContext]] = None,
+        *,
+        endpoints: Sequence[str] = (Endpoint.PLAYER, Endpoint.BROWSE),
+        video_id: str = PROBE_VIDEO_ID,
+        browse_id: str = PROBE_BROWSE_ID,
+        window: int = WINDOW,
+        min_success_rate: float = MIN_SUCCESS_RATE,
+        workers: int = WORKERS,
+        session: Optional[httpx.Client] = None,
+    ) -> None:
+        self.contexts = {
+            context.client_name: context
+            for context in (contexts if contexts is not None else config.clients)
+        }
+
+        if not self.contexts:
+            raise ValueError("Precondition failed: No contexts to probe")
+
+        self.session = session or httpx.Client(base_url=config.base_url)
+        self.adaptors = {
+            name: InnerTubeAdaptor(context, self.session)
+            for name, context in self.contexts.items()
+        }
+        self.endpoints = tuple(endpoints)
+        self.video_id = video_id
+        self.browse_id = browse_id
+        self.window = window
+        self.min_success_rate = min_success_rate
+        self.workers = workers
+
+        self._health = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(contexts={list(self.contexts)!r})"
+
+    def _body(self, endpoint: str) -> dict:
+        if endpoint == Endpoint.PLAYER:
+            return dict(videoId=self.video_id)
+        if endpoint == Endpoint.BROWSE:
+            return dict(browseId=self.browse_id)
+
+        return {}
+
+    def _probe(self, client_name: str, endpoint: str) -> None:
+        error: Optional[str] = None
+        start: float = time.perf_counter()
+
+        try:
+            data: dict = self.adaptors[client_name].dispatch(
+                endpoint, body=self._body(endpoint)
+            )
+        except (RequestError, ResponseError, httpx.HTTPError) as exception:
+            error = f"{type(exception).__name__}: {exception}"
+        else:
+            status: Optional[str] = get(data, "playabilityStatus", "status")
+
+            if endpoint == Endpoint.PLAYER and status != PLAYABILITY_OK:
+                error = f"Playability status {status!r}"
+
+        self.record(
+            client_name,
+            endpoint,
+            ok=error is None,
+            latency=time.perf_counter() - start,
+            error=error,
+        )
+
+    def record(
+        self,
+        client_name: str,
+        endpoint: str,
+        *,
+        ok: bool,
+        latency: float,
+        error: Optional[str] = None,
+    ) -> None:
+        key: Tuple[str, str] = (client_name, str(endpoint))
+
+        with self._lock:
+            health: Optional[ContextHealth] = self._health.get(key)
+
+            if health is None:
+                health = self._health[key] = ContextHealth(
+                    client_name=client_name,
+                    endpoint=str(endpoint),
+                    samples=collections.deque(maxlen=self.window),
+                )
+
+            health.samples.append((ok, latency))
+            health.last_checked = time.time()
+
+            if error is not None:
+                health.last_error = error
+
+    def probe(self) -> None:
+        pairs: List[Tuple[str, str]] = [
+            (client_name, endpoint)
+            for client_name in self.contexts
+            for endpoint in self.endpoints
+        ]
+
+        executor: ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(lambda pair: self._probe(*pair), pairs))
+
+    def ranking(self, endpoint: str) -> List[ContextHealth]:
+        with self._lock:
+            entries: List[ContextHealth] = [
+                health
+                for (_, health_endpoint), health in self._health.items()
+                if health_endpoint == endpoint and health.client_name in self.contexts
+            ]
+
+        def key(health: ContextHealth) -> Tuple[float, ...]:
+            if health.success_rate >= self.min_success_rate:
+                return (0, health.latency)
+
+            return (1, -health.success_rate, health.latency)
+
+        return sorted(entries, key=key)
+
+    def best(
+        self, endpoint: str, *, candidates: Optional[Iterable[str]] = None
+    ) -> Optional[ClientContext]:
+        names: Optional[Set[str]] = set(candidates) if candidates is not None else None
+
+        health: ContextHealth
+        for health in self.ranking(endpoint):
+            if names is not None and health.client_name not in names:
+                continue
+            if health.success_rate >= self.min_success_rate:
+                return self.contexts[health.client_name]
+
+        return None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(interval)
+
+    def start(self, interval: float = INTERVAL) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="innertube-prober", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self.session.close()
@@ -0,0 +1,370 @@
+import asyncio
+import dataclasses
+import logging
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from .errors import RequestError, ResponseError
+from .models import LiveChatMessage, LiveMetadata
+from .utils import get
+from .views import integer, text
+
+if TYPE_CHECKING:
+    from .clients import AsyncInnerTube
+
+__all__ = ("Interval", "LivePoller", "parse_chat", "parse_metadata")
+
+T = TypeVar("T")
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+MIN_INTERVAL: float = 1.0
+MAX_INTERVAL: float = 60.0
+FACTOR: float = 1.5
+CONCURRENCY: int = 32
+MAX_ERRORS: int = 5
+QUEUE_SIZE: int = 1024
+
+CONTINUATION_KEYS: Tuple[str, ...] = (
+    "invalidationContinuationData",
+    "timedContinuationData",
+    "reloadContinuationData",
+    "liveChatReplayContinuationData",
+)
+CHAT_RENDERERS: Tuple[str, ...] = (
+    "liveChatTextMessageRenderer",
+    "liveChatPaidMessageRenderer",
+)
+
+Continuation = Tuple[Optional[str], Optional[float]]
+
+
+class _End:
+    pass
+
+
+END: _End = _End()
+
+
+@dataclasses.dataclass
+class Interval:
+    minimum: float = MIN_INTERVAL
+    maximum: float = MAX_INTERVAL
+    factor: float = FACTOR
+    value: float = dataclasses.field(init=False)
+
+    def __post_init__(self) -> None:
+        self.value = self.minimum
+
+    def next(self, active: bool, timeout: Optional[float] = None) -> float:
+        if active:
+            self.value = max(self.minimum, self.value / self.factor)
+        else:
+            self.value = min(self.maximum, self.value * self.factor)
+
+        return max(self.value, timeout or 0.0)
+
+    def backoff(self) -> float:
+        self.value = min(self.maximum, self.value * 2)
+
+        return self.value
+
+
+def parse_continuation(continuations: Iterable[dict], /) -> Continuation:
+    item: dict
+    for item in continuations:
+        key: str
+        for key in CONTINUATION_KEYS:
+            data: Optional[dict] = item.get(key)
+
+            if data is None:
+                continue
+
+            timeout: Optional[int] = data.get("timeoutMs")
+
+            return (
+                data.get("continuation"),
+                timeout / 1000 if timeout is not None else None,
+            )
+
+    return None, None
+
+
+def parse_metadata(video_id: str, data: dict) -> Tuple[LiveMetadata, Continuation]:
+    metadata: LiveMetadata = LiveMetadata(video_id=video_id)
+
+    action: dict
+    for action in data.get("actions", ()):
+        if "updateViewershipAction" in action:
+            renderer: dict = (
+                get(
+                    action["updateViewershipAction"],
+                    "viewCount",
+                    "videoViewCountRenderer",
+                )
+                or {}
+            )
+
+            metadata.view_count_text = text(renderer.get("viewCount"))
+            metadata.view_count = integer(
+                text(renderer.get("originalViewCount")) or metadata.view_count_text
+            )
+        elif "updateToggleButtonTextAction" in action:
+            metadata.like_count_text = text(
+                action["updateToggleButtonTextAction"].get("defaultText")
+            )
+        elif "updateDateTextAction" in action:
+            metadata.date_text = text(action["updateDateTextAction"].get("dateText"))
+        elif "updateTitleAction" in action:
+            metadata.title = text(action["updateTitleAction"].get("title"))
+
+    return metadata, parse_continuation([data.get("continuation") or {}])
+
+
+def message_text(message: Optional[dict], /) -> str:
+    if message is None:
+        return ""
+
+    return "".join(
+        run["text"]
+        if "text" in run
+        else (get(run, "emoji", "shortcuts", 0) or get(run, "emoji", "emojiId") or "")
+        for run in message.get("runs", ())
+    )
+
+
+def parse_chat(video_id: str, data: dict) -> Tuple[List[LiveChatMessage], Continuation]:
+    contents: dict = get(data, "continuationContents", "liveChatContinuation") or {}
+    messages: List[LiveChatMessage] = []
+
+    action: dict
+    for action in contents.get("actions", ()):
+        item: dict = get(action, "addChatItemAction", "item") or {}
+
+        name: str
+        for name in CHAT_RENDERERS:
+            renderer: Optional[dict] = item.get(name)
+
+            if renderer is None:
+                continue
+
+            messages.append(
+                LiveChatMessage(
+                    video_id=video_id,
+                    id=renderer.get("id", ""),
+                    text=message_text(renderer.get("message")),
+                    author=text(renderer.get("authorName")),
+                    author_channel_id=renderer.get("authorExternalChannelId"),
+                    timestamp_usec=integer(renderer.get("timestampUsec")),
+                    amount=text(renderer.get("purchaseAmountText")),
+                )
+            )
+
+    return messages, parse_continuation(contents.get("continuations", ()))
+
+
+def chat_continuation(data: dict, /) -> Optional[str]:
+    return parse_continuation(
+        get(
+            data,
+            "contents",
+            "twoColumnWatchNextResults",
+            "conversationBar",
+            "liveChatRenderer",
+            "continuations",
+        )
+        or ()
+    )[0]
+
+
+class LivePoller:
+    client: "AsyncInnerTube"
+    min_interval: float
+    max_interval: float
+    max_errors: int
+    concurrency: int
+
+    _semaphore: Optional[asyncio.Semaphore]
+
+    def __init__(
+        self,
+        client: "AsyncInnerTube",
+        *,
+        concurrency: int = CONCURRENCY,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        max_errors: int = MAX_ERRORS,
+    ) -> None:
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_errors = max_errors
+        self.concurrency = concurrency
+
+        self._semaphore = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(client={self.client!r})"
+
+    def _interval(self) -> Interval:
+        return Interval(minimum=self.min_interval, maximum=self.max_interval)
+
+    async def _request(self, function: Callable[[], Awaitable[dict]]) -> dict:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            return await function()
+
+    async def _poll(
+        self,
+        video_id: str,
+        queue: "asyncio.Queue[Union[T, _End]]",
+        continuation: Optional[str],
+        fetch: Callable[[Optional[str]], Awaitable[dict]],
+        parse: Callable[[dict], Tuple[List[T], Continuation]],
+    ) -> None:
+        interval: Interval = self._interval()
+        errors: int = 0
+
+        while True:
+            try:
+                data: dict = await self._request(lambda: fetch(continuation))
+            except (RequestError, ResponseError, httpx.HTTPError) as error:
+                errors += 1
+
+                if errors >= self.max_errors:
+                    logger.warning(
+                        "Stopped polling %s after %d consecutive errors: %r",
+                        video_id,
+                        errors,
+                        error,
+                    )
+
+                    return
+
+                await asyncio.sleep(interval.backoff())
+
+                continue
+
+            errors = 0
+
+            events: List[T]
+            timeout: Optional[float]
+            events, (continuation, timeout) = parse(data)
+
+            event: T
+            for event in events:
+                await queue.put(event)
+
+            if continuation is None:
+                return
+
+            await asyncio.sleep(interval.next(bool(events), timeout))
+
+    async def _poll_metadata(
+        self,
+        video_id: str,
+        queue: "asyncio.Queue[Union[LiveMetadata, _End]]",
+    ) -> None:
+        last: Optional[LiveMetadata] = None
+
+        def parse(data: dict) -> Tuple[List[LiveMetadata], Continuation]:
+            nonlocal last
+
+            metadata: LiveMetadata
+            metadata, next_continuation = parse_metadata(video_id, data)
+
+            if metadata == last:
+                return [], next_continuation
+
+            last = metadata
+
+            return [metadata], next_continuation
+
+        await self._poll(
+            video_id,
+            queue,
+            None,
+            lambda continuation: self.client.updated_metadata(
+                video_id if continuation is None else None, continuation=continuation
+            ),
+            parse,
+        )
+
+    async def _poll_chat(
+        self,
+        video_id: str,
+        queue: "asyncio.Queue[Union[LiveChatMessage, _End]]",
+    ) -> None:
+        token: Optional[str] = chat_continuation(
+            await self._request(lambda: self.client.next(video_id))
+        )
+
+        if token is None:
+            return
+
+        async def fetch(continuation: Optional[str]) -> dict:
+            if continuation is None:
+                raise ValueError("Live chat is polled by continuation only")
+
+            return await self.client.get_live_chat(continuation)
+
+        await self._poll(
+            video_id, queue, token, fetch, lambda data: parse_chat(video_id, data)
+        )
+
+    async def _multiplex(
+        self,
+        video_ids: Iterable[str],
+        poll: Callable[[str, "asyncio.Queue[Union[T, _End]]"], Awaitable[None]],
+    ) -> AsyncIterator[T]:
+        queue: "asyncio.Queue[Union[T, _End]]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+        async def run(video_id: str) -> None:
+            # A stream that fails ends alone; the others keep polling
+            try:
+                await poll(video_id, queue)
+            except Exception as error:
+                logger.warning("Stopped polling %s: %r", video_id, error)
+
+            await queue.put(END)
+
+        tasks: List[asyncio.Task] = [
+            asyncio.ensure_future(run(video_id)) for video_id in video_ids
+        ]
+        remaining: int = len(tasks)
+
+        try:
+            while remaining:
+                event: Union[T, _End] = await queue.get()
+
+                if isinstance(event, _End):
+                    remaining -= 1
+                    continue
+
+                yield event
+        finally:
+            task: asyncio.Task
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metadata(self, video_ids: Iterable[str]) -> AsyncIterator[LiveMetadata]:
+        return self._multiplex(video_ids, self._poll_metadata)
+
+    def chat(self, video_ids: Iterable[str]) -> AsyncIterator[LiveChatMessage]:
+        return self._multiplex(video_ids, self._poll_chat)
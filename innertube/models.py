@@ -1,6 +1,6 @@
 import dataclasses
 import http
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from . import utils
 from .locale import Locale
@@ -101,3 +101,118 @@ class ResponseFingerprint:
     browse_id: Optional[str] = None
     context: Optional[str] = None
     client: Optional[str] = None
+
+
+@dataclasses.dataclass
+class DecodeStats:
+    inline: int = 0
+    inline_seconds: float = 0.0
+    offloaded: int = 0
+    offloaded_seconds: float = 0.0
+    offloaded_bytes: int = 0
+
+
+@dataclasses.dataclass
+class TranscriptSegment:
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+@dataclasses.dataclass
+class Comment:
+    id: str
+    text: str
+    author: Optional[str] = None
+    author_channel_id: Optional[str] = None
+    published: Optional[str] = None
+    like_count: Optional[int] = None
+    reply_count: Optional[int] = None
+    parent_id: Optional[str] = None
+
+
+@dataclasses.dataclass
+class CommentThread:
+    comment: Comment
+    replies: List[Comment] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class ChannelItem:
+    id: str
+    type: str
+    tab: str
+    title: Optional[str] = None
+    published: Optional[str] = None
+    duration: Optional[str] = None
+    view_count: Optional[int] = None
+    video_count: Optional[int] = None
+    thumbnails: List[dict] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class Song:
+    video_id: str
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    artist_id: Optional[str] = None
+    album: Optional[str] = None
+    album_id: Optional[str] = None
+    duration_seconds: Optional[int] = None
+    thumbnails: List[dict] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class PlaylistItem:
+    video_id: str
+    set_video_id: Optional[str] = None
+    index: Optional[int] = None
+    title: Optional[str] = None
+    author: Optional[str] = None
+    channel_id: Optional[str] = None
+    duration_seconds: Optional[int] = None
+    thumbnails: List[dict] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class CrawlState:
+    token: Optional[str] = None
+    count: int = 0
+    done: bool = False
+    seen: Set[str] = dataclasses.field(default_factory=set)
+
+
+@dataclasses.dataclass
+class LiveMetadata:
+    video_id: str
+    view_count: Optional[int] = None
+    view_count_text: Optional[str] = None
+    like_count_text: Optional[str] = None
+    date_text: Optional[str] = None
+    title: Optional[str] = None
+
+
+@dataclasses.dataclass
+class LiveChatMessage:
+    video_id: str
+    id: str
+    text: str
+    author: Optional[str] = None
+    author_channel_id: Optional[str] = None
+    timestamp_usec: Optional[int] = None
+    amount: Optional[str] = None
+
+
+@dataclasses.dataclass
+class ResolvedURL:
+    type: str
+    id: str
+    playlist_id: Optional[str] = None
+    music: bool = False
+
+
+@dataclasses.dataclass
+class Call:
+    endpoint: str
+    params: Optional[dict] = None
+    body: Optional[dict] = None
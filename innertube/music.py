@@ -0,0 +1,92 @@
+from typing import List, Optional, Sequence
+
+from .models import Song
+from .utils import get
+from .views import text
+
+__all__ = ("chunks", "parse_duration", "parse_queue", "parse_song")
+
+QUEUE_CHUNK_SIZE: int = 50
+WORKERS: int = 4
+
+PREFIX_ARTIST: str = "UC"
+PREFIX_ALBUM: str = "MPRE"
+
+
+def chunks(video_ids: Sequence[str], size: int = QUEUE_CHUNK_SIZE) -> List[List[str]]:
+    if size <= 0:
+        raise ValueError("Precondition failed: Chunk size must be positive")
+
+    return [
+        list(video_ids[index : index + size])
+        for index in range(0, len(video_ids), size)
+    ]
+
+
+def parse_duration(value: Optional[str], /) -> Optional[int]:
+    if not value:
+        return None
+
+    seconds: int = 0
+
+    part: str
+    for part in value.split(":"):
+        if not part.isdigit():
+            return None
+
+        seconds = seconds * 60 + int(part)
+
+    return seconds
+
+
+def parse_song(item: dict, /) -> Optional[Song]:
+    renderer: Optional[dict] = get(item, "playlistPanelVideoRenderer") or get(
+        item,
+        "playlistPanelVideoWrapperRenderer",
+        "primaryRenderer",
+        "playlistPanelVideoRenderer",
+    )
+
+    if renderer is None or "videoId" not in renderer:
+        return None
+
+    song: Song = Song(
+        video_id=renderer["videoId"],
+        title=text(renderer.get("title")),
+        duration_seconds=parse_duration(text(renderer.get("lengthText"))),
+        thumbnails=get(renderer, "thumbnail", "thumbnails") or [],
+    )
+
+    run: dict
+    for run in get(renderer, "longBylineText", "runs") or ():
+        browse_id: Optional[str] = get(
+            run, "navigationEndpoint", "browseEndpoint", "browseId"
+        )
+
+        if browse_id is None:
+            continue
+
+        if browse_id.startswith(PREFIX_ARTIST) and song.artist is None:
+            song.artist = run.get("text")
+            song.artist_id = browse_id
+        elif browse_id.startswith(PREFIX_ALBUM) and song.album is None:
+            song.album = run.get("text")
+            song.album_id = browse_id
+
+    if song.artist is None:
+        song.artist = text(renderer.get("shortBylineText"))
+
+    return song
+
+
+def parse_queue(data: dict, /) -> List[Song]:
+    songs: List[Song] = []
+
+    queue_data: dict
+    for queue_data in data.get("queueDatas", ()):
+        song: Optional[Song] = parse_song(queue_data.get("content", {}))
+
+        if song is not None:
+            songs.append(song)
+
+    return songs
@@ -0,0 +1,125 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set
+
+from .checkpoints import CheckpointStore
+from .models import CrawlState, PlaylistItem
+from .utils import get
+from .views import BrowseView, integer, text
+
+if TYPE_CHECKING:
+    from .clients import InnerTube
+
+__all__ = ("iter_playlist", "parse_item")
+
+PREFIX_PLAYLIST: str = "VL"
+
+
+def parse_item(item: dict, /) -> Optional[PlaylistItem]:
+    renderer: Optional[dict] = item.get("playlistVideoRenderer")
+
+    if renderer is None or "videoId" not in renderer:
+        return None
+
+    return PlaylistItem(
+        video_id=renderer["videoId"],
+        set_video_id=renderer.get("setVideoId"),
+        index=integer(text(renderer.get("index"))),
+        title=text(renderer.get("title")),
+        author=text(renderer.get("shortBylineText")),
+        channel_id=get(
+            renderer,
+            "shortBylineText",
+            "runs",
+            0,
+            "navigationEndpoint",
+            "browseEndpoint",
+            "browseId",
+        ),
+        duration_seconds=integer(renderer.get("lengthSeconds")),
+        thumbnails=get(renderer, "thumbnail", "thumbnails") or [],
+    )
+
+
+def parse_items(view: BrowseView, /) -> List[PlaylistItem]:
+    items: List[PlaylistItem] = []
+
+    item: dict
+    for item in view.items:
+        playlist_item: Optional[PlaylistItem] = parse_item(item)
+
+        if playlist_item is not None:
+            items.append(playlist_item)
+
+    return items
+
+
+def iter_playlist(
+    client: "InnerTube",
+    playlist_id: str,
+    *,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Iterator[PlaylistItem]:
+    browse_id: str = (
+        playlist_id
+        if playlist_id.startswith(PREFIX_PLAYLIST)
+        else PREFIX_PLAYLIST + playlist_id
+    )
+    key: str = f"playlist:{browse_id}"
+    state: CrawlState = (
+        checkpoints.load(key) if checkpoints is not None else None
+    ) or CrawlState()
+
+    if state.done:
+        return
+
+    seen: Set[str] = state.seen
+    count: int = state.count
+    pending: List[str] = []
+
+    pages: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+    page_token: Optional[str] = state.token
+    page: Optional[Future] = (
+        pages.submit(client.browse, continuation=page_token)
+        if page_token is not None
+        else pages.submit(client.browse, browse_id)
+    )
+
+    try:
+        while page is not None:
+            view: BrowseView = BrowseView(page.result())
+            token: Optional[str] = view.continuation
+
+            page = (
+                pages.submit(client.browse, continuation=token)
+                if token is not None
+                else None
+            )
+
+            item: PlaylistItem
+            for item in parse_items(view):
+                id: str = item.set_video_id or item.video_id
+
+                if id in seen:
+                    continue
+
+                seen.add(id)
+                pending.append(id)
+                count += 1
+
+                yield item
+
+            if checkpoints is not None:
+                checkpoints.save(
+                    key, token=token, count=count, seen=pending, done=token is None
+                )
+
+            pending = []
+            page_token = token
+    finally:
+        if checkpoints is not None and pending:
+            checkpoints.save(key, token=page_token, count=count, seen=pending)
+
+        if page is not None:
+            page.cancel()
+
+        pages.shutdown(wait=False)
@@ -11,3 +11,15 @@ class Adaptor(Protocol):
         body: Optional[dict] = None
     ) -> dict:
         raise NotImplementedError
+
+
+@runtime_checkable
+class AsyncAdaptor(Protocol):
+    async def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None
+    ) -> dict:
+        raise NotImplementedError
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+__all__ = ("ResponseStore",)
+
+CODEC_ZSTD: str = "zstd"
+CODEC_ZLIB: str = "zlib"
+
+MMAP_SIZE: int = 256 * 1024 * 1024
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+"""
+
+
+class ResponseStore:
+    path: str
+    ttl: Optional[float]
+    max_bytes: Optional[int]
+    codec: str
+    level: int
+
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+    _bytes: int
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        mmap_size: int = MMAP_SIZE,
+        level: int = 3,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.codec = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+        self.level = level
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._connection.executescript(SCHEMA)
+        self._bytes = self._total()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    @staticmethod
+    def key(endpoint: str, body: dict, /) -> str:
+        return hashlib.sha256(
+            b"\0".join(
+                (
+                    str(endpoint).encode(),
+                    json.dumps(body, sort_keys=True, separators=(",", ":")).encode(),
+                )
+            )
+        ).hexdigest()
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            return zstandard.ZstdCompressor(level=self.level).compress(content)
+
+        return zlib.compress(content, self.level)
+
+    def _decompress(self, codec: str, value: bytes) -> Optional[bytes]:
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(value)
+        if codec == CODEC_ZSTD and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(value)
+
+        return None
+
+    def get(self, key: str, /, *, stale: bool = False) -> Optional[bytes]:
+        now: float = time.time()
+
+        with self._lock:
+            row: Optional[
+                Tuple[str, bytes, Optional[float]]
+            ] = self._connection.execute(
+                "SELECT codec, value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            codec, value, expires = row
+
+            if not stale and expires is not None and expires <= now:
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+
+        return self._decompress(codec, value)
+
+    def set(
+        self,
+        key: str,
+        endpoint: str,
+        content: bytes,
+        /,
+        *,
+        ttl: Optional[float] = None,
+    ) -> None:
+        now: float = time.time()
+        value: bytes = self._compress(content)
+        ttl = ttl if ttl is not None else self.ttl
+
+        with self._lock:
+            self._bytes -= self._entry_size(key)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, codec, value, size, created, accessed, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(endpoint),
+                    self.codec,
+                    value,
+                    len(value),
+                    now,
+                    now,
+                    now + ttl if ttl is not None else None,
+                ),
+            )
+            self._bytes += len(value)
+
+            if self.max_bytes is not None and self._bytes > self.max_bytes:
+                self._evict(self.max_bytes)
+
+    def _total(self) -> int:
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _entry_size(self, key: str) -> int:
+        row: Optional[Tuple[int]] = self._connection.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        return row[0] if row is not None else 0
+
+    def _purge(self) -> None:
+        now: float = time.time()
+
+        self._bytes -= self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses "
+            "WHERE expires IS NOT NULL AND expires <= ?",
+            (now,),
+        ).fetchone()[0]
+        self._connection.execute(
+            "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+            (now,),
+        )
+
+    def _evict(self, max_bytes: int) -> None:
+        self._purge()
+
+        size: int = self._bytes
+
+        key: str
+        entry_size: int
+        evict: List[Tuple[str]] = []
+        for key, entry_size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if size <= max_bytes:
+                break
+
+            evict.append((key,))
+            size -= entry_size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evict)
+        self._bytes = size
+
+    def size(self) -> int:
+        with self._lock:
+            self._bytes = self._total()
+
+            return self._bytes
+
+    def delete(self, key: str, /) -> None:
+        with self._lock:
+            self._bytes -= self._entry_size(key)
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge(self) -> None:
+        with self._lock:
+            self._purge()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,176 @@
+import re
+import urllib.parse
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from .models import ResolvedURL
+from .utils import get
+
+__all__ = ("parse_endpoint", "parse_url", "remote")
+
+TYPE_VIDEO: str = "video"
+TYPE_SHORT: str = "short"
+TYPE_PLAYLIST: str = "playlist"
+TYPE_CHANNEL: str = "channel"
+TYPE_ALBUM: str = "album"
+TYPE_BROWSE: str = "browse"
+TYPE_HANDLE: str = "handle"
+TYPE_VANITY: str = "vanity"
+
+# Types that can only be resolved by the navigation/resolve_url endpoint
+REMOTE_TYPES: FrozenSet[str] = frozenset((TYPE_HANDLE, TYPE_VANITY))
+
+PREFIX_CHANNEL: str = "UC"
+PREFIX_ALBUM: str = "MPRE"
+PREFIX_PLAYLIST: str = "VL"
+
+HOST_MUSIC: str = "music.youtube.com"
+HOST_SHORT: str = "youtu.be"
+
+BASE_URL: str = "https://www.youtube.com"
+
+VIDEO_ID: Pattern[str] = re.compile(r"^[\w-]{11}$")
+PLAYLIST_ID: Pattern[str] = re.compile(r"^[\w-]{2,}$")
+HOST: Pattern[str] = re.compile(
+    r"^(?:(?:www|m|music)\.)?(?:youtube\.com|youtube-nocookie\.com)$"
+)
+SHORT_PATH: Pattern[str] = re.compile(r"^/(?P<id>[\w-]{11})(?:[/?#]|$)")
+
+# Reserved first path segments that are never vanity URLs
+RESERVED: FrozenSet[str] = frozenset(
+    (
+        "watch",
+        "playlist",
+        "results",
+        "feed",
+        "shorts",
+        "channel",
+        "c",
+        "user",
+        "browse",
+        "embed",
+        "live",
+        "v",
+        "e",
+        "search",
+        "explore",
+        "library",
+        "hashtag",
+        "premium",
+        "account",
+    )
+)
+
+PATHS: List[Tuple[Pattern[str], str]] = [
+    (re.compile(r"^/(?:embed|v|e|live)/(?P<id>[\w-]{11})(?:/|$)"), TYPE_VIDEO),
+    (re.compile(r"^/shorts/(?P<id>[\w-]{11})(?:/|$)"), TYPE_SHORT),
+    (re.compile(r"^/channel/(?P<id>UC[\w-]{22})(?:/|$)"), TYPE_CHANNEL),
+    (re.compile(r"^/browse/(?P<id>[\w-]+)(?:/|$)"), TYPE_BROWSE),
+    (re.compile(r"^/(?P<id>@[\w.\-%]+)(?:/|$)"), TYPE_HANDLE),
+    (re.compile(r"^/(?P<id>(?:c|user)/[\w.\-%]+)(?:/|$)"), TYPE_VANITY),
+    (re.compile(r"^/(?P<id>[\w.\-%]+)/?$"), TYPE_VANITY),
+]
+
+
+def browse(browse_id: str, /, *, music: bool = False) -> ResolvedURL:
+    if browse_id.startswith(PREFIX_CHANNEL):
+        return ResolvedURL(type=TYPE_CHANNEL, id=browse_id, music=music)
+    if browse_id.startswith(PREFIX_ALBUM):
+        return ResolvedURL(type=TYPE_ALBUM, id=browse_id, music=music)
+    if browse_id.startswith(PREFIX_PLAYLIST):
+        return ResolvedURL(
+            type=TYPE_PLAYLIST, id=browse_id[len(PREFIX_PLAYLIST) :], music=music
+        )
+
+    return ResolvedURL(type=TYPE_BROWSE, id=browse_id, music=music)
+
+
+def parse_url(url: str, /) -> Optional[ResolvedURL]:
+    url = url.strip()
+
+    if "://" not in url:
+        url = "https://" + url
+
+    parts: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+    host: str = (parts.hostname or "").lower()
+    path: str = parts.path or "/"
+    query: Dict[str, List[str]] = urllib.parse.parse_qs(parts.query)
+    video_id: Optional[str] = next(iter(query.get("v", ())), None)
+    playlist_id: Optional[str] = next(iter(query.get("list", ())), None)
+    music: bool = host == HOST_MUSIC
+
+    if playlist_id is not None and not PLAYLIST_ID.match(playlist_id):
+        playlist_id = None
+
+    if host == HOST_SHORT:
+        match: Optional[re.Match] = SHORT_PATH.match(path)
+
+        if match is None:
+            return None
+
+        return ResolvedURL(type=TYPE_VIDEO, id=match["id"], playlist_id=playlist_id)
+
+    if not HOST.match(host):
+        return None
+
+    if path.rstrip("/") == "/watch":
+        if video_id is not None and VIDEO_ID.match(video_id):
+            return ResolvedURL(
+                type=TYPE_VIDEO, id=video_id, playlist_id=playlist_id, music=music
+            )
+        if playlist_id is not None:
+            return ResolvedURL(type=TYPE_PLAYLIST, id=playlist_id, music=music)
+
+        return None
+
+    if path.rstrip("/") == "/playlist":
+        if playlist_id is None:
+            return None
+
+        return ResolvedURL(type=TYPE_PLAYLIST, id=playlist_id, music=music)
+
+    pattern: Pattern[str]
+    type: str
+    for pattern, type in PATHS:
+        match = pattern.match(path)
+
+        if match is None:
+            continue
+
+        id: str = urllib.parse.unquote(match["id"])
+
+        if type == TYPE_BROWSE:
+            return browse(id, music=music)
+        if type == TYPE_VANITY and id.lower() in RESERVED:
+            return None
+
+        return ResolvedURL(type=type, id=id, playlist_id=playlist_id, music=music)
+
+    return None
+
+
+def remote(resolved: ResolvedURL, /) -> str:
+    return f"{BASE_URL}/{urllib.parse.quote(resolved.id, safe='@/')}"
+
+
+def parse_endpoint(data: dict, /) -> Optional[ResolvedURL]:
+    endpoint: dict = data.get("endpoint") or {}
+    browse_id: Optional[str] = get(endpoint, "browseEndpoint", "browseId")
+
+    if browse_id is not None:
+        return browse(browse_id)
+
+    video_id: Optional[str] = get(endpoint, "watchEndpoint", "videoId")
+
+    if video_id is not None:
+        return ResolvedURL(
+            type=TYPE_VIDEO,
+            id=video_id,
+            playlist_id=get(endpoint, "watchEndpoint", "playlistId"),
+        )
+
+    video_id = get(endpoint, "reelWatchEndpoint", "videoId")
+
+    if video_id is not None:
+        return ResolvedURL(type=TYPE_SHORT, id=video_id)
+
+    return None
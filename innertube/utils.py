@@ -1,6 +1,9 @@
-from typing import Dict, Optional, TypeVar
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Optional, TypeVar, Union
 
-__all__ = ("filter",)
+__all__ = ("filter", "get", "LRUCache", "RateLimiter")
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -8,3 +11,104 @@ V = TypeVar("V")
 
 def filter(dictionary: Dict[K, Optional[V]], /) -> Dict[K, V]:
     return {key: value for key, value in dictionary.items() if value is not None}
+
+
+def get(data: Any, /, *path: Union[str, int]) -> Any:
+    key: Union[str, int]
+    for key in path:
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and isinstance(key, int):
+            data = data[key] if -len(data) <= key < len(data) else None
+        else:
+            return None
+
+    return data
+
+
+class LRUCache(Generic[K, V]):
+    maxsize: int
+
+    _data: "OrderedDict[K, V]"
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(maxsize={self.maxsize!r}, size={len(self)!r})"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, /) -> Optional[V]:
+        with self._lock:
+            if key not in self._data:
+                return None
+
+            self._data.move_to_end(key)
+
+            return self._data[key]
+
+    def set(self, key: K, value: V, /) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: K, /) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RateLimiter:
+    rate: float
+    burst: int
+
+    _tokens: float
+    _updated: float
+    _lock: threading.Lock
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("Precondition failed: Rate must be positive")
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rate={self.rate!r}, burst={self.burst!r})"
+
+    def reserve(self) -> float:
+        with self._lock:
+            now: float = time.monotonic()
+
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        delay: float = self.reserve()
+
+        if delay > 0:
+            time.sleep(delay)
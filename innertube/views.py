@@ -0,0 +1,482 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    overload,
+)
+
+from .models import TranscriptSegment
+from .utils import get
+
+__all__ = (
+    "View",
+    "PlayerView",
+    "SearchView",
+    "BrowseView",
+    "NextView",
+    "TranscriptView",
+)
+
+T = TypeVar("T")
+
+PANEL_IDENTIFIER_TRANSCRIPT: str = "engagement-panel-searchable-transcript"
+PANEL_IDENTIFIER_COMMENTS: str = "engagement-panel-comments-section"
+SECTION_IDENTIFIER_COMMENTS: str = "comment-item-section"
+
+
+class field(Generic[T]):
+    function: Callable[[Any], T]
+    slot: str
+
+    def __init__(self, function: Callable[[Any], T], /) -> None:
+        self.function = function
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = f"_{name}"
+
+    @overload
+    def __get__(self, instance: None, owner: Optional[type] = None) -> "field[T]":
+        ...
+
+    @overload
+    def __get__(self, instance: object, owner: Optional[type] = None) -> T:
+        ...
+
+    def __get__(self, instance: Optional[object], owner: Optional[type] = None):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value: T = self.function(instance)
+
+            setattr(instance, self.slot, value)
+
+            return value
+
+
+class ViewMeta(type):
+    def __new__(
+        mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any]
+    ) -> "ViewMeta":
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + tuple(
+            f"_{key}" for key, value in namespace.items() if isinstance(value, field)
+        )
+
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class View(metaclass=ViewMeta):
+    __slots__ = ("data",)
+
+    data: dict
+
+    def __init__(self, data: dict, /) -> None:
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(keys={list(self.data)!r})"
+
+
+def text(value: Any, /) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if "simpleText" in value:
+        return value["simpleText"]
+    if "runs" in value:
+        return "".join(run.get("text", "") for run in value["runs"])
+    if "content" in value:
+        return value["content"]
+
+    return None
+
+
+def integer(value: Any, /) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+
+    digits: str = "".join(character for character in str(value) if character.isdigit())
+
+    return int(digits) if digits else None
+
+
+def continuation(items: List[dict], /) -> Optional[str]:
+    item: dict
+    for item in reversed(items):
+        renderer: Optional[dict] = item.get("continuationItemRenderer")
+
+        if renderer is None:
+            continue
+
+        return get(
+            renderer, "continuationEndpoint", "continuationCommand", "token"
+        ) or get(
+            renderer,
+            "button",
+            "buttonRenderer",
+            "command",
+            "continuationCommand",
+            "token",
+        )
+
+    return None
+
+
+def continuation_items(actions: Optional[List[dict]], /) -> List[dict]:
+    items: List[dict] = []
+
+    action: dict
+    for action in actions or ():
+        command: dict
+        for command in action.values():
+            if isinstance(command, dict) and "continuationItems" in command:
+                items.extend(command["continuationItems"])
+
+    return items
+
+
+class PlayerView(View):
+    @field
+    def playability_status(self) -> Optional[str]:
+        return get(self.data, "playabilityStatus", "status")
+
+    @field
+    def details(self) -> dict:
+        return self.data.get("videoDetails") or {}
+
+    @field
+    def video_id(self) -> Optional[str]:
+        return self.details.get("videoId")
+
+    @field
+    def title(self) -> Optional[str]:
+        return self.details.get("title")
+
+    @field
+    def author(self) -> Optional[str]:
+        return self.details.get("author")
+
+    @field
+    def channel_id(self) -> Optional[str]:
+        return self.details.get("channelId")
+
+    @field
+    def description(self) -> Optional[str]:
+        return self.details.get("shortDescription")
+
+    @field
+    def length_seconds(self) -> Optional[int]:
+        return integer(self.details.get("lengthSeconds"))
+
+    @field
+    def view_count(self) -> Optional[int]:
+        return integer(self.details.get("viewCount"))
+
+    @field
+    def keywords(self) -> List[str]:
+        return self.details.get("keywords") or []
+
+    @field
+    def is_live(self) -> bool:
+        return bool(self.details.get("isLiveContent"))
+
+    @field
+    def thumbnails(self) -> List[dict]:
+        return get(self.details, "thumbnail", "thumbnails") or []
+
+    @field
+    def streaming_data(self) -> dict:
+        return self.data.get("streamingData") or {}
+
+    @field
+    def formats(self) -> List[dict]:
+        return self.streaming_data.get("formats") or []
+
+    @field
+    def adaptive_formats(self) -> List[dict]:
+        return self.streaming_data.get("adaptiveFormats") or []
+
+    @field
+    def expires_in_seconds(self) -> Optional[int]:
+        return integer(self.streaming_data.get("expiresInSeconds"))
+
+
+class SearchView(View):
+    @field
+    def estimated_results(self) -> Optional[int]:
+        return integer(self.data.get("estimatedResults"))
+
+    @field
+    def contents(self) -> List[dict]:
+        if "onResponseReceivedCommands" in self.data:
+            return continuation_items(self.data["onResponseReceivedCommands"])
+
+        return (
+            get(
+                self.data,
+                "contents",
+                "twoColumnSearchResultsRenderer",
+                "primaryContents",
+                "sectionListRenderer",
+                "contents",
+            )
+            or get(
+                self.data,
+                "contents",
+                "tabbedSearchResultsRenderer",
+                "tabs",
+                0,
+                "tabRenderer",
+                "content",
+                "sectionListRenderer",
+                "contents",
+            )
+            or get(self.data, "contents", "sectionListRenderer", "contents")
+            or []
+        )
+
+    @field
+    def items(self) -> List[dict]:
+        items: List[dict] = []
+
+        section: dict
+        for section in self.contents:
+            if "itemSectionRenderer" in section:
+                items.extend(section["itemSectionRenderer"].get("contents", ()))
+            elif "musicShelfRenderer" in section:
+                items.extend(section["musicShelfRenderer"].get("contents", ()))
+
+        return items
+
+    @field
+    def continuation(self) -> Optional[str]:
+        return continuation(self.contents)
+
+    def renderers(self, name: str, /) -> List[dict]:
+        return [item[name] for item in self.items if name in item]
+
+
+class BrowseView(View):
+    @field
+    def header(self) -> dict:
+        return self.data.get("header") or {}
+
+    @field
+    def metadata(self) -> dict:
+        return get(self.data, "metadata", "channelMetadataRenderer") or {}
+
+    @field
+    def tabs(self) -> List[dict]:
+        tabs: List[dict] = (
+            get(self.data, "contents", "twoColumnBrowseResultsRenderer", "tabs")
+            or get(self.data, "contents", "singleColumnBrowseResultsRenderer", "tabs")
+            or []
+        )
+
+        return [tab["tabRenderer"] for tab in tabs if "tabRenderer" in tab]
+
+    @field
+    def selected_tab(self) -> Optional[dict]:
+        tab: dict
+        for tab in self.tabs:
+            if tab.get("selected"):
+                return tab
+
+        return self.tabs[0] if self.tabs else None
+
+    @field
+    def contents(self) -> List[dict]:
+        if "onResponseReceivedActions" in self.data:
+            return continuation_items(self.data["onResponseReceivedActions"])
+
+        content: dict = get(self.selected_tab, "content") or {}
+
+        return (
+            get(content, "richGridRenderer", "contents")
+            or get(content, "sectionListRenderer", "contents")
+            or []
+        )
+
+    @field
+    def items(self) -> List[dict]:
+        items: List[dict] = []
+
+        item: dict
+        for item in self.contents:
+            if "richItemRenderer" in item:
+                items.append(item["richItemRenderer"].get("content", {}))
+            elif "itemSectionRenderer" in item:
+                section: dict
+                for section in item["itemSectionRenderer"].get("contents", ()):
+                    items.extend(
+                        get(section, "playlistVideoListRenderer", "contents")
+                        or get(section, "gridRenderer", "items")
+                        or (section,)
+                    )
+            else:
+                items.append(item)
+
+        return items
+
+    @field
+    def continuation(self) -> Optional[str]:
+        return continuation(self.items)
+
+    def tab(self, title: str, /) -> Optional[dict]:
+        tab: dict
+        for tab in self.tabs:
+            if tab.get("title") == title:
+                return tab
+
+        return None
+
+    def renderers(self, name: str, /) -> List[dict]:
+        return [item[name] for item in self.items if name in item]
+
+
+class NextView(View):
+    @field
+    def video_id(self) -> Optional[str]:
+        return get(self.data, "currentVideoEndpoint", "watchEndpoint", "videoId")
+
+    @field
+    def engagement_panels(self) -> Dict[str, dict]:
+        panels: Dict[str, dict] = {}
+
+        panel: dict
+        for panel in self.data.get("engagementPanels", ()):
+            renderer: dict = panel.get("engagementPanelSectionListRenderer", {})
+            identifier: Optional[str] = renderer.get("panelIdentifier") or renderer.get(
+                "targetId"
+            )
+
+            if identifier is not None:
+                panels[identifier] = renderer
+
+        return panels
+
+    @field
+    def transcript_params(self) -> Optional[str]:
+        return get(
+            self.engagement_panels.get(PANEL_IDENTIFIER_TRANSCRIPT),
+            "content",
+            "continuationItemRenderer",
+            "continuationEndpoint",
+            "getTranscriptEndpoint",
+            "params",
+        )
+
+    @field
+    def comment_sorts(self) -> Dict[str, str]:
+        menu_items: List[dict] = (
+            get(
+                self.engagement_panels.get(PANEL_IDENTIFIER_COMMENTS),
+                "header",
+                "engagementPanelTitleHeaderRenderer",
+                "menu",
+                "sortFilterSubMenuRenderer",
+                "subMenuItems",
+            )
+            or []
+        )
+
+        return {
+            item["title"]: token
+            for item in menu_items
+            if (token := get(item, "serviceEndpoint", "continuationCommand", "token"))
+        }
+
+    @field
+    def results(self) -> List[dict]:
+        return (
+            get(
+                self.data,
+                "contents",
+                "twoColumnWatchNextResults",
+                "results",
+                "results",
+                "contents",
+            )
+            or []
+        )
+
+    @field
+    def comments_continuation(self) -> Optional[str]:
+        item: dict
+        for item in self.results:
+            section: dict = item.get("itemSectionRenderer", {})
+
+            if section.get("sectionIdentifier") == SECTION_IDENTIFIER_COMMENTS:
+                return continuation(section.get("contents", []))
+
+        return None
+
+    @field
+    def related(self) -> List[dict]:
+        return (
+            get(
+                self.data,
+                "contents",
+                "twoColumnWatchNextResults",
+                "secondaryResults",
+                "secondaryResults",
+                "results",
+            )
+            or []
+        )
+
+    @field
+    def continuation_items(self) -> List[dict]:
+        return continuation_items(self.data.get("onResponseReceivedEndpoints"))
+
+    @field
+    def continuation(self) -> Optional[str]:
+        return continuation(self.continuation_items)
+
+
+class TranscriptView(View):
+    @field
+    def renderers(self) -> List[dict]:
+        segments: List[dict] = (
+            get(
+                self.data,
+                "actions",
+                0,
+                "updateEngagementPanelAction",
+                "content",
+                "transcriptRenderer",
+                "content",
+                "transcriptSearchPanelRenderer",
+                "body",
+                "transcriptSegmentListRenderer",
+                "initialSegments",
+            )
+            or []
+        )
+
+        return [
+            segment["transcriptSegmentRenderer"]
+            for segment in segments
+            if "transcriptSegmentRenderer" in segment
+        ]
+
+    @field
+    def segments(self) -> List[TranscriptSegment]:
+        return [
+            TranscriptSegment(
+                start_ms=integer(renderer.get("startMs")) or 0,
+                end_ms=integer(renderer.get("endMs")) or 0,
+                text=text(renderer.get("snippet")) or "",
+            )
+            for renderer in self.renderers
+        ]
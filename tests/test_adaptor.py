@@ -1,3 +1,5 @@
+import asyncio
+
 import flask
 import httpx
 import innertube
@@ -72,3 +74,83 @@ def test_error(adaptor: innertube.InnerTubeAdaptor) -> None:
 def test_bad_response(adaptor: innertube.InnerTubeAdaptor) -> None:
     with pytest.raises(ResponseError):
         adaptor.dispatch("/bad")
+
+
+def async_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/error":
+        return httpx.Response(
+            200,
+            json={"error": {"code": 400, "message": "Bad", "status": "INVALID"}},
+        )
+    if request.url.path == "/bad":
+        return httpx.Response(200, text="foo")
+
+    return httpx.Response(
+        200,
+        json={
+            "responseContext": {"visitorData": "visitor"},
+            "contents": {"foo": "x" * 1024},
+            "other": "bar",
+        },
+    )
+
+
+def async_adaptor(**kwargs) -> innertube.AsyncInnerTubeAdaptor:
+    return innertube.AsyncInnerTubeAdaptor(
+        context=innertube.ClientContext("FAKE_CLIENT", "1.0"),
+        session=httpx.AsyncClient(
+            transport=httpx.MockTransport(async_handler), base_url="https://foo.bar/"
+        ),
+        **kwargs,
+    )
+
+
+def project_contents(data: dict) -> dict:
+    return {"contents": data["contents"]}
+
+
+def test_async_good_response() -> None:
+    adaptor: innertube.AsyncInnerTubeAdaptor = async_adaptor()
+
+    data: dict = asyncio.run(adaptor.dispatch("/good"))
+
+    assert data["other"] == "bar"
+    assert adaptor.visitor_data == "visitor"
+    assert "X-Goog-Visitor-Id" not in adaptor.session.headers
+    assert adaptor._build_request("/good").headers["X-Goog-Visitor-Id"] == "visitor"
+    assert adaptor.stats.inline == 1
+    assert adaptor.stats.offloaded == 0
+
+
+def test_async_offloaded_decode() -> None:
+    adaptor: innertube.AsyncInnerTubeAdaptor = async_adaptor(
+        decode_threshold=1024, project=project_contents
+    )
+
+    data: dict = asyncio.run(adaptor.dispatch("/good"))
+
+    assert data == {
+        "contents": {"foo": "x" * 1024},
+        "responseContext": {"visitorData": "visitor"},
+    }
+    assert adaptor.stats.inline == 0
+    assert adaptor.stats.offloaded == 1
+    assert adaptor.stats.offloaded_bytes > 1024
+    assert adaptor.stats.offloaded_seconds > 0
+
+    adaptor = async_adaptor(decode_threshold=1024 * 1024, project=project_contents)
+
+    # Bodies decoded inline are projected the same way
+    assert asyncio.run(adaptor.dispatch("/good")) == data
+    assert adaptor.stats.inline == 1
+    assert adaptor.stats.offloaded == 0
+
+
+def test_async_error() -> None:
+    with pytest.raises(RequestError):
+        asyncio.run(async_adaptor().dispatch("/error"))
+
+
+def test_async_bad_response() -> None:
+    with pytest.raises(ResponseError):
+        asyncio.run(async_adaptor().dispatch("/bad"))
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("cachetools")
+pytest.importorskip("pydantic_settings")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.v1.endpoints.search import combined_search  # noqa: E402
+from app.api.v1.schemas.common import APIResponse  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.cache import cache_service  # noqa: E402
+from app.services.container import ServiceContainer, get_services  # noqa: E402
+from app.services.music import MusicService  # noqa: E402
+from app.services.youtube import YouTubeService  # noqa: E402
+
+
+class SearchClient:
+    """An InnerTube client whose search fails, hangs, or finds nothing"""
+
+    client_type: str
+    locale: str
+    delay: float
+    error: Optional[Exception]
+
+    def __init__(self, delay: float = 0.0, error: Optional[Exception] = None) -> None:
+        self.client_type = "WEB"
+        self.locale = ""
+        self.delay = delay
+        self.error = error
+
+    def search(self, *args: Any) -> dict:
+        time.sleep(self.delay)
+
+        if self.error is not None:
+            raise self.error
+
+        return {"responseContext": {}, "contents": {}}
+
+
+def services(youtube: SearchClient, music: SearchClient) -> Any:
+    return SimpleNamespace(
+        youtube=YouTubeService(youtube, SearchClient()),  # type: ignore[arg-type]
+        music=MusicService(music, SearchClient()),  # type: ignore[arg-type]
+    )
+
+
+def combined(youtube: SearchClient, music: SearchClient) -> Any:
+    container: Any = services(youtube, music)
+    app.dependency_overrides[get_services] = lambda: container
+
+    return TestClient(app).get("/api/v1/search/combined", params={"q": "foo"})
+
+
+@pytest.fixture(autouse=True)
+def clear() -> Iterator[None]:
+    asyncio.run(cache_service.clear())
+    yield
+    asyncio.run(cache_service.clear())
+    app.dependency_overrides.clear()
+
+
+def test_combined_search_partial() -> None:
+    response: Any = combined(SearchClient(), SearchClient(error=ValueError("boom")))
+
+    assert response.status_code == 200
+    assert response.json()["data"]["youtube"]["results"] == []
+    assert response.json()["data"]["music"] is None
+    assert response.json()["data"]["partial"] is True
+
+
+def test_combined_search_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.services.base.settings.UPSTREAM_TIMEOUT", 0.05)
+
+    async def run() -> Tuple[APIResponse, float]:
+        start: float = time.monotonic()
+        response: APIResponse = await combined_search(
+            q="foo",
+            limit=10,
+            services=services(SearchClient(delay=1.0), SearchClient()),
+        )
+
+        return response, time.monotonic() - start
+
+    response: APIResponse
+    elapsed: float
+    response, elapsed = asyncio.run(run())
+
+    # The slow source is dropped instead of holding up the response
+    assert elapsed < 0.5
+    assert response.data is not None
+    assert response.data["youtube"] is None
+    assert response.data["music"]["results"] == []
+    assert response.data["partial"] is True
+
+
+def test_combined_search_failed() -> None:
+    error: ValueError = ValueError("boom")
+
+    response: Any = combined(SearchClient(error=error), SearchClient(error=error))
+
+    assert response.status_code == 502
+    assert response.json()["error"]["code"] == "EXTERNAL_API_ERROR"
+
+
+def test_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+    searches: List[Any] = []
+
+    with TestClient(app) as client:
+        services: ServiceContainer = app.state.services
+        sessions: List[Any] = [
+            shared._client.adaptor.session for shared in services.clients.values()
+        ]
+
+        def search(service: Any) -> Any:
+            async def run(*args: Any) -> dict:
+                searches.append(service)
+
+                return {"results": [], "total": 0}
+
+            return run
+
+        monkeypatch.setattr(services.youtube, "search", search(services.youtube))
+        monkeypatch.setattr(services.music, "search", search(services.music))
+
+        for path in ("youtube/search", "music/search", "search/combined"):
+            assert client.get(f"/api/v1/{path}", params={"q": "foo"}).status_code == 200
+
+        # Every route uses the container's services, which share clients by type
+        assert searches == [
+            services.youtube,
+            services.music,
+            services.youtube,
+            services.music,
+        ]
+        assert services.youtube.android_client is services.stream.client
+        assert not any(session.is_closed for session in sessions)
+
+    # Shutdown closes every client's connection pool
+    assert len(sessions) == 5
+    assert all(session.is_closed for session in sessions)
+    assert services.clients == {}
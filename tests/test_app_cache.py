@@ -0,0 +1,642 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("cachetools")
+pytest.importorskip("pydantic_settings")
+
+from app.config import Settings  # noqa: E402
+from app.core.exceptions import ExternalAPIError  # noqa: E402
+from app.services.base import BaseService, _inflight  # noqa: E402
+from app.services.cache import (  # noqa: E402
+    TLRU,
+    Blob,
+    CacheService,
+    cache_service,
+    decode,
+    dumps,
+    encode,
+    namespace,
+)
+from app.services.tinylfu import FrequencySketch, WTinyLFUCache  # noqa: E402
+
+
+class Clock:
+    now: float
+
+    def __init__(self) -> None:
+        self.now = time.monotonic()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the cache"""
+
+    data: Dict[str, Tuple[bytes, float]]
+    failing: bool
+    commands: int
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.failing = False
+        self.commands = 0
+
+    def _check(self) -> None:
+        self.commands += 1
+
+        if self.failing:
+            raise ConnectionError("Connection refused")
+
+    async def set(self, key: str, value: bytes, ex: int) -> None:
+        self._check()
+        self.data[key] = (value, time.monotonic() + ex)
+
+    async def delete(self, key: str) -> None:
+        self._check()
+        self.data.pop(key, None)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    redis: FakeRedis
+    commands: List[Tuple[str, str]]
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    def get(self, key: str) -> None:
+        self.commands.append(("get", key))
+
+    def pttl(self, key: str) -> None:
+        self.commands.append(("pttl", key))
+
+    async def execute(self) -> List[Any]:
+        self.redis._check()
+
+        results: List[Any] = []
+        command: str
+        key: str
+        for command, key in self.commands:
+            entry: Optional[Tuple[bytes, float]] = self.redis.data.get(key)
+
+            if command == "get":
+                results.append(entry[0] if entry else None)
+            else:
+                results.append(
+                    int((entry[1] - time.monotonic()) * 1000) if entry else -2
+                )
+
+        return results
+
+
+@pytest.fixture
+def cache() -> Iterator[CacheService]:
+    asyncio.run(cache_service.clear())
+    yield cache_service
+    asyncio.run(cache_service.clear())
+
+
+@pytest.fixture
+def clock(cache: CacheService) -> Iterator[Clock]:
+    clock: Clock = Clock()
+    cache._clock = clock
+    yield clock
+    cache._clock = time.monotonic
+
+
+@pytest.fixture
+def redis(cache: CacheService) -> Iterator[FakeRedis]:
+    redis: FakeRedis = FakeRedis()
+    cache._redis = redis
+    yield redis
+    cache._redis = None
+    cache._l2_retry_at = 0.0
+
+
+def test_namespace() -> None:
+    assert namespace("yt:search:query:None:20") == "yt:search"
+    assert namespace("raw:next:WEB:a:") == "raw:next"
+    assert namespace("music:home") == "music:home"
+
+
+def test_ttl_policy(cache: CacheService) -> None:
+    assert cache.ttl_for("stream:all:a") == 180
+    assert cache.ttl_for("music:charts:US") == 3600
+    # Prefix entries cover every namespace under them
+    assert cache.ttl_for("raw:player:WEB:a:") == 300
+    assert cache.ttl_for("yt:video:a") == 300
+
+
+def test_per_entry_ttl(cache: CacheService, clock: Clock) -> None:
+    async def run() -> None:
+        await cache.set("stream:all:a", {"streams": []})
+        await cache.set("music:charts:US", {"charts": []})
+        await cache.set("yt:video:a", {"title": "A"}, ttl=1000)
+
+        clock.now += 200
+
+        assert await cache.get("stream:all:a") is None
+        assert await cache.get("music:charts:US") == {"charts": []}
+        assert await cache.get("yt:video:a") == {"title": "A"}
+
+        clock.now += 3500
+
+        assert await cache.get("music:charts:US") is None
+        assert await cache.get("yt:video:a") is None
+
+    asyncio.run(run())
+
+
+def test_stats(cache: CacheService) -> None:
+    async def run() -> None:
+        await cache.set("yt:search:a", {})
+        await cache.set("yt:search:b", {})
+        await cache.get("yt:search:a")
+        await cache.get("yt:search:c")
+        await cache.get("stream:all:a")
+
+    asyncio.run(run())
+
+    stats: Dict[str, Any] = cache.stats()
+
+    assert stats["size"] == 2
+    assert stats["bytes"] == 4
+    assert stats["l2"] == {"enabled": False, "available": False, "errors": 0}
+    assert stats["namespaces"]["yt:search"] == {
+        "size": 2,
+        "bytes": 4,
+        "compression_ratio": 1.0,
+        "too_large": 0,
+        "unserialisable": 0,
+        "ttl": 300,
+        "stale_while_revalidate": 0,
+        "stale_if_error": 3600,
+        "hits": 1,
+        "l2_hits": 0,
+        "misses": 1,
+        "sets": 2,
+        "stale_serves": 0,
+        "stale_on_error": 0,
+        "refreshes": 0,
+        "refresh_errors": 0,
+        "early_refreshes": 0,
+        "coalesced": 0,
+        "fetch_time": None,
+        "hit_rate": 0.5,
+    }
+    assert stats["namespaces"]["stream:all"]["misses"] == 1
+    assert stats["namespaces"]["stream:all"]["ttl"] == 180
+
+
+@pytest.fixture
+def budget(cache: CacheService) -> Iterator[None]:
+    l1: Any = cache._cache
+    cache._cache = cache._l1(100, "lru")
+    yield
+    cache._cache = l1
+
+
+def test_compression(cache: CacheService) -> None:
+    value: Dict[str, Any] = {
+        "raw": [{"title": "Song", "views": i} for i in range(2000)]
+    }
+
+    asyncio.run(cache.set("music:home", value))
+
+    assert isinstance(cache._cache["music:home"][1], Blob)
+    assert asyncio.run(cache.get("music:home")) == value
+
+    stats: Dict[str, Any] = cache.stats()["namespaces"]["music:home"]
+
+    assert stats["bytes"] < len(dumps(value)) / 10
+    assert stats["compression_ratio"] > 10
+
+    # Small values are kept as they are
+    asyncio.run(cache.set("music:lyrics:a", {"lyrics": "La"}))
+
+    assert cache._cache["music:lyrics:a"][1] == {"lyrics": "La"}
+
+
+def test_decode_off_loop(cache: CacheService, monkeypatch: pytest.MonkeyPatch) -> None:
+    threaded: List[int] = []
+
+    async def to_thread(func: Any, data: Any) -> Any:
+        if func is decode:
+            threaded.append(len(data))
+
+        return func(data)
+
+    monkeypatch.setattr("app.services.cache.asyncio.to_thread", to_thread)
+    monkeypatch.setattr("app.services.cache.settings.CACHE_THREAD_BYTES", 8192)
+    value: Dict[str, Any] = {
+        "raw": [{"title": f"Song {i}", "views": i} for i in range(20000)]
+    }
+
+    async def run() -> List[Optional[Any]]:
+        await cache.set("music:home", value)
+        await cache.set("music:charts", {"raw": value["raw"][:2000]})
+
+        return [await cache.get("music:home"), await cache.get("music:charts")]
+
+    assert asyncio.run(run()) == [value, {"raw": value["raw"][:2000]}]
+    # Only the large compressed entry is decoded in a worker thread
+    assert len(threaded) == 1
+    assert threaded[0] >= 8192
+
+
+def test_encode_off_loop(cache: CacheService, monkeypatch: pytest.MonkeyPatch) -> None:
+    threaded: List[Any] = []
+
+    async def to_thread(func: Any, value: Any) -> Any:
+        if func is encode:
+            threaded.append(value)
+
+        return func(value)
+
+    monkeypatch.setattr("app.services.cache.asyncio.to_thread", to_thread)
+    monkeypatch.setattr("app.services.cache.settings.CACHE_THREAD_BYTES", 8192)
+    large: Dict[str, Any] = {"raw": [{"title": f"Song {i}"} for i in range(2000)]}
+    small: Dict[str, Any] = {"title": "Song"}
+
+    async def run() -> None:
+        for _ in range(2):
+            await cache.set("music:home", large)
+            await cache.set("music:song", small)
+
+    asyncio.run(run())
+
+    # Namespaces not yet seen, then those that last encoded large, go to a thread
+    assert threaded == [large, small, large]
+
+
+def test_deprecated_max_size() -> None:
+    # Existing deployments' entry-count limit still loads, but is ignored
+    with pytest.warns(FutureWarning, match="CACHE_MAX_BYTES"):
+        settings: Settings = Settings(CACHE_MAX_SIZE=1000)
+
+    assert settings.CACHE_MAX_BYTES == Settings().CACHE_MAX_BYTES
+
+
+@pytest.mark.usefixtures("budget")
+def test_byte_budget(cache: CacheService) -> None:
+    async def run() -> None:
+        await cache.set("yt:video:a", {"title": "A" * 30})
+        await cache.set("yt:video:b", {"title": "B" * 30})
+        await cache.get("yt:video:a")
+        # Over budget: the least recently used entry goes
+        await cache.set("yt:video:c", {"title": "C" * 30})
+        await cache.set("yt:video:d", {"title": "D" * 200})
+
+    asyncio.run(run())
+
+    assert list(cache._cache) == ["yt:video:a", "yt:video:c"]
+    assert cache.stats()["bytes"] == 84
+    assert cache.stats()["namespaces"]["yt:video"]["too_large"] == 1
+
+    # Values that aren't JSON-serialisable can't be sized, so aren't cached
+    asyncio.run(cache.set("yt:video:e", {"title": object()}))
+
+    assert "yt:video:e" not in cache._cache
+    assert cache.stats()["namespaces"]["yt:video"]["unserialisable"] == 1
+
+
+def test_l2(cache: CacheService, redis: FakeRedis) -> None:
+    async def run() -> Dict[str, Optional[Any]]:
+        await cache.set("yt:video:a", {"title": "Ä"})
+        await cache.set("yt:video:b", {"title": "B"})
+        # Another process: nothing in its own L1
+        cache._cache.clear()
+
+        return await cache.get_many(["yt:video:a", "yt:video:b", "yt:video:c"])
+
+    assert asyncio.run(run()) == {
+        "yt:video:a": {"title": "Ä"},
+        "yt:video:b": {"title": "B"},
+        "yt:video:c": None,
+    }
+    assert redis.data["cache:yt:video:a"][0] == '{"title":"Ä"}'.encode()
+    # Two sets, then one pipelined round trip for all three keys
+    assert redis.commands == 3
+    # L2 hits are copied into L1, expiring with the shared entry (TTL + stale window)
+    assert cache._cache["yt:video:a"][0] == pytest.approx(3900, abs=1)
+    assert cache.stats()["namespaces"]["yt:video"]["l2_hits"] == 2
+
+
+def test_l2_unavailable(cache: CacheService, redis: FakeRedis) -> None:
+    redis.failing = True
+
+    async def run() -> Optional[Any]:
+        await cache.set("yt:video:a", {"title": "A"})
+
+        return await cache.get("yt:video:a")
+
+    assert asyncio.run(run()) == {"title": "A"}
+    # Redis isn't retried until CACHE_REDIS_RETRY has passed
+    assert redis.commands == 1
+    assert cache.stats()["l2"] == {"enabled": True, "available": False, "errors": 1}
+
+    redis.failing = False
+    cache._l2_retry_at = 0.0
+
+    asyncio.run(cache.set("yt:video:b", {"title": "B"}))
+
+    assert "cache:yt:video:b" in redis.data
+
+
+class Service(BaseService):
+    calls: int
+    failing: bool
+    batches: List[List[str]]
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.calls = 0
+        self.failing = False
+        self.batches = []
+
+    async def fetch(self) -> Dict[str, Any]:
+        if self.failing:
+            raise ExternalAPIError("YouTube", "Unavailable")
+
+        self.calls += 1
+        await asyncio.sleep(0.01)
+
+        return {"version": self.calls}
+
+    async def get_home(self) -> Dict[str, Any]:
+        return await self._cached("music:home", self.fetch)
+
+    async def fetch_songs(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        self.batches.append(keys)
+
+        return {key: await self.fetch() for key in keys}
+
+    async def get_songs(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await self._cached_many(
+            [f"music:queue_song:{video_id}" for video_id in video_ids],
+            self.fetch_songs,
+        )
+
+
+def test_stale_while_revalidate(cache: CacheService, clock: Clock) -> None:
+    service: Service = Service()
+
+    async def run() -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = [await service.get_home()]
+
+        # Past the 600s TTL but inside the 600s revalidation window
+        clock.now += 900
+        results.append(await service.get_home())
+        results.append(await service.get_home())
+        await asyncio.gather(*_inflight.values())
+        results.append(await service.get_home())
+
+        return results
+
+    assert asyncio.run(run()) == [
+        {"version": 1},
+        {"version": 1},
+        {"version": 1},
+        {"version": 2},
+    ]
+    # Both stale serves shared one background refresh
+    assert service.calls == 2
+    assert cache.stats()["namespaces"]["music:home"]["stale_serves"] == 2
+    assert cache.stats()["namespaces"]["music:home"]["refreshes"] == 1
+
+
+def test_stale_if_error(cache: CacheService, clock: Clock) -> None:
+    service: Service = Service()
+
+    async def run() -> Dict[str, Any]:
+        await service.get_home()
+
+        # Past TTL and revalidation window, inside the 3600s error window
+        service.failing = True
+        clock.now += 2000
+
+        return await service.get_home()
+
+    assert asyncio.run(run()) == {"version": 1}
+    assert cache.stats()["namespaces"]["music:home"]["stale_on_error"] == 1
+
+    clock.now += 4000
+
+    with pytest.raises(ExternalAPIError):
+        asyncio.run(service.get_home())
+
+
+def test_cached_entry(cache: CacheService) -> None:
+    service: Service = Service()
+
+    async def run() -> List[Tuple[Dict[str, Any], bool]]:
+        fetched: Tuple[Dict[str, Any], bool] = await service._cached_entry(
+            "music:home", service.fetch
+        )
+
+        return [fetched, await service._cached_entry("music:home", service.fetch)]
+
+    # The flag says whether the value came from cache
+    assert asyncio.run(run()) == [({"version": 1}, False), ({"version": 1}, True)]
+
+
+def test_cached_many_stale_if_error(cache: CacheService, clock: Clock) -> None:
+    service: Service = Service()
+
+    assert asyncio.run(service.get_songs(["a", "b"])) == {
+        "music:queue_song:a": {"version": 1},
+        "music:queue_song:b": {"version": 2},
+    }
+    assert asyncio.run(service.get_songs(["a", "c"])) == {
+        "music:queue_song:a": {"version": 1},
+        "music:queue_song:c": {"version": 3},
+    }
+
+    # Past the 300s TTL, inside the "music" 3600s error window
+    service.failing = True
+    clock.now += 1000
+
+    assert asyncio.run(service.get_songs(["a", "d"])) == {
+        "music:queue_song:a": {"version": 1}
+    }
+    assert cache.stats()["namespaces"]["music:queue_song"]["stale_on_error"] == 1
+
+    with pytest.raises(ExternalAPIError):
+        asyncio.run(service.get_songs(["d"]))
+
+
+def test_singleflight(cache: CacheService) -> None:
+    service: Service = Service()
+
+    async def run() -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(service.get_home() for _ in range(5)))
+
+    assert asyncio.run(run()) == [{"version": 1}] * 5
+    assert service.calls == 1
+    assert cache.stats()["namespaces"]["music:home"]["coalesced"] == 4
+
+
+def test_cached_many_singleflight(
+    cache: CacheService, clock: Clock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service: Service = Service()
+
+    async def run() -> List[Dict[str, Dict[str, Any]]]:
+        return await asyncio.gather(
+            service.get_songs(["a", "b"]), service.get_songs(["b", "c"])
+        )
+
+    first, second = asyncio.run(run())
+
+    # "b" joined the fetch already in flight rather than being fetched twice
+    assert service.batches == [
+        ["music:queue_song:a", "music:queue_song:b"],
+        ["music:queue_song:c"],
+    ]
+    assert first["music:queue_song:b"] == second["music:queue_song:b"]
+    assert cache.stats()["namespaces"]["music:queue_song"]["coalesced"] == 1
+
+    async def refresh() -> Dict[str, Dict[str, Any]]:
+        clock.now += 295
+        cache._fetch_times["music:queue_song"] = 1.0
+        monkeypatch.setattr("random.random", lambda: 0.995)
+        # Fresh, so served as is while refreshed early in one batch
+        values: Dict[str, Dict[str, Any]] = await service.get_songs(["a", "b"])
+        await asyncio.gather(*_inflight.values())
+
+        return values
+
+    assert asyncio.run(refresh()) == first
+    assert service.batches[-1] == ["music:queue_song:a", "music:queue_song:b"]
+    assert cache.stats()["namespaces"]["music:queue_song"]["early_refreshes"] == 2
+    assert cache.stats()["namespaces"]["music:queue_song"]["refreshes"] == 2
+
+
+def test_early_expiry(
+    cache: CacheService, clock: Clock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service: Service = Service()
+    asyncio.run(service.get_home())
+
+    # With a 1s fetch, an entry 5s from expiring is refreshed early on a 1% draw
+    cache._fetch_times["music:home"] = 1.0
+    monkeypatch.setattr("random.random", lambda: 0.995)
+
+    assert cache.expires_early("music:home", 5)
+    assert not cache.expires_early("music:home", 10)
+
+    monkeypatch.setattr("random.random", lambda: 0.0)
+
+    assert not cache.expires_early("music:home", 5)
+
+    async def run() -> Dict[str, Any]:
+        clock.now += 595
+        monkeypatch.setattr("random.random", lambda: 0.995)
+        # Still fresh, so served as is while it refreshes
+        value: Dict[str, Any] = await service.get_home()
+        await asyncio.gather(*_inflight.values())
+
+        return value
+
+    assert asyncio.run(run()) == {"version": 1}
+    assert service.calls == 2
+    assert cache.stats()["namespaces"]["music:home"]["early_refreshes"] == 1
+
+
+def test_l2_compressed(cache: CacheService, redis: FakeRedis) -> None:
+    value: Dict[str, Any] = {
+        "raw": [{"title": "Song", "views": i} for i in range(2000)]
+    }
+
+    async def run() -> Optional[Any]:
+        await cache.set("music:home", value)
+        cache._cache.clear()
+
+        return await cache.get("music:home")
+
+    assert asyncio.run(run()) == value
+    # Redis holds the compressed blob, and L1 keeps it compressed too
+    assert len(redis.data["cache:music:home"][0]) < len(dumps(value)) / 10
+    assert isinstance(cache._cache["music:home"][1], Blob)
+
+
+def test_frequency_sketch() -> None:
+    sketch: FrequencySketch = FrequencySketch(100)
+
+    assert sketch.width == 128
+
+    for _ in range(20):
+        sketch.increment("hot")
+    sketch.increment("warm")
+
+    assert sketch.frequency("hot") == 15
+    assert sketch.frequency("warm") >= 1
+    assert sketch.frequency("cold") == 0
+
+    # Counts halve every 10 * width additions, so old popularity fades
+    for i in range(10 * 128):
+        sketch.increment(i)
+
+    assert sketch.frequency("hot") == 7
+
+
+@pytest.mark.parametrize("policy, survivors", [(TLRU, 0), (WTinyLFUCache, 8)])
+def test_scan_resistance(policy: Any, survivors: int) -> None:
+    cache: Any = policy(maxsize=10, ttu=lambda key, value, now: now + 60)
+
+    def read(key: str) -> None:
+        if cache.get(key) is None:
+            cache[key] = key
+
+    for _ in range(5):
+        for i in range(8):
+            read(f"hot:{i}")
+    # A crawler reads a run of one-off keys
+    for i in range(100):
+        read(f"scan:{i}")
+
+    assert sum(f"hot:{i}" in cache for i in range(8)) == survivors
+
+
+def test_tinylfu_expiry_and_sizes(clock: Clock) -> None:
+    cache: WTinyLFUCache = WTinyLFUCache(
+        maxsize=100,
+        ttu=lambda key, value, now: now + value,
+        timer=clock,
+        getsizeof=lambda value: value,
+        window=0.1,
+    )
+
+    cache["a"] = 30
+    cache["b"] = 60
+
+    assert cache.currsize == 90
+    assert cache.get("a") == 30
+
+    clock.now += 45
+
+    assert "a" not in cache
+    assert cache.get("b") == 60
+
+    cache.expire()
+
+    assert cache.currsize == 60
+    assert len(cache) == 1
+
+    # Too large for the main segment, so it could never stay cached
+    with pytest.raises(ValueError):
+        cache["c"] = 95
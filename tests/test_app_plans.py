@@ -0,0 +1,257 @@
+import asyncio
+from typing import Any, Dict, Iterator, List, Set, Tuple, Type
+
+import pytest
+
+pytest.importorskip("cachetools")
+pytest.importorskip("pydantic_settings")
+
+from app.services.base import BaseService  # noqa: E402
+from app.services.cache import cache_service  # noqa: E402
+from app.services.music import MusicService  # noqa: E402
+from app.services.plan import Fetch, FetchPlan  # noqa: E402
+from app.services.stream import StreamService  # noqa: E402
+from app.services.youtube import YouTubeService  # noqa: E402
+
+SERVICES: Tuple[Type[BaseService], ...] = (YouTubeService, MusicService, StreamService)
+
+
+class Tracked(dict):
+    """A response that records which top-level keys are read"""
+
+    read: Set[str]
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+
+        self.read = set()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.read.add(key)
+
+        return super().get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        self.read.add(key)
+
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        self.read.add(str(key))
+
+        return super().__contains__(key)
+
+
+def contains(value: Any, target: dict) -> bool:
+    if value is target:
+        return True
+    if isinstance(value, dict):
+        return any(contains(item, target) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(contains(item, target) for item in value)
+
+    return False
+
+
+def plans() -> Iterator[Tuple[str, Type[BaseService], str, FetchPlan]]:
+    service: Type[BaseService]
+    for service in SERVICES:
+        name: str
+        plan: FetchPlan
+        for name, plan in service.PLANS.items():
+            yield f"{service.__name__}.{name}", service, name, plan
+
+
+@pytest.mark.parametrize(
+    "service, name, plan",
+    [pytest.param(*values, id=id) for id, *values in plans()],
+)
+def test_parser_uses_planned_fetches(
+    service: Type[BaseService], name: str, plan: FetchPlan
+) -> None:
+    parser: Any = service(object(), object()).parser  # type: ignore[call-arg]
+    responses: Dict[str, Tracked] = {
+        argument: Tracked(
+            fetch.project({key: {} for key in fetch.keys or ("contents",)})
+        )
+        for argument, fetch in plan.fetches.items()
+    }
+
+    result: Any = getattr(parser, plan.parser)(**responses)
+
+    argument: str
+    fetch: Fetch
+    for argument, fetch in plan.fetches.items():
+        response: Tracked = responses[argument]
+
+        if fetch.keys is None:
+            assert response.read or contains(
+                result, response
+            ), f"{plan.parser} no longer uses {argument!r}; drop it from the plan"
+        else:
+            assert response.read >= set(
+                fetch.keys
+            ), f"{plan.parser} no longer reads {set(fetch.keys) - response.read}"
+            assert response.read <= set(
+                fetch.keys
+            ), f"{plan.parser} reads {response.read - set(fetch.keys)} not in the plan"
+
+
+class FakeClient:
+    client_type: str
+    locale: str
+    calls: List[str]
+
+    def __init__(self, client_type: str = "WEB", locale: str = "") -> None:
+        self.client_type = client_type
+        self.locale = locale
+        self.calls = []
+
+    def __getattr__(self, endpoint: str) -> Any:
+        def call(*args: Any) -> dict:
+            self.calls.append(endpoint)
+
+            return {
+                "responseContext": {},
+                "videoDetails": {"videoId": args[0], "title": "Song"},
+                "streamingData": {},
+            }
+
+        return call
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    asyncio.run(cache_service.clear())
+    yield
+    asyncio.run(cache_service.clear())
+
+
+def test_run_plan() -> None:
+    client: FakeClient = FakeClient()
+    service: MusicService = MusicService(client, FakeClient())  # type: ignore[arg-type]
+
+    assert asyncio.run(service._run_plan("get_song", "a"))["title"] == "Song"
+    # next is never fetched, since parse_song doesn't read it
+    assert client.calls == ["player"]
+
+
+def test_raw_responses_shared() -> None:
+    client: FakeClient = FakeClient()
+    service: YouTubeService = YouTubeService(client, FakeClient())  # type: ignore[arg-type]
+
+    asyncio.run(service.get_related("a"))
+    asyncio.run(service.get_comments("a"))
+
+    assert client.calls == ["next"]
+
+    # Other videos, clients and locales get their own responses
+    localised: FakeClient = FakeClient(locale="de,DE")
+    other: YouTubeService = YouTubeService(localised, client)  # type: ignore[arg-type]
+
+    asyncio.run(service.get_comments("b"))
+    asyncio.run(other.get_comments("a"))
+
+    assert client.calls == ["next", "next"]
+    assert localised.calls == ["next"]
+
+
+def test_hot_paths_coalesced() -> None:
+    client: FakeClient = FakeClient()
+    service: YouTubeService = YouTubeService(client, FakeClient())  # type: ignore[arg-type]
+
+    async def run() -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(service.get_video("a") for _ in range(3)))
+
+    results: List[Dict[str, Any]] = asyncio.run(run())
+
+    # Concurrent misses share one upstream call, and none was served from cache
+    assert client.calls == ["player"]
+    assert [result["cached"] for result in results] == [False] * 3
+    assert asyncio.run(service.get_video("a"))["cached"] is True
+
+
+def test_unshared_raw_responses() -> None:
+    client: FakeClient = FakeClient()
+    streams: StreamService = StreamService(client, FakeClient())  # type: ignore[arg-type]
+    music: MusicService = MusicService(client, FakeClient())  # type: ignore[arg-type]
+
+    asyncio.run(music.get_song("a"))
+    asyncio.run(streams.get_streams("a"))
+    asyncio.run(cache_service.delete("stream:all:a"))
+    asyncio.run(streams.get_streams("a"))
+
+    # Stream URLs are never rebuilt from an older raw player response...
+    assert client.calls == ["player", "player", "player"]
+
+    # ...but other methods reuse the fresh one
+    asyncio.run(cache_service.delete("music:song:a"))
+    asyncio.run(music.get_song("a"))
+
+    assert client.calls == ["player", "player", "player"]
+
+
+def shelf(title: str, page_type: str, *browse_ids: str) -> dict:
+    return {
+        "musicCarouselShelfRenderer": {
+            "header": {
+                "musicCarouselShelfBasicHeaderRenderer": {
+                    "title": {"runs": [{"text": title}]}
+                }
+            },
+            "contents": [
+                {
+                    "musicTwoRowItemRenderer": {
+                        "title": {"runs": [{"text": browse_id}]},
+                        "navigationEndpoint": {
+                            "browseEndpoint": {
+                                "browseId": browse_id,
+                                "browseEndpointContextSupportedConfigs": {
+                                    "browseEndpointContextMusicConfig": {
+                                        "pageType": page_type
+                                    }
+                                },
+                            }
+                        },
+                    }
+                }
+                for browse_id in browse_ids
+            ],
+        }
+    }
+
+
+def test_artist_albums_localised() -> None:
+    service: MusicService = MusicService(FakeClient(), FakeClient())  # type: ignore[arg-type]
+    data: dict = {
+        "contents": {
+            "singleColumnBrowseResultsRenderer": {
+                "tabs": [
+                    {
+                        "tabRenderer": {
+                            "content": {
+                                "sectionListRenderer": {
+                                    "contents": [
+                                        shelf(
+                                            "Titel", "MUSIC_PAGE_TYPE_PLAYLIST", "VL1"
+                                        ),
+                                        shelf(
+                                            "Alben", "MUSIC_PAGE_TYPE_ALBUM", "MPRE1"
+                                        ),
+                                        shelf(
+                                            "Singles", "MUSIC_PAGE_TYPE_ALBUM", "MPRE2"
+                                        ),
+                                    ]
+                                }
+                            }
+                        }
+                    }
+                ]
+            }
+        }
+    }
+
+    # The albums shelf is found by what it links to, not its localised title
+    albums: List[dict] = service.parser.parse_artist_albums(data)["albums"]
+
+    assert [album["browseId"] for album in albums] == ["MPRE1"]
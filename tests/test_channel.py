@@ -0,0 +1,229 @@
+import copy
+import pathlib
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+from innertube import clients
+from innertube.channel import TAB_PLAYLISTS, TAB_SHORTS, TAB_VIDEOS, parse_item
+from innertube.checkpoints import CheckpointStore
+from innertube.models import ChannelItem, CrawlState
+
+
+def video(video_id: str) -> dict:
+    return {
+        "richItemRenderer": {
+            "content": {
+                "videoRenderer": {
+                    "videoId": video_id,
+                    "title": {"runs": [{"text": f"Video {video_id}"}]},
+                    "publishedTimeText": {"simpleText": "2 days ago"},
+                    "lengthText": {"simpleText": "10:00"},
+                    "viewCountText": {"simpleText": "1,234 views"},
+                }
+            }
+        }
+    }
+
+
+def short(video_id: str) -> dict:
+    return {
+        "richItemRenderer": {
+            "content": {
+                "shortsLockupViewModel": {
+                    "onTap": {
+                        "innertubeCommand": {"reelWatchEndpoint": {"videoId": video_id}}
+                    },
+                    "overlayMetadata": {
+                        "primaryText": {"content": f"Short {video_id}"},
+                        "secondaryText": {"content": "1.5K views"},
+                    },
+                }
+            }
+        }
+    }
+
+
+def continuation_item(token: str) -> dict:
+    return {
+        "continuationItemRenderer": {
+            "continuationEndpoint": {"continuationCommand": {"token": token}}
+        }
+    }
+
+
+def tab(title: str, params: str, contents: Optional[List[dict]] = None) -> dict:
+    renderer: dict = {
+        "title": title,
+        "endpoint": {"browseEndpoint": {"params": params}},
+    }
+
+    if contents is not None:
+        renderer["selected"] = True
+        renderer["content"] = {"richGridRenderer": {"contents": contents}}
+
+    return {"tabRenderer": renderer}
+
+
+def channel(*tabs: dict) -> dict:
+    return {
+        "responseContext": {},
+        "contents": {"twoColumnBrowseResultsRenderer": {"tabs": list(tabs)}},
+    }
+
+
+def continuation_page(*items: dict) -> dict:
+    return {
+        "responseContext": {},
+        "onResponseReceivedActions": [
+            {"appendContinuationItemsAction": {"continuationItems": list(items)}}
+        ],
+    }
+
+
+TABS: Dict[Optional[str], dict] = {
+    None: channel(
+        tab("Home", "home"), tab("Videos", "videos"), tab("Shorts", "shorts")
+    ),
+    "videos": channel(
+        tab("Videos", "videos", [video("a"), video("b"), continuation_item("page-2")])
+    ),
+    "shorts": channel(tab("Shorts", "shorts", [short("c")])),
+}
+PAGES: Dict[str, dict] = {
+    "page-2": continuation_page(video("b"), video("d")),
+}
+
+
+class ChannelAdaptor:
+    requests: List[dict]
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert body is not None
+
+        self.requests.append(body)
+
+        if "continuation" in body:
+            return copy.deepcopy(PAGES[body["continuation"]])
+
+        return copy.deepcopy(TABS[body.get("params")])
+
+
+@pytest.fixture
+def client() -> clients.InnerTube:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.adaptor = ChannelAdaptor()
+
+    return client
+
+
+def test_parse_item() -> None:
+    assert parse_item(
+        {
+            "gridPlaylistRenderer": {
+                "playlistId": "PL",
+                "title": {"simpleText": "Playlist"},
+                "videoCountText": {"runs": [{"text": "12"}, {"text": " videos"}]},
+            }
+        },
+        TAB_PLAYLISTS,
+    ) == ChannelItem(
+        id="PL", type="playlist", tab=TAB_PLAYLISTS, title="Playlist", video_count=12
+    )
+    assert parse_item({"continuationItemRenderer": {}}, TAB_VIDEOS) is None
+
+
+def test_iter_channel(client: clients.InnerTube) -> None:
+    items: List[ChannelItem] = list(client.iter_channel("UC", workers=2))
+
+    assert sorted(item.id for item in items) == ["a", "b", "c", "d"]
+    assert [item.id for item in items if item.tab == TAB_VIDEOS] == ["a", "b", "d"]
+
+    video: ChannelItem = next(item for item in items if item.id == "a")
+    short: ChannelItem = next(item for item in items if item.id == "c")
+
+    assert video == ChannelItem(
+        id="a",
+        type="video",
+        tab=TAB_VIDEOS,
+        title="Video a",
+        published="2 days ago",
+        duration="10:00",
+        view_count=1234,
+    )
+    assert short == ChannelItem(
+        id="c", type="short", tab=TAB_SHORTS, title="Short c", view_count=1500
+    )
+
+
+def test_iter_channel_missing_tab(client: clients.InnerTube) -> None:
+    items: List[ChannelItem] = list(client.iter_channel("UC", tabs=[TAB_PLAYLISTS]))
+
+    assert items == []
+
+
+def test_iter_channel_error(
+    client: clients.InnerTube, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delitem(PAGES, "page-2")
+
+    with pytest.raises(KeyError):
+        list(client.iter_channel("UC", tabs=[TAB_VIDEOS]))
+
+
+def test_iter_channel_checkpoints(
+    client: clients.InnerTube, tmp_path: pathlib.Path
+) -> None:
+    checkpoints: CheckpointStore = CheckpointStore(tmp_path / "checkpoints.sqlite3")
+
+    items: Iterator[ChannelItem] = client.iter_channel(
+        "UC", tabs=[TAB_VIDEOS], checkpoints=checkpoints
+    )
+
+    assert [next(items).id for _ in range(3)] == ["a", "b", "d"]
+
+    items.close()
+
+    # The last page was not finished, so it is fetched again (and deduplicated)
+    assert checkpoints.load("channel:UC:Videos") == CrawlState(
+        token="page-2", count=3, done=False, seen={"a", "b", "d"}
+    )
+    assert list(client.iter_channel("UC", checkpoints=checkpoints)) == [
+        ChannelItem(
+            id="c", type="short", tab=TAB_SHORTS, title="Short c", view_count=1500
+        )
+    ]
+    assert list(client.iter_channel("UC", checkpoints=checkpoints)) == []
+
+
+def test_iter_channel_checkpoints_partial(
+    client: clients.InnerTube, tmp_path: pathlib.Path
+) -> None:
+    checkpoints: CheckpointStore = CheckpointStore(tmp_path / "checkpoints.sqlite3")
+
+    items: Iterator[ChannelItem] = client.iter_channel(
+        "UC", tabs=[TAB_VIDEOS], checkpoints=checkpoints
+    )
+
+    assert next(items).id == "a"
+
+    items.close()
+
+    state: Optional[CrawlState] = checkpoints.load("channel:UC:Videos")
+
+    assert state is not None
+    assert (state.token, state.count, state.seen) == (None, 1, {"a"})
+    assert [
+        item.id
+        for item in client.iter_channel(
+            "UC", tabs=[TAB_VIDEOS], checkpoints=checkpoints
+        )
+    ] == ["b", "d"]
@@ -0,0 +1,183 @@
+import copy
+import pathlib
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+from innertube import clients
+from innertube.checkpoints import CheckpointStore
+from innertube.models import CrawlState, PlaylistItem
+from innertube.playlist import parse_item
+
+
+@pytest.fixture
+def checkpoints(tmp_path: pathlib.Path) -> CheckpointStore:
+    return CheckpointStore(tmp_path / "checkpoints.sqlite3")
+
+
+def playlist_video(video_id: str, index: int) -> dict:
+    return {
+        "playlistVideoRenderer": {
+            "videoId": video_id,
+            "setVideoId": f"set-{index}",
+            "index": {"simpleText": str(index)},
+            "title": {"runs": [{"text": f"Video {video_id}"}]},
+            "shortBylineText": {
+                "runs": [
+                    {
+                        "text": "Channel",
+                        "navigationEndpoint": {"browseEndpoint": {"browseId": "UC"}},
+                    }
+                ]
+            },
+            "lengthSeconds": "212",
+        }
+    }
+
+
+def continuation_item(token: str) -> dict:
+    return {
+        "continuationItemRenderer": {
+            "continuationEndpoint": {"continuationCommand": {"token": token}}
+        }
+    }
+
+
+PAGES: Dict[str, dict] = {
+    "VLPL": {
+        "responseContext": {},
+        "contents": {
+            "twoColumnBrowseResultsRenderer": {
+                "tabs": [
+                    {
+                        "tabRenderer": {
+                            "selected": True,
+                            "content": {
+                                "sectionListRenderer": {
+                                    "contents": [
+                                        {
+                                            "itemSectionRenderer": {
+                                                "contents": [
+                                                    {
+                                                        "playlistVideoListRenderer": {
+                                                            "contents": [
+                                                                playlist_video("a", 1),
+                                                                playlist_video("b", 2),
+                                                                continuation_item(
+                                                                    "page-2"
+                                                                ),
+                                                            ]
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        }
+                                    ]
+                                }
+                            },
+                        }
+                    }
+                ]
+            }
+        },
+    },
+    "page-2": {
+        "responseContext": {},
+        "onResponseReceivedActions": [
+            {
+                "appendContinuationItemsAction": {
+                    "continuationItems": [
+                        playlist_video("a", 3),
+                        playlist_video("c", 4),
+                    ]
+                }
+            }
+        ],
+    },
+}
+
+
+class PlaylistAdaptor:
+    requests: List[str]
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert body is not None
+
+        key: str = body.get("continuation") or body["browseId"]
+
+        self.requests.append(key)
+
+        return copy.deepcopy(PAGES[key])
+
+
+def test_store(checkpoints: CheckpointStore) -> None:
+    assert checkpoints.load("foo") is None
+
+    checkpoints.save("foo", token="a", count=1, seen=["1"])
+    checkpoints.save("foo", token="b", count=2, seen=["1", "2"])
+
+    assert checkpoints.load("foo") == CrawlState(token="b", count=2, seen={"1", "2"})
+    assert len(checkpoints) == 1
+
+    checkpoints.save("foo", token=None, count=2, done=True)
+
+    assert checkpoints.load("foo") == CrawlState(
+        token=None, count=2, done=True, seen={"1", "2"}
+    )
+
+    checkpoints.delete("foo")
+
+    assert checkpoints.load("foo") is None
+
+
+def test_store_persistence(tmp_path: pathlib.Path) -> None:
+    path: pathlib.Path = tmp_path / "checkpoints.sqlite3"
+
+    checkpoints: CheckpointStore = CheckpointStore(path)
+    checkpoints.save("foo", token="a", count=1, seen=["1"])
+    checkpoints.close()
+
+    assert CheckpointStore(path).load("foo") == CrawlState(
+        token="a", count=1, seen={"1"}
+    )
+
+
+def test_parse_playlist_item() -> None:
+    assert parse_item(playlist_video("a", 1)) == PlaylistItem(
+        video_id="a",
+        set_video_id="set-1",
+        index=1,
+        title="Video a",
+        author="Channel",
+        channel_id="UC",
+        duration_seconds=212,
+    )
+
+
+def test_iter_playlist(checkpoints: CheckpointStore) -> None:
+    adaptor: PlaylistAdaptor = PlaylistAdaptor()
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.adaptor = adaptor
+
+    items: Iterator[PlaylistItem] = client.iter_playlist("PL", checkpoints=checkpoints)
+
+    assert [next(items).index for _ in range(2)] == [1, 2]
+
+    items.close()
+
+    # Resuming re-fetches the unfinished first page and skips what was yielded
+    assert [
+        item.index for item in client.iter_playlist("PL", checkpoints=checkpoints)
+    ] == [3, 4]
+    assert checkpoints.load("playlist:VLPL") == CrawlState(
+        token=None, count=4, done=True, seen={"set-1", "set-2", "set-3", "set-4"}
+    )
+    assert list(client.iter_playlist("VLPL", checkpoints=checkpoints)) == []
@@ -0,0 +1,137 @@
+import json
+import pathlib
+import random
+import time
+from typing import List, Set
+
+import pytest
+from innertube import cli, clients
+
+
+def player(client: clients.InnerTube, value: str) -> dict:
+    time.sleep(random.random() / 100)
+
+    if value == "bad":
+        raise ValueError("Bad video id")
+
+    return {"videoDetails": {"videoId": value}}
+
+
+def read_records(path: pathlib.Path) -> List[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def inputs(tmp_path: pathlib.Path) -> pathlib.Path:
+    path: pathlib.Path = tmp_path / "ids.txt"
+
+    path.write_text("\n".join(["a", "b", "", "bad", "c", "d", "e"]) + "\n")
+
+    return path
+
+
+def test_run() -> None:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    values: List[str] = [str(index) for index in range(50)]
+
+    records: List[dict] = list(cli.run(client, player, values, concurrency=4))
+
+    assert [record["input"] for record in records] == values
+
+
+def test_main(
+    tmp_path: pathlib.Path, inputs: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output: pathlib.Path = tmp_path / "out.ndjson"
+
+    monkeypatch.setitem(cli.COMMANDS, "player", player)
+
+    assert cli.main(["player", "-i", str(inputs), "-o", str(output)]) == 0
+
+    records: List[dict] = read_records(output)
+
+    assert [record["input"] for record in records] == ["a", "b", "bad", "c", "d", "e"]
+    assert records[0]["data"] == {"videoDetails": {"videoId": "a"}}
+    assert records[2]["error"] == "ValueError: Bad video id"
+
+
+def test_main_resume(
+    tmp_path: pathlib.Path, inputs: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output: pathlib.Path = tmp_path / "out.ndjson"
+    checkpoint: pathlib.Path = tmp_path / "checkpoint.json"
+    interrupted: Set[str] = set()
+
+    def interruptible(client: clients.InnerTube, value: str) -> dict:
+        if value == "d" and not interrupted:
+            interrupted.add(value)
+
+            raise KeyboardInterrupt
+
+        return player(client, value)
+
+    monkeypatch.setitem(cli.COMMANDS, "player", interruptible)
+
+    argv: List[str] = [
+        "player",
+        "-i",
+        str(inputs),
+        "-o",
+        str(output),
+        "--checkpoint",
+        str(checkpoint),
+        "--checkpoint-interval",
+        "2",
+    ]
+
+    assert cli.main(argv) == 130
+    assert json.loads(checkpoint.read_text())["count"] == 4
+
+    # Simulate a partially written record after the checkpoint
+    with output.open("ab") as file:
+        file.write(b'{"input":"d"')
+
+    assert cli.main(argv) == 0
+
+    records: List[dict] = read_records(output)
+
+    assert [record["input"] for record in records] == ["a", "b", "bad", "c", "d", "e"]
+
+
+def test_main_zstd(
+    tmp_path: pathlib.Path, inputs: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    zstandard = pytest.importorskip("zstandard")
+
+    output: pathlib.Path = tmp_path / "out.ndjson.zst"
+
+    monkeypatch.setitem(cli.COMMANDS, "player", player)
+
+    assert (
+        cli.main(
+            [
+                "player",
+                "-i",
+                str(inputs),
+                "-o",
+                str(output),
+                "--checkpoint-interval",
+                "2",
+            ]
+        )
+        == 0
+    )
+
+    with output.open("rb") as file:
+        content: bytes = (
+            zstandard.ZstdDecompressor()
+            .stream_reader(file, read_across_frames=True)
+            .read()
+        )
+
+    assert len(content.splitlines()) == 6
+
+
+def test_main_checkpoint_requires_output(inputs: pathlib.Path) -> None:
+    with pytest.raises(SystemExit):
+        cli.main(["player", "-i", str(inputs), "--checkpoint", "checkpoint.json"])
@@ -1,7 +1,9 @@
-from typing import Optional
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
 
 import pytest
 from innertube import clients, protocols
+from innertube.models import Call, TranscriptSegment
 
 
 @pytest.fixture
@@ -28,6 +30,186 @@ def test_client(adaptor: protocols.Adaptor) -> None:
     assert client("foo") == {"foo": "bar"}
 
 
+def test_client_request_middleware(adaptor: protocols.Adaptor) -> None:
+    client: clients.Client = clients.Client(adaptor=adaptor)
+    cache: Dict[str, dict] = {"cached": {"foo": "cached"}}
+    calls: List[str] = []
+
+    @client.request_middleware
+    def short_circuit(call_next: Callable[[Call], dict], call: Call) -> dict:
+        if call.endpoint in cache:
+            return dict(cache[call.endpoint])
+
+        return call_next(call)
+
+    @client.request_middleware
+    def rewrite(call_next: Callable[[Call], dict], call: Call) -> dict:
+        calls.append(call.endpoint)
+
+        return {**call_next(call), "rewritten": True}
+
+    assert client("foo") == {"foo": "bar", "rewritten": True}
+    assert client("cached") == {"foo": "cached", "rewritten": True}
+    assert calls == ["foo", "cached"]
+
+
 def test_innertube() -> None:
     with pytest.raises(ValueError):
         clients.InnerTube("FAKE_CLIENT")
+
+
+def test_innertube_close() -> None:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.close()
+
+    assert client.adaptor.session.is_closed
+
+    async_client: clients.AsyncInnerTube = clients.AsyncInnerTube("WEB")
+    asyncio.run(async_client.aclose())
+
+    assert async_client.adaptor.session.is_closed
+
+
+@pytest.fixture
+def async_adaptor() -> protocols.AsyncAdaptor:
+    class FakeAsyncAdaptor(protocols.AsyncAdaptor):
+        async def dispatch(
+            self,
+            endpoint: str,
+            *,
+            params: Optional[dict] = None,
+            body: Optional[dict] = None
+        ) -> dict:
+            return {
+                "responseContext": {},
+                "foo": "bar",
+            }
+
+    return FakeAsyncAdaptor()
+
+
+def test_async_client(async_adaptor: protocols.AsyncAdaptor) -> None:
+    client: clients.AsyncClient = clients.AsyncClient(adaptor=async_adaptor)
+
+    assert asyncio.run(client("foo")) == {"foo": "bar"}
+
+
+def test_async_client_request_middleware(
+    async_adaptor: protocols.AsyncAdaptor,
+) -> None:
+    client: clients.AsyncClient = clients.AsyncClient(adaptor=async_adaptor)
+
+    @client.request_middleware
+    async def short_circuit(
+        call_next: Callable[[Call], Awaitable[dict]], call: Call
+    ) -> dict:
+        if call.body == {"cached": True}:
+            return {"foo": "cached"}
+
+        return await call_next(call)
+
+    assert asyncio.run(client("foo")) == {"foo": "bar"}
+    assert asyncio.run(client("foo", body={"cached": True})) == {"foo": "cached"}
+
+
+def test_async_innertube() -> None:
+    with pytest.raises(ValueError):
+        clients.AsyncInnerTube("FAKE_CLIENT")
+
+
+class TranscriptAdaptor:
+    calls: List[str]
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None
+    ) -> dict:
+        self.calls.append(endpoint)
+
+        assert body is not None
+
+        if endpoint == "next":
+            return {
+                "responseContext": {},
+                "engagementPanels": [
+                    {
+                        "engagementPanelSectionListRenderer": {
+                            "panelIdentifier": "engagement-panel-searchable-transcript",
+                            "content": {
+                                "continuationItemRenderer": {
+                                    "continuationEndpoint": {
+                                        "getTranscriptEndpoint": {
+                                            "params": body["videoId"]
+                                        }
+                                    }
+                                }
+                            },
+                        }
+                    }
+                ],
+            }
+
+        return {
+            "responseContext": {},
+            "actions": [
+                {
+                    "updateEngagementPanelAction": {
+                        "content": {
+                            "transcriptRenderer": {
+                                "content": {
+                                    "transcriptSearchPanelRenderer": {
+                                        "body": {
+                                            "transcriptSegmentListRenderer": {
+                                                "initialSegments": [
+                                                    {
+                                                        "transcriptSegmentRenderer": {
+                                                            "startMs": "0",
+                                                            "endMs": "1500",
+                                                            "snippet": {
+                                                                "runs": [
+                                                                    {
+                                                                        "text": body[
+                                                                            "params"
+                                                                        ]
+                                                                    }
+                                                                ]
+                                                            },
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            ],
+        }
+
+
+def test_transcript() -> None:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    adaptor: TranscriptAdaptor = TranscriptAdaptor()
+    client.adaptor = adaptor
+
+    assert client.transcript("a") == [TranscriptSegment(0, 1500, "a")]
+    assert client.transcript("a") == [TranscriptSegment(0, 1500, "a")]
+    assert adaptor.calls == ["next", "get_transcript", "get_transcript"]
+
+
+def test_transcripts() -> None:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.adaptor = TranscriptAdaptor()
+
+    assert client.transcripts(["a", "b"]) == {
+        "a": [TranscriptSegment(0, 1500, "a")],
+        "b": [TranscriptSegment(0, 1500, "b")],
+    }
@@ -0,0 +1,253 @@
+import copy
+import datetime
+import pathlib
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+from innertube import clients
+from innertube.comments import SORT_NEWEST, parse_age, parse_count
+from innertube.checkpoints import CheckpointStore
+from innertube.models import Comment, CommentThread, CrawlState
+
+
+def continuation_item(token: str) -> dict:
+    return {
+        "continuationItemRenderer": {
+            "continuationEndpoint": {"continuationCommand": {"token": token}}
+        }
+    }
+
+
+def legacy_comment(comment_id: str, published: str = "1 day ago") -> dict:
+    return {
+        "commentRenderer": {
+            "commentId": comment_id,
+            "contentText": {"runs": [{"text": f"text {comment_id}"}]},
+            "authorText": {"simpleText": "author"},
+            "publishedTimeText": {"runs": [{"text": published}]},
+            "voteCount": {"simpleText": "1.2K"},
+            "replyCount": 1,
+        }
+    }
+
+
+def thread(comment_id: str, replies: Optional[str] = None, **kwargs) -> dict:
+    renderer: dict = {"comment": legacy_comment(comment_id, **kwargs)}
+
+    if replies is not None:
+        renderer["replies"] = {
+            "commentRepliesRenderer": {"contents": [continuation_item(replies)]}
+        }
+
+    return {"commentThreadRenderer": renderer}
+
+
+def page(*items: dict, payloads: Optional[List[dict]] = None) -> dict:
+    return {
+        "responseContext": {},
+        "onResponseReceivedEndpoints": [
+            {"reloadContinuationItemsCommand": {"continuationItems": list(items)}}
+        ],
+        "frameworkUpdates": {
+            "entityBatchUpdate": {
+                "mutations": [
+                    {"payload": {"commentEntityPayload": payload}}
+                    for payload in payloads or ()
+                ]
+            }
+        },
+    }
+
+
+PAGES: Dict[str, dict] = {
+    "newest": page(
+        thread("a", replies="replies-a"), thread("b"), continuation_item("page-2")
+    ),
+    "page-2": page(
+        thread("b"),
+        {
+            "commentThreadRenderer": {
+                "commentViewModel": {
+                    "commentViewModel": {"commentId": "c", "commentKey": "key-c"}
+                }
+            }
+        },
+        thread("d", published="3 years ago"),
+        payloads=[
+            {
+                "key": "key-c",
+                "properties": {
+                    "commentId": "c",
+                    "content": {"content": "text c"},
+                    "publishedTime": "2 weeks ago",
+                },
+                "author": {"displayName": "@c", "channelId": "UCc"},
+                "toolbar": {"likeCountNotliked": "12", "replyCount": "0"},
+            }
+        ],
+    ),
+    "replies-a": page(legacy_comment("a.1"), continuation_item("replies-a-2")),
+    "replies-a-2": page(legacy_comment("a.2"), legacy_comment("a.1")),
+}
+
+
+class CommentsAdaptor:
+    continuations: List[str]
+
+    def __init__(self) -> None:
+        self.continuations = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert body is not None
+
+        if "continuation" in body:
+            self.continuations.append(body["continuation"])
+
+            return copy.deepcopy(PAGES[body["continuation"]])
+
+        return {
+            "responseContext": {},
+            "engagementPanels": [
+                {
+                    "engagementPanelSectionListRenderer": {
+                        "panelIdentifier": "engagement-panel-comments-section",
+                        "header": {
+                            "engagementPanelTitleHeaderRenderer": {
+                                "menu": {
+                                    "sortFilterSubMenuRenderer": {
+                                        "subMenuItems": [
+                                            {
+                                                "title": title,
+                                                "serviceEndpoint": {
+                                                    "continuationCommand": {
+                                                        "token": token
+                                                    }
+                                                },
+                                            }
+                                            for title, token in (
+                                                ("Top comments", "top"),
+                                                ("Newest first", "newest"),
+                                            )
+                                        ]
+                                    }
+                                }
+                            }
+                        },
+                    }
+                }
+            ],
+        }
+
+
+@pytest.fixture
+def client() -> clients.InnerTube:
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.adaptor = CommentsAdaptor()
+
+    return client
+
+
+def test_parse_age() -> None:
+    assert parse_age("3 days ago") == datetime.timedelta(days=3)
+    assert parse_age("1 year ago (edited)") == datetime.timedelta(days=365)
+    assert parse_age("just now") is None
+    assert parse_age(None) is None
+
+
+def test_parse_count() -> None:
+    assert parse_count("12") == 12
+    assert parse_count("1,234") == 1234
+    assert parse_count("1.2K") == 1200
+    assert parse_count("3M") == 3000000
+    assert parse_count("") is None
+    assert parse_count(None) is None
+
+
+def test_iter_comments(client: clients.InnerTube) -> None:
+    threads: List[CommentThread] = list(
+        client.iter_comments("video", sort=SORT_NEWEST, workers=2)
+    )
+
+    assert [thread.comment.id for thread in threads] == ["a", "b", "c", "d"]
+    assert [reply.id for reply in threads[0].replies] == ["a.1", "a.2"]
+    assert threads[0].replies[0].parent_id == "a"
+    assert threads[0].comment.like_count == 1200
+    assert threads[2].comment == Comment(
+        id="c",
+        text="text c",
+        author="@c",
+        author_channel_id="UCc",
+        published="2 weeks ago",
+        like_count=12,
+        reply_count=0,
+    )
+
+
+def test_iter_comments_max_comments(client: clients.InnerTube) -> None:
+    threads: List[CommentThread] = list(
+        client.iter_comments("video", sort=SORT_NEWEST, max_comments=2)
+    )
+
+    assert [thread.comment.id for thread in threads] == ["a", "b"]
+
+
+def test_iter_comments_max_age(client: clients.InnerTube) -> None:
+    threads: List[CommentThread] = list(
+        client.iter_comments(
+            "video",
+            sort=SORT_NEWEST,
+            replies=False,
+            max_age=datetime.timedelta(weeks=1),
+        )
+    )
+
+    assert [thread.comment.id for thread in threads] == ["a", "b"]
+    assert threads[0].replies == []
+
+
+def test_iter_comments_checkpoints(
+    client: clients.InnerTube, tmp_path: pathlib.Path
+) -> None:
+    checkpoints: CheckpointStore = CheckpointStore(tmp_path / "checkpoints.sqlite3")
+
+    threads: Iterator[CommentThread] = client.iter_comments(
+        "video", sort=SORT_NEWEST, checkpoints=checkpoints
+    )
+
+    assert next(threads).comment.id == "a"
+
+    threads.close()
+
+    state: Optional[CrawlState] = checkpoints.load("comments:video:1")
+
+    assert state is not None
+    assert state.token == "newest"
+    assert state.seen == {"a", "a.1", "a.2"}
+
+    adaptor: CommentsAdaptor = CommentsAdaptor()
+    client.adaptor = adaptor
+
+    assert [
+        thread.comment.id
+        for thread in client.iter_comments(
+            "video", sort=SORT_NEWEST, checkpoints=checkpoints
+        )
+    ] == ["b", "c", "d"]
+    assert checkpoints.load("comments:video:1") == CrawlState(
+        token=None,
+        count=4,
+        done=True,
+        seen={"a", "a.1", "a.2", "b", "c", "d"},
+    )
+    # Replies of threads emitted before the resume aren't fetched again
+    assert "replies-a" not in adaptor.continuations
+    assert (
+        list(client.iter_comments("video", sort=SORT_NEWEST, checkpoints=checkpoints))
+        == []
+    )
@@ -0,0 +1,93 @@
+import os
+import pathlib
+import re
+from typing import List, Optional
+
+import httpx
+import pytest
+from innertube.download import Downloader, ranges
+from innertube.errors import DownloadError
+
+CONTENT: bytes = bytes(range(256)) * 40
+
+
+def session(
+    requests: List[str], fail: Optional[str] = None, content: bytes = CONTENT
+) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        match: Optional[re.Match] = re.fullmatch(
+            r"bytes=(\d+)-(\d+)", request.headers["Range"]
+        )
+
+        assert match is not None
+
+        requests.append(request.headers["Range"])
+
+        if request.headers["Range"] == fail:
+            return httpx.Response(500)
+
+        start, end = int(match.group(1)), int(match.group(2))
+
+        return httpx.Response(206, content=content[start : end + 1])
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_ranges() -> None:
+    assert ranges(10, 4) == [(0, 3), (4, 7), (8, 9)]
+    assert ranges(8, 4) == [(0, 3), (4, 7)]
+    assert ranges(0, 4) == []
+
+    with pytest.raises(ValueError):
+        ranges(10, 0)
+
+
+def test_download(tmp_path: pathlib.Path) -> None:
+    requests: List[str] = []
+    downloader: Downloader = Downloader(
+        session=session(requests), chunk_size=1000, workers=4
+    )
+    path: pathlib.Path = tmp_path / "video.mp4"
+
+    written: int = downloader.download(
+        {"url": "https://foo.bar/video", "contentLength": str(len(CONTENT))}, path
+    )
+
+    assert written == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+    assert len(requests) == 11
+    assert not os.path.exists(f"{path}.ranges")
+
+
+def test_download_resume(tmp_path: pathlib.Path) -> None:
+    path: pathlib.Path = tmp_path / "video.mp4"
+    url: str = "https://foo.bar/video"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        Downloader(
+            session=session([], fail="bytes=10000-10239"), chunk_size=1000, workers=1
+        ).download_url(url, path, len(CONTENT))
+
+    assert os.path.exists(f"{path}.ranges")
+
+    requests: List[str] = []
+
+    written: int = Downloader(
+        session=session(requests), chunk_size=1000, workers=2
+    ).download_url(url, path, len(CONTENT))
+
+    assert path.read_bytes() == CONTENT
+    assert requests == ["bytes=10000-10239"]
+    assert written == 240
+
+
+def test_download_short(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(DownloadError):
+        Downloader(
+            session=session([], content=CONTENT[:-10]), chunk_size=1000
+        ).download_url("https://foo.bar/video", tmp_path / "video.mp4", len(CONTENT))
+
+
+def test_download_missing_url(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(DownloadError):
+        Downloader().download({"signatureCipher": "..."}, tmp_path / "video.mp4")
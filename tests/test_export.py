@@ -0,0 +1,153 @@
+import json
+import pathlib
+from typing import List
+
+import pytest
+from innertube import cli
+from innertube.export import ParquetExporter, search_rows, video_rows
+
+
+def player(video_id: str) -> dict:
+    return {
+        "videoDetails": {
+            "videoId": video_id,
+            "title": f"Video {video_id}",
+            "author": "Author",
+            "channelId": "UC",
+            "lengthSeconds": "212",
+            "viewCount": "1234",
+            "keywords": ["a", "b"],
+            "isLiveContent": False,
+            "thumbnail": {"thumbnails": [{"url": "small"}, {"url": "large"}]},
+        },
+        "microformat": {
+            "playerMicroformatRenderer": {
+                "category": "Music",
+                "publishDate": "2020-01-01",
+            }
+        },
+    }
+
+
+SEARCH: dict = {
+    "contents": {
+        "twoColumnSearchResultsRenderer": {
+            "primaryContents": {
+                "sectionListRenderer": {
+                    "contents": [
+                        {
+                            "itemSectionRenderer": {
+                                "contents": [
+                                    {
+                                        "videoRenderer": {
+                                            "videoId": "a",
+                                            "title": {"runs": [{"text": "Video a"}]},
+                                            "ownerText": {
+                                                "runs": [
+                                                    {
+                                                        "text": "Channel",
+                                                        "navigationEndpoint": {
+                                                            "browseEndpoint": {
+                                                                "browseId": "UC"
+                                                            }
+                                                        },
+                                                    }
+                                                ]
+                                            },
+                                            "lengthText": {"simpleText": "1:02:03"},
+                                            "viewCountText": {
+                                                "simpleText": "1,234 views"
+                                            },
+                                        }
+                                    },
+                                    {"adSlotRenderer": {}},
+                                    {
+                                        "channelRenderer": {
+                                            "channelId": "UC",
+                                            "title": {"simpleText": "Channel"},
+                                        }
+                                    },
+                                ]
+                            }
+                        }
+                    ]
+                }
+            }
+        }
+    }
+}
+
+
+def test_video_rows() -> None:
+    assert video_rows("a", player("a")) == [
+        dict(
+            video_id="a",
+            title="Video a",
+            author="Author",
+            channel_id="UC",
+            description=None,
+            length_seconds=212,
+            view_count=1234,
+            is_live=False,
+            keywords=["a", "b"],
+            category="Music",
+            publish_date="2020-01-01",
+            thumbnail_url="large",
+        )
+    ]
+    assert video_rows("a", {"playabilityStatus": {"status": "ERROR"}}) == []
+
+
+def test_search_rows() -> None:
+    rows: List[dict] = search_rows("query", SEARCH)
+
+    assert [(row["position"], row["type"], row["id"]) for row in rows] == [
+        (0, "video", "a"),
+        (1, "channel", "UC"),
+    ]
+    assert rows[0]["channel"] == "Channel"
+    assert rows[0]["duration_seconds"] == 3723
+    assert rows[0]["view_count"] == 1234
+
+
+def test_exporter(tmp_path: pathlib.Path) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+
+    path: pathlib.Path = tmp_path / "videos.parquet"
+
+    with ParquetExporter(path, "player", row_group_size=2) as exporter:
+        for video_id in "abcde":
+            exporter.write(video_id, player(video_id))
+
+        exporter.write_record({"input": "f", "error": "RequestError"})
+
+    assert exporter.rows == 5
+
+    file = parquet.ParquetFile(path)
+
+    assert file.metadata.num_row_groups == 3
+    assert file.read().column("video_id").to_pylist() == list("abcde")
+
+
+def test_exporter_unknown_kind(tmp_path: pathlib.Path) -> None:
+    pytest.importorskip("pyarrow")
+
+    with pytest.raises(ValueError):
+        ParquetExporter(tmp_path / "foo.parquet", "foo")
+
+
+def test_cli_export(tmp_path: pathlib.Path) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+    zstandard = pytest.importorskip("zstandard")
+
+    source: pathlib.Path = tmp_path / "search.ndjson.zst"
+    output: pathlib.Path = tmp_path / "search.parquet"
+
+    source.write_bytes(
+        zstandard.ZstdCompressor().compress(
+            json.dumps({"input": "query", "data": SEARCH}).encode() + b"\n"
+        )
+    )
+
+    assert cli.main(["export", "search", "-i", str(source), "-o", str(output)]) == 0
+    assert parquet.read_table(output).column("query").to_pylist() == ["query"] * 2
@@ -0,0 +1,194 @@
+import json
+import math
+import pathlib
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+import pytest
+from innertube import clients
+from innertube.enums import Endpoint
+from innertube.errors import OfflineError, RequestError
+from innertube.health import ContextHealth, HealthProber
+from innertube.locale import Locale
+from innertube.models import ClientContext, Error
+from innertube.store import ResponseStore
+
+
+class ProbeAdaptor:
+    status: Optional[str]
+    failing: bool
+    requests: List[str]
+
+    def __init__(self, status: Optional[str] = "OK", *, failing: bool = False) -> None:
+        self.status = status
+        self.failing = failing
+        self.requests = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        self.requests.append(endpoint)
+
+        if self.failing:
+            raise RequestError(
+                Error(code=400, message="Precondition check failed.", reason="")
+            )
+
+        return {"responseContext": {}, "playabilityStatus": {"status": self.status}}
+
+
+def context(name: str) -> ClientContext:
+    return ClientContext(client_name=name, client_version="1.0")
+
+
+@pytest.fixture
+def prober() -> HealthProber:
+    prober: HealthProber = HealthProber(
+        [context("FAST"), context("SLOW"), context("STALE"), context("UNPLAYABLE")]
+    )
+    prober.adaptors = {
+        "FAST": ProbeAdaptor(),
+        "SLOW": ProbeAdaptor(),
+        "STALE": ProbeAdaptor(failing=True),
+        "UNPLAYABLE": ProbeAdaptor("LOGIN_REQUIRED"),
+    }
+
+    return prober
+
+
+def test_context_health() -> None:
+    health: ContextHealth = ContextHealth(client_name="WEB", endpoint="player")
+
+    assert health.success_rate == 0
+    assert health.latency == math.inf
+
+    health.samples.extend([(True, 0.3), (True, 0.1), (False, 5.0), (True, 0.2)])
+
+    assert health.success_rate == 0.75
+    assert health.latency == 0.2
+
+
+def test_probe(prober: HealthProber) -> None:
+    prober.probe()
+
+    # Latencies of real probes are noise, so pin them
+    prober.record("FAST", Endpoint.PLAYER, ok=True, latency=0)
+    prober.record("SLOW", Endpoint.PLAYER, ok=True, latency=10)
+    prober.record("SLOW", Endpoint.PLAYER, ok=True, latency=10)
+
+    ranking: Dict[str, ContextHealth] = {
+        health.client_name: health for health in prober.ranking(Endpoint.PLAYER)
+    }
+
+    assert list(ranking)[:2] == ["FAST", "SLOW"]
+    assert ranking["STALE"].success_rate == 0
+    assert ranking["STALE"].last_error is not None
+    assert ranking["UNPLAYABLE"].last_error == "Playability status 'LOGIN_REQUIRED'"
+    # A player error doesn't count against browse
+    assert {health.client_name for health in prober.ranking(Endpoint.BROWSE)} == {
+        "FAST",
+        "SLOW",
+        "STALE",
+        "UNPLAYABLE",
+    }
+    assert prober.ranking(Endpoint.BROWSE)[-1].client_name == "STALE"
+    assert prober.best(Endpoint.PLAYER) == context("FAST")
+
+
+def test_best_without_probes(prober: HealthProber) -> None:
+    assert prober.best(Endpoint.PLAYER) is None
+
+
+def client_session(clients: List[str], *, failing: Sequence[str] = ()) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        client: dict = json.loads(request.content)["context"]["client"]
+        clients.append(client["clientName"])
+
+        if client["clientName"] in failing:
+            return httpx.Response(
+                400,
+                json={"error": {"code": 400, "message": "Bad", "status": "FAILED"}},
+            )
+
+        return httpx.Response(200, json={"playabilityStatus": {"status": "OK"}})
+
+    return httpx.Client(
+        transport=httpx.MockTransport(handler), base_url="https://foo.bar/"
+    )
+
+
+def test_auto_select(prober: HealthProber) -> None:
+    requests: List[str] = []
+    client: clients.InnerTube = clients.InnerTube(
+        "WEB", locale=Locale("fr", "FR"), prober=prober, fallbacks=["FAST", "SLOW"]
+    )
+    client.adaptor.session = client_session(requests, failing=["FAST"])
+
+    # Nothing has been probed yet, so the client's own context is used
+    client.player("dQw4w9WgXcQ")
+
+    assert requests == ["WEB"]
+
+    prober.record("SLOW", Endpoint.PLAYER, ok=True, latency=10)
+    prober.record("FAST", Endpoint.PLAYER, ok=True, latency=1)
+
+    # Real calls feed the ranking too
+    with pytest.raises(RequestError):
+        client.player("dQw4w9WgXcQ")
+
+    assert requests == ["WEB", "FAST"]
+    assert prober.best(Endpoint.PLAYER) == context("SLOW")
+    # Re-routed calls keep the client's own session and locale
+    assert client.ranked_adaptors["FAST"].session is client.adaptor.session
+    assert client.ranked_adaptors["FAST"].context.locale == Locale("fr", "FR")
+
+
+def test_auto_select_fallbacks(prober: HealthProber) -> None:
+    prober.record("FAST", Endpoint.PLAYER, ok=True, latency=1)
+    prober.record("SLOW", Endpoint.PLAYER, ok=True, latency=10)
+    requests: List[str] = []
+    client: clients.InnerTube = clients.InnerTube("WEB", prober=prober)
+    client.adaptor.session = client_session(requests)
+
+    client.player("dQw4w9WgXcQ")
+
+    # Without fallbacks, responses keep the client's own shape
+    assert requests == ["WEB"]
+
+    client = clients.InnerTube("WEB", prober=prober, fallbacks=["SLOW"])
+    client.adaptor.session = client_session(requests)
+
+    client.player("dQw4w9WgXcQ")
+
+    # Only the listed contexts are candidates, however well others rank
+    assert requests == ["WEB", "SLOW"]
+    assert prober.best(Endpoint.PLAYER, candidates=["WEB", "SLOW"]) == context("SLOW")
+
+
+def test_auto_select_offline(prober: HealthProber, tmp_path: pathlib.Path) -> None:
+    prober.record("FAST", Endpoint.PLAYER, ok=True, latency=1)
+    store: ResponseStore = ResponseStore(tmp_path / "responses.sqlite3")
+    requests: List[str] = []
+    client: clients.InnerTube = clients.InnerTube(
+        "WEB", store=store, prober=prober, fallbacks=["FAST"]
+    )
+    client.adaptor.session = client_session(requests)
+
+    client.player("dQw4w9WgXcQ")
+
+    assert requests == ["FAST"]
+
+    requests.clear()
+    client = clients.InnerTube(
+        "WEB", store=store, offline=True, prober=prober, fallbacks=["FAST"]
+    )
+
+    # Offline clients only read their own context's stored responses
+    with pytest.raises(OfflineError):
+        client.player("dQw4w9WgXcQ")
+
+    assert requests == []
@@ -0,0 +1,260 @@
+import asyncio
+import copy
+from typing import Dict, List, Optional
+
+import pytest
+from innertube import clients
+from innertube.errors import ResponseError
+from innertube.live import (
+    Interval,
+    LivePoller,
+    parse_chat,
+    parse_continuation,
+    parse_metadata,
+)
+from innertube.models import LiveChatMessage, LiveMetadata
+
+
+def metadata_response(views: str, continuation: Optional[str]) -> dict:
+    return {
+        "responseContext": {},
+        "actions": [
+            {
+                "updateViewershipAction": {
+                    "viewCount": {
+                        "videoViewCountRenderer": {
+                            "viewCount": {"simpleText": f"{views} watching now"},
+                            "originalViewCount": views,
+                        }
+                    }
+                }
+            },
+            {"updateDateTextAction": {"dateText": {"simpleText": "Started 1h ago"}}},
+        ],
+        "continuation": (
+            {
+                "timedContinuationData": {
+                    "continuation": continuation,
+                    "timeoutMs": 0,
+                }
+            }
+            if continuation is not None
+            else {}
+        ),
+    }
+
+
+def chat_item(id: str, text: str) -> dict:
+    return {
+        "addChatItemAction": {
+            "item": {
+                "liveChatTextMessageRenderer": {
+                    "id": id,
+                    "message": {
+                        "runs": [
+                            {"text": text},
+                            {"emoji": {"emojiId": "x", "shortcuts": [":wave:"]}},
+                        ]
+                    },
+                    "authorName": {"simpleText": "Author"},
+                    "authorExternalChannelId": "UC",
+                    "timestampUsec": "1700000000000000",
+                }
+            }
+        }
+    }
+
+
+def chat_response(items: List[dict], continuation: Optional[str]) -> dict:
+    return {
+        "responseContext": {},
+        "continuationContents": {
+            "liveChatContinuation": {
+                "actions": items,
+                "continuations": (
+                    [
+                        {
+                            "invalidationContinuationData": {
+                                "continuation": continuation,
+                                "timeoutMs": 0,
+                            }
+                        }
+                    ]
+                    if continuation is not None
+                    else []
+                ),
+            }
+        },
+    }
+
+
+def next_response(continuation: str) -> dict:
+    return {
+        "responseContext": {},
+        "contents": {
+            "twoColumnWatchNextResults": {
+                "conversationBar": {
+                    "liveChatRenderer": {
+                        "continuations": [
+                            {"reloadContinuationData": {"continuation": continuation}}
+                        ]
+                    }
+                }
+            }
+        },
+    }
+
+
+RESPONSES: Dict[str, dict] = {
+    # updated_metadata
+    "a": metadata_response("10", "a-1"),
+    "a-1": metadata_response("10", "a-2"),
+    "a-2": metadata_response("12", None),
+    "b": metadata_response("5", None),
+    # next
+    "next:a": next_response("chat-a"),
+    "next:b": next_response("chat-b"),
+    # live_chat/get_live_chat
+    "chat-a": chat_response([chat_item("1", "hi")], "chat-a-1"),
+    "chat-a-1": chat_response([chat_item("2", "yo")], None),
+    "chat-b": chat_response([chat_item("3", "hey")], None),
+}
+
+
+class LiveAdaptor:
+    requests: List[str]
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert body is not None
+
+        key: str = body.get("continuation") or body["videoId"]
+
+        if endpoint == "next":
+            key = f"next:{key}"
+
+        self.requests.append(key)
+
+        if key not in RESPONSES:
+            raise ResponseError(key)
+
+        return copy.deepcopy(RESPONSES[key])
+
+
+@pytest.fixture
+def adaptor() -> LiveAdaptor:
+    return LiveAdaptor()
+
+
+@pytest.fixture
+def poller(adaptor: LiveAdaptor) -> LivePoller:
+    client: clients.AsyncInnerTube = clients.AsyncInnerTube("WEB")
+    client.adaptor = adaptor
+
+    return LivePoller(client, min_interval=0, max_interval=0)
+
+
+def test_interval() -> None:
+    interval: Interval = Interval(minimum=1, maximum=4, factor=2)
+
+    assert interval.next(False) == 2
+    assert interval.next(False) == 4
+    assert interval.next(False) == 4
+    assert interval.next(True) == 2
+    assert interval.next(True, 5) == 5
+    assert interval.next(True) == 1
+    assert interval.backoff() == 2
+
+
+def test_parse_continuation() -> None:
+    assert parse_continuation(
+        [{"timedContinuationData": {"continuation": "a", "timeoutMs": 5000}}]
+    ) == ("a", 5.0)
+    assert parse_continuation([{"reloadContinuationData": {"continuation": "a"}}]) == (
+        "a",
+        None,
+    )
+    assert parse_continuation([]) == (None, None)
+
+
+def test_parse_metadata() -> None:
+    assert parse_metadata("a", metadata_response("1,234", "a-1")) == (
+        LiveMetadata(
+            video_id="a",
+            view_count=1234,
+            view_count_text="1,234 watching now",
+            date_text="Started 1h ago",
+        ),
+        ("a-1", 0.0),
+    )
+
+
+def test_parse_chat() -> None:
+    messages: List[LiveChatMessage]
+    messages, continuation = parse_chat(
+        "a", chat_response([chat_item("1", "hi "), {"foo": {}}], "a-1")
+    )
+
+    assert messages == [
+        LiveChatMessage(
+            video_id="a",
+            id="1",
+            text="hi :wave:",
+            author="Author",
+            author_channel_id="UC",
+            timestamp_usec=1700000000000000,
+        )
+    ]
+    assert continuation == ("a-1", 0.0)
+
+
+def test_poller_metadata(poller: LivePoller) -> None:
+    async def collect() -> List[LiveMetadata]:
+        return [metadata async for metadata in poller.metadata(["a", "b"])]
+
+    events: List[LiveMetadata] = asyncio.run(collect())
+
+    # Unchanged metadata is not emitted again
+    assert sorted((event.video_id, event.view_count) for event in events) == [
+        ("a", 10),
+        ("a", 12),
+        ("b", 5),
+    ]
+
+
+def test_poller_chat(poller: LivePoller) -> None:
+    async def collect() -> List[LiveChatMessage]:
+        return [message async for message in poller.chat(["a", "b"])]
+
+    assert sorted(message.id for message in asyncio.run(collect())) == ["1", "2", "3"]
+
+
+def test_poller_errors(
+    adaptor: LiveAdaptor, poller: LivePoller, caplog: pytest.LogCaptureFixture
+) -> None:
+    async def collect() -> List[LiveMetadata]:
+        return [metadata async for metadata in poller.metadata(["missing"])]
+
+    assert asyncio.run(collect()) == []
+    assert adaptor.requests == ["missing"] * poller.max_errors
+    assert "Stopped polling missing" in caplog.text
+
+
+def test_poller_start_up_error(
+    adaptor: LiveAdaptor, poller: LivePoller, caplog: pytest.LogCaptureFixture
+) -> None:
+    async def collect() -> List[LiveChatMessage]:
+        return [message async for message in poller.chat(["a", "missing"])]
+
+    # The video whose first request fails doesn't stop the others
+    assert sorted(message.id for message in asyncio.run(collect())) == ["1", "2"]
+    assert "next:missing" in adaptor.requests
+    assert "Stopped polling missing" in caplog.text
@@ -0,0 +1,133 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+from innertube import clients
+from innertube.models import Song
+from innertube.music import chunks, parse_duration, parse_song
+
+
+def queue_item(video_id: str) -> dict:
+    return {
+        "content": {
+            "playlistPanelVideoRenderer": {
+                "videoId": video_id,
+                "title": {"runs": [{"text": f"Song {video_id}"}]},
+                "lengthText": {"runs": [{"text": "3:32"}]},
+                "longBylineText": {
+                    "runs": [
+                        {
+                            "text": "Artist",
+                            "navigationEndpoint": {
+                                "browseEndpoint": {"browseId": "UCartist"}
+                            },
+                        },
+                        {"text": " • "},
+                        {
+                            "text": "Album",
+                            "navigationEndpoint": {
+                                "browseEndpoint": {"browseId": "MPREb_album"}
+                            },
+                        },
+                        {"text": " • "},
+                        {"text": "2020"},
+                    ]
+                },
+                "thumbnail": {"thumbnails": [{"url": "https://foo.bar/thumb.jpg"}]},
+            }
+        }
+    }
+
+
+class QueueAdaptor:
+    requests: List[List[str]]
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert body is not None
+
+        self.requests.append(body["videoIds"])
+
+        return {
+            "responseContext": {},
+            "queueDatas": [
+                queue_item(video_id)
+                for video_id in body["videoIds"]
+                if video_id != "missing"
+            ],
+        }
+
+
+class AsyncQueueAdaptor(QueueAdaptor):
+    async def dispatch(  # type: ignore[override]
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        return super().dispatch(endpoint, params=params, body=body)
+
+
+def test_chunks() -> None:
+    assert chunks(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+    assert chunks([], 2) == []
+
+    with pytest.raises(ValueError):
+        chunks(["a"], 0)
+
+
+def test_parse_duration() -> None:
+    assert parse_duration("3:32") == 212
+    assert parse_duration("1:02:03") == 3723
+    assert parse_duration("LIVE") is None
+    assert parse_duration(None) is None
+
+
+def test_parse_song() -> None:
+    assert parse_song(queue_item("a")["content"]) == Song(
+        video_id="a",
+        title="Song a",
+        artist="Artist",
+        artist_id="UCartist",
+        album="Album",
+        album_id="MPREb_album",
+        duration_seconds=212,
+        thumbnails=[{"url": "https://foo.bar/thumb.jpg"}],
+    )
+    assert parse_song({}) is None
+
+
+def test_songs() -> None:
+    adaptor: QueueAdaptor = QueueAdaptor()
+    client: clients.InnerTube = clients.InnerTube("WEB_REMIX")
+    client.adaptor = adaptor
+
+    songs: Dict[str, Song] = client.songs(
+        ["a", "b", "missing", "a", "c"], chunk_size=2, workers=2
+    )
+
+    assert list(songs) == ["a", "b", "c"]
+    assert songs["c"].album == "Album"
+    assert sorted(adaptor.requests) == [["a", "b"], ["missing", "c"]]
+
+
+def test_async_songs() -> None:
+    adaptor: AsyncQueueAdaptor = AsyncQueueAdaptor()
+    client: clients.AsyncInnerTube = clients.AsyncInnerTube("WEB_REMIX")
+    client.adaptor = adaptor
+
+    songs: Dict[str, Song] = asyncio.run(
+        client.songs(["a", "b", "missing", "c"], chunk_size=2)
+    )
+
+    assert list(songs) == ["a", "b", "c"]
+    assert len(adaptor.requests) == 2
@@ -0,0 +1,153 @@
+import asyncio
+import pathlib
+import time
+from typing import List
+
+import httpx
+import innertube
+import pytest
+from innertube.errors import OfflineError
+from innertube.store import ResponseStore
+
+
+@pytest.fixture
+def store(tmp_path: pathlib.Path) -> ResponseStore:
+    return ResponseStore(tmp_path / "responses.sqlite3")
+
+
+def test_key() -> None:
+    assert ResponseStore.key("browse", {"a": 1, "b": 2}) == ResponseStore.key(
+        "browse", {"b": 2, "a": 1}
+    )
+    assert ResponseStore.key("browse", {"a": 1}) != ResponseStore.key(
+        "player", {"a": 1}
+    )
+
+
+def test_get_set(store: ResponseStore) -> None:
+    assert store.get("key") is None
+
+    store.set("key", "browse", b'{"foo": "bar"}')
+
+    assert store.get("key") == b'{"foo": "bar"}'
+    assert len(store) == 1
+
+    store.delete("key")
+
+    assert store.get("key") is None
+
+
+def test_ttl(store: ResponseStore) -> None:
+    store.set("key", "browse", b"{}", ttl=-1)
+
+    assert store.get("key") is None
+    assert store.get("key", stale=True) == b"{}"
+
+    store.purge()
+
+    assert store.get("key", stale=True) is None
+
+
+def test_eviction(tmp_path: pathlib.Path) -> None:
+    store: ResponseStore = ResponseStore(tmp_path / "responses.sqlite3")
+
+    store.set("a", "browse", b"a" * 10)
+    store.max_bytes = store.size() * 2
+    time.sleep(0.01)
+    store.set("b", "browse", b"b" * 10)
+    time.sleep(0.01)
+    store.get("a")
+    store.set("c", "browse", b"c" * 10)
+
+    assert store.size() <= store.max_bytes
+    assert store.get("b") is None
+    assert store.get("a") == b"a" * 10
+    assert store.get("c") == b"c" * 10
+
+
+def test_running_size(store: ResponseStore) -> None:
+    store.set("a", "browse", b"a" * 100)
+    store.set("a", "browse", b"a" * 1000)
+    store.set("b", "browse", b"b" * 10)
+    store.set("c", "browse", b"c" * 10, ttl=-1)
+    store.delete("b")
+    store.purge()
+
+    assert store._bytes == store._total() > 0
+
+    store.clear()
+
+    assert store._bytes == 0
+
+
+def test_persistence(tmp_path: pathlib.Path) -> None:
+    ResponseStore(tmp_path / "responses.sqlite3").set("key", "browse", b"{}")
+
+    assert ResponseStore(tmp_path / "responses.sqlite3").get("key") == b"{}"
+
+
+def adaptor_session(requests: List[httpx.Request]) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+
+        return httpx.Response(200, json={"responseContext": {}, "foo": "bar"})
+
+    return httpx.Client(
+        transport=httpx.MockTransport(handler), base_url="https://foo.bar/"
+    )
+
+
+def test_adaptor_store(store: ResponseStore) -> None:
+    requests: List[httpx.Request] = []
+    adaptor: innertube.InnerTubeAdaptor = innertube.InnerTubeAdaptor(
+        context=innertube.ClientContext("FAKE_CLIENT", "1.0"),
+        session=adaptor_session(requests),
+        store=store,
+    )
+
+    assert adaptor.dispatch("browse", body={"browseId": "a"})["foo"] == "bar"
+    assert adaptor.dispatch("browse", body={"browseId": "a"})["foo"] == "bar"
+    assert len(requests) == 1
+
+    adaptor.dispatch("browse", body={"browseId": "b"})
+
+    assert len(requests) == 2
+
+
+def test_adaptor_offline(store: ResponseStore) -> None:
+    requests: List[httpx.Request] = []
+    context: innertube.ClientContext = innertube.ClientContext("FAKE_CLIENT", "1.0")
+
+    innertube.InnerTubeAdaptor(
+        context=context, session=adaptor_session(requests), store=store
+    ).dispatch("browse", body={"browseId": "a"})
+
+    adaptor: innertube.InnerTubeAdaptor = innertube.InnerTubeAdaptor(
+        context=context, session=adaptor_session(requests), store=store, offline=True
+    )
+
+    assert adaptor.dispatch("browse", body={"browseId": "a"})["foo"] == "bar"
+
+    with pytest.raises(OfflineError):
+        adaptor.dispatch("browse", body={"browseId": "b"})
+
+    assert len(requests) == 1
+
+    with pytest.raises(ValueError):
+        innertube.InnerTubeAdaptor(context=context, offline=True)
+
+
+def test_async_adaptor_offline(store: ResponseStore) -> None:
+    context: innertube.ClientContext = innertube.ClientContext("FAKE_CLIENT", "1.0")
+
+    innertube.InnerTubeAdaptor(
+        context=context, session=adaptor_session([]), store=store
+    ).dispatch("browse", body={"browseId": "a"})
+
+    adaptor: innertube.AsyncInnerTubeAdaptor = innertube.AsyncInnerTubeAdaptor(
+        context=context, store=store, offline=True
+    )
+
+    data: dict = asyncio.run(adaptor.dispatch("browse", body={"browseId": "a"}))
+
+    assert data["foo"] == "bar"
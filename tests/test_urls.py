@@ -0,0 +1,124 @@
+from typing import List, Optional
+
+import pytest
+from innertube import clients
+from innertube.models import ResolvedURL
+from innertube.urls import parse_endpoint, parse_url
+
+CHANNEL_ID: str = "UCuAXFkgsw1L7xaCfnd5JJOw"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+            ResolvedURL(type="video", id="dQw4w9WgXcQ"),
+        ),
+        (
+            "youtube.com/watch?v=dQw4w9WgXcQ&list=PL123",
+            ResolvedURL(type="video", id="dQw4w9WgXcQ", playlist_id="PL123"),
+        ),
+        (
+            "https://youtu.be/dQw4w9WgXcQ?t=1",
+            ResolvedURL(type="video", id="dQw4w9WgXcQ"),
+        ),
+        (
+            "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+            ResolvedURL(type="video", id="dQw4w9WgXcQ"),
+        ),
+        (
+            "https://m.youtube.com/shorts/dQw4w9WgXcQ",
+            ResolvedURL(type="short", id="dQw4w9WgXcQ"),
+        ),
+        (
+            "https://www.youtube.com/playlist?list=PL123",
+            ResolvedURL(type="playlist", id="PL123"),
+        ),
+        (
+            f"https://www.youtube.com/channel/{CHANNEL_ID}/videos",
+            ResolvedURL(type="channel", id=CHANNEL_ID),
+        ),
+        (
+            "https://www.youtube.com/@RickAstleyYT/videos",
+            ResolvedURL(type="handle", id="@RickAstleyYT"),
+        ),
+        (
+            "https://www.youtube.com/c/RickAstley",
+            ResolvedURL(type="vanity", id="c/RickAstley"),
+        ),
+        (
+            "https://www.youtube.com/RickAstley",
+            ResolvedURL(type="vanity", id="RickAstley"),
+        ),
+        (
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
+            ResolvedURL(type="video", id="dQw4w9WgXcQ", music=True),
+        ),
+        (
+            "https://music.youtube.com/browse/MPREb_abc",
+            ResolvedURL(type="album", id="MPREb_abc", music=True),
+        ),
+        (
+            "https://music.youtube.com/browse/VLPL123",
+            ResolvedURL(type="playlist", id="PL123", music=True),
+        ),
+        ("https://www.youtube.com/results?search_query=foo", None),
+        ("https://www.youtube.com/watch?v=short", None),
+        ("https://example.com/watch?v=dQw4w9WgXcQ", None),
+    ],
+)
+def test_parse_url(url: str, expected: Optional[ResolvedURL]) -> None:
+    assert parse_url(url) == expected
+
+
+def test_parse_endpoint() -> None:
+    assert parse_endpoint(
+        {"endpoint": {"browseEndpoint": {"browseId": CHANNEL_ID}}}
+    ) == ResolvedURL(type="channel", id=CHANNEL_ID)
+    assert parse_endpoint(
+        {"endpoint": {"watchEndpoint": {"videoId": "dQw4w9WgXcQ"}}}
+    ) == ResolvedURL(type="video", id="dQw4w9WgXcQ")
+    assert parse_endpoint({"endpoint": {"urlEndpoint": {"url": "foo"}}}) is None
+
+
+class ResolveAdaptor:
+    urls: List[str]
+
+    def __init__(self) -> None:
+        self.urls = []
+
+    def dispatch(
+        self,
+        endpoint: str,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        assert endpoint == "navigation/resolve_url"
+        assert body is not None
+
+        self.urls.append(body["url"])
+
+        return {
+            "responseContext": {},
+            "endpoint": {"browseEndpoint": {"browseId": CHANNEL_ID}},
+        }
+
+
+def test_resolve() -> None:
+    adaptor: ResolveAdaptor = ResolveAdaptor()
+    client: clients.InnerTube = clients.InnerTube("WEB")
+    client.adaptor = adaptor
+
+    # Resolved locally, without a request
+    assert client.resolve("https://youtu.be/dQw4w9WgXcQ") == ResolvedURL(
+        type="video", id="dQw4w9WgXcQ"
+    )
+    assert adaptor.urls == []
+
+    channel: ResolvedURL = ResolvedURL(type="channel", id=CHANNEL_ID)
+
+    assert client.resolve("https://www.youtube.com/@RickAstleyYT") == channel
+    assert client.resolve("youtube.com/@rickastleyyt/videos") == channel
+    assert adaptor.urls == ["https://www.youtube.com/@RickAstleyYT"]
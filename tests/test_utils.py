@@ -1,3 +1,5 @@
+import pytest
+
 import innertube.utils
 
 
@@ -6,3 +8,46 @@ def test_filter() -> None:
         "b": "b",
         "c": "c",
     }
+
+
+def test_get() -> None:
+    data: dict = {"a": {"b": [{"c": "c"}]}}
+
+    assert innertube.utils.get(data, "a", "b", 0, "c") == "c"
+    assert innertube.utils.get(data, "a", "b", -1, "c") == "c"
+    assert innertube.utils.get(data, "a", "b", 1, "c") is None
+    assert innertube.utils.get(data, "a", "x", 0) is None
+    assert innertube.utils.get(data, "a", "b", "c") is None
+    assert innertube.utils.get(data) is data
+
+
+def test_lru_cache() -> None:
+    cache: innertube.utils.LRUCache[str, int] = innertube.utils.LRUCache(maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.delete("a")
+
+    assert cache.get("a") is None
+
+
+def test_rate_limiter() -> None:
+    limiter: innertube.utils.RateLimiter = innertube.utils.RateLimiter(rate=10, burst=2)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert 0.09 < limiter.reserve() <= 0.1
+    assert 0.19 < limiter.reserve() <= 0.2
+
+    with pytest.raises(ValueError):
+        innertube.utils.RateLimiter(rate=0)
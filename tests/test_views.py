@@ -0,0 +1,261 @@
+import pytest
+from innertube.views import BrowseView, NextView, PlayerView, SearchView, View
+
+
+def continuation_item(token: str) -> dict:
+    return {
+        "continuationItemRenderer": {
+            "continuationEndpoint": {"continuationCommand": {"token": token}}
+        }
+    }
+
+
+def test_view_slots() -> None:
+    view: PlayerView = PlayerView({})
+
+    assert not hasattr(view, "__dict__")
+    assert "_title" in PlayerView.__slots__
+
+    with pytest.raises(AttributeError):
+        view.foo = "bar"  # type: ignore
+
+
+def test_view_memoises() -> None:
+    data: dict = {"videoDetails": {"keywords": ["foo"]}}
+    view: PlayerView = PlayerView(data)
+
+    assert view.keywords is data["videoDetails"]["keywords"]
+
+    data["videoDetails"]["keywords"] = ["bar"]
+
+    assert view.keywords == ["foo"]
+
+
+def test_view_repr() -> None:
+    assert repr(View({"foo": "bar"})) == "View(keys=['foo'])"
+
+
+def test_player_view() -> None:
+    view: PlayerView = PlayerView(
+        {
+            "playabilityStatus": {"status": "OK"},
+            "videoDetails": {
+                "videoId": "dQw4w9WgXcQ",
+                "title": "Never Gonna Give You Up",
+                "lengthSeconds": "212",
+                "viewCount": "1500000000",
+                "isLiveContent": False,
+            },
+            "streamingData": {
+                "expiresInSeconds": "21540",
+                "adaptiveFormats": [{"itag": 251}],
+            },
+        }
+    )
+
+    assert view.playability_status == "OK"
+    assert view.video_id == "dQw4w9WgXcQ"
+    assert view.title == "Never Gonna Give You Up"
+    assert view.length_seconds == 212
+    assert view.view_count == 1500000000
+    assert view.is_live is False
+    assert view.keywords == []
+    assert view.formats == []
+    assert view.adaptive_formats == [{"itag": 251}]
+    assert view.expires_in_seconds == 21540
+
+
+def test_search_view() -> None:
+    view: SearchView = SearchView(
+        {
+            "estimatedResults": "123",
+            "contents": {
+                "twoColumnSearchResultsRenderer": {
+                    "primaryContents": {
+                        "sectionListRenderer": {
+                            "contents": [
+                                {
+                                    "itemSectionRenderer": {
+                                        "contents": [
+                                            {"videoRenderer": {"videoId": "a"}},
+                                            {"channelRenderer": {"channelId": "b"}},
+                                        ]
+                                    }
+                                },
+                                continuation_item("token"),
+                            ]
+                        }
+                    }
+                }
+            },
+        }
+    )
+
+    assert view.estimated_results == 123
+    assert len(view.items) == 2
+    assert view.renderers("videoRenderer") == [{"videoId": "a"}]
+    assert view.continuation == "token"
+
+
+def test_search_view_continuation() -> None:
+    view: SearchView = SearchView(
+        {
+            "onResponseReceivedCommands": [
+                {
+                    "appendContinuationItemsAction": {
+                        "continuationItems": [
+                            {
+                                "itemSectionRenderer": {
+                                    "contents": [{"videoRenderer": {"videoId": "a"}}]
+                                }
+                            },
+                            continuation_item("next"),
+                        ]
+                    }
+                }
+            ]
+        }
+    )
+
+    assert view.renderers("videoRenderer") == [{"videoId": "a"}]
+    assert view.continuation == "next"
+
+
+def test_browse_view() -> None:
+    view: BrowseView = BrowseView(
+        {
+            "contents": {
+                "twoColumnBrowseResultsRenderer": {
+                    "tabs": [
+                        {"tabRenderer": {"title": "Home"}},
+                        {
+                            "tabRenderer": {
+                                "title": "Videos",
+                                "selected": True,
+                                "content": {
+                                    "richGridRenderer": {
+                                        "contents": [
+                                            {
+                                                "richItemRenderer": {
+                                                    "content": {
+                                                        "videoRenderer": {
+                                                            "videoId": "a"
+                                                        }
+                                                    }
+                                                }
+                                            },
+                                            continuation_item("token"),
+                                        ]
+                                    }
+                                },
+                            }
+                        },
+                        {"expandableTabRenderer": {}},
+                    ]
+                }
+            },
+        }
+    )
+
+    assert [tab["title"] for tab in view.tabs] == ["Home", "Videos"]
+    assert view.selected_tab is view.tab("Videos")
+    assert view.tab("Shorts") is None
+    assert view.renderers("videoRenderer") == [{"videoId": "a"}]
+    assert view.continuation == "token"
+
+
+def test_browse_view_continuation() -> None:
+    view: BrowseView = BrowseView(
+        {
+            "onResponseReceivedActions": [
+                {
+                    "appendContinuationItemsAction": {
+                        "continuationItems": [
+                            {
+                                "richItemRenderer": {
+                                    "content": {"videoRenderer": {"videoId": "b"}}
+                                }
+                            }
+                        ]
+                    }
+                }
+            ]
+        }
+    )
+
+    assert view.renderers("videoRenderer") == [{"videoId": "b"}]
+    assert view.continuation is None
+
+
+def test_next_view() -> None:
+    view: NextView = NextView(
+        {
+            "currentVideoEndpoint": {"watchEndpoint": {"videoId": "a"}},
+            "engagementPanels": [
+                {
+                    "engagementPanelSectionListRenderer": {
+                        "panelIdentifier": "engagement-panel-searchable-transcript",
+                        "content": {
+                            "continuationItemRenderer": {
+                                "continuationEndpoint": {
+                                    "getTranscriptEndpoint": {"params": "params"}
+                                }
+                            }
+                        },
+                    }
+                },
+                {
+                    "engagementPanelSectionListRenderer": {
+                        "panelIdentifier": "engagement-panel-comments-section",
+                        "header": {
+                            "engagementPanelTitleHeaderRenderer": {
+                                "menu": {
+                                    "sortFilterSubMenuRenderer": {
+                                        "subMenuItems": [
+                                            {
+                                                "title": "Top comments",
+                                                "serviceEndpoint": {
+                                                    "continuationCommand": {
+                                                        "token": "top"
+                                                    }
+                                                },
+                                            },
+                                        ]
+                                    }
+                                }
+                            }
+                        },
+                    }
+                },
+            ],
+            "contents": {
+                "twoColumnWatchNextResults": {
+                    "results": {
+                        "results": {
+                            "contents": [
+                                {
+                                    "itemSectionRenderer": {
+                                        "sectionIdentifier": "comment-item-section",
+                                        "contents": [continuation_item("comments")],
+                                    }
+                                }
+                            ]
+                        }
+                    },
+                    "secondaryResults": {
+                        "secondaryResults": {
+                            "results": [{"compactVideoRenderer": {"videoId": "b"}}]
+                        }
+                    },
+                }
+            },
+        }
+    )
+
+    assert view.video_id == "a"
+    assert view.transcript_params == "params"
+    assert view.comment_sorts == {"Top comments": "top"}
+    assert view.comments_continuation == "comments"
+    assert view.related == [{"compactVideoRenderer": {"videoId": "b"}}]
+    assert view.continuation_items == []
+    assert view.continuation is None